@@ -1,75 +1,62 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from backend.database import engine, Base
-from backend.routes import auth_routes, profile_routes, session_routes, game_routes
+from backend.database import engine
+from backend.migrations import run_migrations
+from backend.routes import auth_routes, profile_routes, session_routes, game_routes, health_routes
+from backend.services.state_backend import state_backend
+from backend.services.session_router import session_router
+from backend.services.connection_manager import manager
+from backend.services.snapshot_service import snapshot_service
+from backend.services.lobby_feed import lobby_feed
+from backend.services.session_reaper import session_reaper
+from backend.games import question_bank
+from backend.config import settings
 from contextlib import asynccontextmanager
 import logging
-from backend.models import User, Profile, Session, SessionPlayer # Explicit import to ensure registration
-from sqlalchemy import text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables
-    logger.info("Starting up... loading models")
-    logger.info(f"Detected tables in metadata: {Base.metadata.tables.keys()}")
-    
+    # Startup: bring the schema up to date (one ledger read when nothing is pending)
     try:
-        async with engine.begin() as conn:
-            # Inspection: Check if 'users' table has 'password_hash' column
-            # We use text() to execute raw SQL compatible with postgres/asyncpg
-            result = await conn.execute(text(
-                "SELECT column_name FROM information_schema.columns "
-                "WHERE table_name='users' AND column_name='password_hash'"
-            ))
-            column_exists = result.scalar()
-            
-            if not column_exists:
-                logger.warning("CRITICAL: Schema mismatch detected (missing password_hash). Resetting database...")
-                await conn.run_sync(Base.metadata.drop_all)
-                logger.info("Database dropped.")
-            
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Tables checked/created successfully")
-        
-        # Auto-Migration: Add lobby_name column if it doesn't exist
-        try:
-             async with engine.begin() as conn:
-                 logger.info("Checking for lobby_name column...")
-                 result = await conn.execute(text(
-                     "SELECT column_name FROM information_schema.columns "
-                     "WHERE table_name='sessions' AND column_name='lobby_name'"
-                 ))
-                 column_exists = result.scalar()
-                 
-                 if not column_exists:
-                     logger.info("Adding lobby_name column to sessions table...")
-                     await conn.execute(text(
-                         "ALTER TABLE sessions ADD COLUMN lobby_name VARCHAR NULL"
-                     ))
-                     logger.info("✓ Successfully added lobby_name column!")
-                 else:
-                     logger.info("✓ lobby_name column already exists.")
-        except Exception as e:
-            logger.error(f"Error migrating lobby_name column: {e}")
-        
-        # Auto-Cleanup Ghost Lobbies on Startup
-        try:
-             async with engine.begin() as conn:
-                 logger.info("Cleaning up ghost lobbies (marking 'waiting' sessions as 'closed')...")
-                 await conn.execute(text("UPDATE sessions SET status = 'closed' WHERE status = 'waiting'"))
-                 logger.info("Ghost lobbies cleaned up.")
-        except Exception as e:
-            logger.error(f"Error cleaning up ghost lobbies: {e}")
-            
+        await run_migrations()
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
-        
+        logger.error(f"Error migrating database: {e}")
+
+    # Question content, read once and shared by every session on this worker
+    question_bank.load()
+
+    # Shared state + cross-worker bus (in-memory unless STATE_BACKEND=broker)
+    await state_backend.start()
+    await session_router.start()
+    manager.attach_bus(state_backend, settings.WORKER_ID)
+    manager.start_heartbeat()
+    await lobby_feed.start()
+    logger.info(f"Worker {settings.WORKER_ID} using '{settings.STATE_BACKEND}' state backend")
+
+    # Drain as soon as SIGTERM/SIGINT arrives, before uvicorn closes the sockets
+    snapshot_service.drain_on_signals()
+
+    # Sessions snapshotted by the previous process (restored here or by another worker)
+    try:
+        await snapshot_service.restore_sessions(game_routes.session_state, manager, game_routes.handle_leave)
+    except Exception as e:
+        logger.error(f"Error restoring session snapshots: {e}")
+
+    # Ghost lobbies left by the previous process are closed by the reaper's first pass
+    session_reaper.start(game_routes.session_state)
+
     yield
-    # Shutdown
+    # Shutdown: drain (already on if a signal started it), then save live sessions for the next process to pick up
+    snapshot_service.begin_drain()
+    await session_reaper.close()
+    await manager.close()
+    await snapshot_service.save_sessions(game_routes.session_state)
+    await session_router.close()
+    await state_backend.close()
 
 app = FastAPI(title="EDU PARTY MAYHEM", lifespan=lifespan)
 
@@ -86,6 +73,7 @@ app.add_middleware(
 app.include_router(auth_routes.router, prefix="/api")
 app.include_router(profile_routes.router, prefix="/api")
 app.include_router(session_routes.router, prefix="/api")
+app.include_router(health_routes.router, prefix="/api")
 app.include_router(game_routes.router) # WebSocket doesn't need prefix usually, or /ws
 
 # Serve Frontend
@@ -0,0 +1,119 @@
+"""
+Stand-in state broker for BrokerStateBackend.
+
+A tiny newline-delimited JSON key/value store with TTLs and pub/sub - just
+enough to run several uvicorn workers against each other locally or in CI:
+
+    python -m backend.broker --port 7070
+    STATE_BACKEND=broker BROKER_URL=broker://127.0.0.1:7070 uvicorn backend.app:app --workers 4
+
+Requests:  {"id": 1, "op": "get" | "set" | "setnx" | "delete" | "sadd" | "srem" | "smembers"
+                    | "publish" | "subscribe" | "unsubscribe" | "ping", ...}
+Replies:   {"id": 1, "result": ...} or {"id": 1, "error": "..."}
+Pushes:    {"op": "message", "channel": "...", "data": ...}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    def __init__(self):
+        self.data: Dict[str, tuple[Any, Optional[float]]] = {}  # key -> (value, expires_at)
+        self.sets: Dict[str, Set[str]] = {}
+        self.channels: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    def _live(self, key: str):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl else None
+
+    def handle(self, request: dict, writer: asyncio.StreamWriter) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "get":
+            entry = self._live(request["key"])
+            return entry[0] if entry else None
+        if op == "set":
+            self.data[request["key"]] = (request.get("value"), self._expiry(request.get("ttl")))
+            return True
+        if op == "setnx":
+            if self._live(request["key"]):
+                return False
+            self.data[request["key"]] = (request.get("value"), self._expiry(request.get("ttl")))
+            return True
+        if op == "delete":
+            return self.data.pop(request["key"], None) is not None
+        if op == "sadd":
+            self.sets.setdefault(request["key"], set()).add(request["member"])
+            return True
+        if op == "srem":
+            self.sets.get(request["key"], set()).discard(request["member"])
+            return True
+        if op == "smembers":
+            return sorted(self.sets.get(request["key"], set()))
+        if op == "subscribe":
+            self.channels.setdefault(request["channel"], set()).add(writer)
+            return True
+        if op == "unsubscribe":
+            self.channels.get(request["channel"], set()).discard(writer)
+            return True
+        if op == "publish":
+            line = json.dumps({"op": "message", "channel": request["channel"], "data": request.get("data")}).encode() + b"\n"
+            receivers = self.channels.get(request["channel"], set())
+            for subscriber in receivers:
+                subscriber.write(line)
+            return len(receivers)
+        raise ValueError(f"unknown op {op!r}")
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        logger.info(f"Client connected: {peer}")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                try:
+                    reply = {"id": request.get("id"), "result": self.handle(request, writer)}
+                except Exception as e:
+                    reply = {"id": request.get("id"), "error": str(e)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"Client {peer} error: {e}")
+        finally:
+            for subscribers in self.channels.values():
+                subscribers.discard(writer)
+            writer.close()
+            logger.info(f"Client disconnected: {peer}")
+
+
+async def main(host: str, port: int):
+    broker = Broker()
+    server = await asyncio.start_server(broker.serve_client, host, port)
+    logger.info(f"State broker listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in state broker for multi-worker runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))
@@ -1,4 +1,5 @@
 import os
+import socket
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
@@ -16,6 +17,80 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JOIN_TICKET_EXPIRE_MINUTES: int = 15 # WebSocket join tickets; expired ones fall back to a DB lookup
     DEV_MODE: bool = False # set via env var in prod if needed
 
+    # Database engine profile (see backend/database.py)
+    DB_ECHO: str = "false" # "false", "true" (statements) or "debug" (statements + rows)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10 # extra connections allowed under burst
+    DB_POOL_TIMEOUT: float = 10.0 # seconds a checkout waits before failing
+    DB_POOL_RECYCLE: int = 1800 # seconds; reconnect before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100 # prepared statements per connection; 0 behind pgbouncer
+    DB_SLOW_CHECKOUT_MS: float = 100.0 # log pool waits at or above this
+
+    # WebSocket fan-out: each connection gets its own bounded outbound queue
+    WS_SEND_QUEUE_SIZE: int = 64 # frames; a client this far behind is dropped
+    WS_SEND_QUEUE_HIGH_WATER: int = 16 # frames; above this the client is marked degraded
+    WS_SEND_TIMEOUT: float = 5.0 # seconds a single send may block before the client is dropped
+    WS_PING_INTERVAL: float = 15.0 # seconds between PING heartbeats; 0 disables them
+    WS_PING_TIMEOUT: float = 45.0 # seconds without any frame from a client before its socket is evicted
+    WS_RATE_LIMIT_STRIKES: int = 20 # messages dropped over budget (see utils/rate_limit.py) before the socket is closed
+    WS_RATE_LIMIT_WINDOW: float = 10.0 # seconds over which the strikes refill
+    WS_REPLAY_BUFFER_SIZE: int = 64 # game-flow frames kept per session for clients resuming with last_seq
+
+    # Lobby inactivity deadlines (one shared scheduler, see utils/timer.py)
+    LOBBY_INACTIVITY_TIMEOUT: int = 600 # seconds without activity before the lobby's timeout callback runs
+
+    # Round phases advance once every connected client acks; these are the upper bounds
+    PHASE_START_TIMEOUT: float = 3.0 # seconds for players to reach the game page
+    PHASE_RESULTS_TIMEOUT: float = 3.0 # seconds ROUND_RESULT stays up
+    PHASE_INTERMISSION_TIMEOUT: float = 3.0
+    PHASE_END_TIMEOUT: float = 5.0 # seconds before REDIRECT_TO_LOBBY
+    ROUND_START_BUFFER: float = 15.0 # timed rounds: seconds on top of time_limit before all clients synced
+    ROUND_INTRO_TIME: float = 12.0 # timed rounds: client intro + tutorial + countdown after ALL_PLAYERS_READY
+    ROUND_SUBMIT_GRACE: float = 2.0 # seconds after time_limit to collect final scores
+
+    # ROUND_START carries the first QUESTION_WINDOW items (answers stripped); clients fetch the rest in chunks
+    QUESTION_WINDOW: int = 10
+    QUESTION_CHUNK_SIZE: int = 10 # items per QUESTION_CHUNK reply to GET_QUESTIONS
+
+    # Lobby roster changes are batched into one PLAYER_LIST_DELTA per window
+    ROSTER_COALESCE_WINDOW: float = 0.25 # seconds
+
+    # Shared state: "memory" (single worker) or "broker" (multi-worker, see backend/broker.py)
+    STATE_BACKEND: str = "memory"
+    BROKER_URL: str = "broker://127.0.0.1:7070"
+    BROKER_TIMEOUT: float = 5.0 # seconds
+    WORKER_ID: str = f"{socket.gethostname()}-{os.getpid()}" # unique per uvicorn worker process
+    SESSION_OWNER_TTL: int = 30 # seconds; owners renew at a third of this
+
+    # Graceful restarts: live sessions are snapshotted on shutdown and restored on startup
+    STATE_PERSIST_PATH: str = "state_snapshot.json" # memory backend only; "" disables
+    SNAPSHOT_MAX_AGE: int = 600 # seconds; older snapshots are discarded instead of restored
+    SNAPSHOT_RESUME_GRACE: float = 5.0 # seconds a restored game waits for clients before moving on
+    SNAPSHOT_RECONNECT_GRACE: float = 30.0 # seconds before restored players who never came back are removed
+
+    # Lobby browser feed (server-sent events, see services/lobby_feed.py)
+    LOBBY_FEED_QUEUE_SIZE: int = 32 # events; a stream this far behind is ended and resyncs
+    LOBBY_FEED_KEEPALIVE: float = 15.0 # seconds between keepalive comments
+    LOBBY_FEED_MAX_AGE: float = 300.0 # seconds before a stream is recycled (EventSource reconnects)
+    LOBBY_PAGE_SIZE: int = 50 # lobbies per page of GET /api/sessions/
+    LOBBY_PAGE_MAX: int = 100 # upper bound for the ?limit= query parameter
+
+    # Password hashing (argon2). Changing the costs rehashes each user's password on next login.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536 # KiB
+    ARGON2_PARALLELISM: int = 4
+    HASH_WORKERS: int = 2 # concurrent hashes; each holds ARGON2_MEMORY_COST while it runs
+    HASH_MAX_QUEUE: int = 200 # logins waiting for a worker before new ones get a 503
+
+    # Session reaper (see services/session_reaper.py)
+    REAPER_INTERVAL: float = 60.0 # seconds between passes; the first runs at startup
+    REAPER_BATCH_SIZE: int = 100 # rows per transaction
+    REAPER_LOBBY_GRACE: int = 120 # seconds a new lobby may go without a live owner (host still connecting)
+    ARCHIVE_AFTER_HOURS: int = 24 # closed/finished sessions stay in the hot tables this long
+    ARCHIVE_RETENTION_DAYS: int = 180 # archived sessions are purged after this; 0 keeps them forever
+
 settings = Settings()
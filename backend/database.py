@@ -1,11 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
 from backend.config import settings
+from backend.utils.pool_metrics import InstrumentedPool, instrument_engine
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+ECHO_LEVELS = {"false": False, "true": True, "debug": "debug"}
+
+# SQLAlchemy's asyncpg dialect keeps its own prepared statement cache (URL option);
+# asyncpg has a second one (connect arg). Both follow DB_STATEMENT_CACHE_SIZE.
+engine_url = make_url(DATABASE_URL)
+connect_args = {}
+if engine_url.drivername.endswith("+asyncpg"):
+    engine_url = engine_url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+    connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+engine = create_async_engine(
+    engine_url,
+    echo=ECHO_LEVELS.get(settings.DB_ECHO.lower(), False),
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=connect_args,
+)
+instrument_engine(engine, settings.DB_SLOW_CHECKOUT_MS)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
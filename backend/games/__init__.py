@@ -1,4 +1,5 @@
-from .base_game import BaseGame
+from .base_game import BaseGame, SeededGame
+from .question_bank import QuestionBank, question_bank
 from .math_quiz import MathQuiz
 from .speed_typing import SpeedTyping
 from .tech_sprint import TechSprint
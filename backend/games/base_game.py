@@ -1,7 +1,23 @@
+import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from array import array
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from .question_bank import question_bank
+
 
 class BaseGame(ABC):
+    # Server-side scoring (see apply_actions); subclasses tune these
+    CORRECT_POINTS = 1
+    WRONG_POINTS = 0  # Added on a wrong answer; negative is a penalty (scores never drop below 0)
+    INDEX_KEY = "question_index"  # Field names of a single legacy GAME_ACTION
+    ANSWER_KEY = "answer"
+    MAX_ACTIONS_PER_FRAME = 64  # Anything beyond this in one batch is ignored
+    ITEMS_KEY = "questions"  # Round config key the client reads this game's items from
+
+    win_score: Optional[int] = None  # Race games: reaching this finishes the player's round
+    BANK: Optional[str] = None  # Question bank game type (setup_bank); see question_bank.py
+    seed: Optional[int] = None  # SeededGame rebuilds items from (seed, index) on demand
+
     @abstractmethod
     def get_game_name(self) -> str:
         """Returns the specific name of the game."""
@@ -12,17 +28,154 @@ class BaseGame(ABC):
         """Initializes the game state and returns the start payload."""
         pass
 
-    @abstractmethod
+    def setup_bank(
+        self,
+        players: List[Dict[str, Any]],
+        count: int,
+        win_score: Optional[int] = None,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+    ):
+        """Sample this round's questions from the shared question bank (called from start()).
+        Only the picked item numbers are kept; the questions themselves stay in the bank."""
+        self._setup_players(players, win_score)
+        self.seed = None
+        self.picks = question_bank.sample(self.BANK, count, category, difficulty)
+        self.count = len(self.picks)
+
+    def _setup_players(self, players: List[Dict[str, Any]], win_score: Optional[int]):
+        self.win_score = win_score
+        self.slots = {p.get('user_id', p.get('id')): i for i, p in enumerate(players)}
+        self.scores = array('i', [0]) * len(self.slots)
+        self.cursors = array('i', [0]) * len(self.slots)  # Next question index each player may answer
+
+    def item_at(self, index: int) -> Any:
+        """Full item (answer included) at a round index; the same on every worker"""
+        return question_bank.get(self.BANK, self.picks[index])
+
+    def strip_answer(self, item: Any) -> Any:
+        """Client-facing copy of an item without its answer; correctness only ever comes from apply_actions.
+        Mappings always come back as plain dicts: bank items are read-only proxies the codecs can't encode."""
+        if not isinstance(item, Mapping):
+            return item
+        return {k: v for k, v in item.items() if k != "answer"}
+
+    def item_window(self, start: int, count: int) -> List[Any]:
+        """Answer-stripped items [start, start + count), clipped to the round"""
+        start = max(0, start)
+        return [self.strip_answer(self.item_at(i)) for i in range(start, min(start + max(0, count), self.count))]
+
+    def normalize(self, answer: Any) -> str:
+        """Canonical form used to compare a submitted answer with the table"""
+        return str(answer).strip()
+
+    def answer_for(self, index: int) -> str:
+        item = self.item_at(index)
+        return self.normalize(item["answer"] if isinstance(item, Mapping) else item)
+
+    def apply_actions(self, player_id: int, actions: List[Any]) -> Optional[Tuple[int, List[List[int]]]]:
+        """Score a batch of [question_index, answer] pairs.
+
+        Returns (new score, [[question_index, 1 or 0], ...] for the answers that
+        were scored), or None for non-players. Answers must come in question order
+        (indexes wrap around the table), so a replayed or skipped index is dropped
+        instead of scored twice.
+        """
+        slot = self.slots.get(player_id)
+        if slot is None or not self.count:
+            return None
+
+        count = self.count
+        score, cursor = self.scores[slot], self.cursors[slot]
+        verdicts = []
+        for action in actions[:self.MAX_ACTIONS_PER_FRAME]:
+            try:
+                index, answer = action
+            except (TypeError, ValueError):
+                continue
+            if index != cursor % count:
+                continue
+            cursor += 1
+            correct = self.normalize(answer) == self.answer_for(index)
+            if correct:
+                score += self.CORRECT_POINTS
+                if self.win_score is not None:
+                    score = min(score, self.win_score)
+            else:
+                score = max(0, score + self.WRONG_POINTS)
+            verdicts.append([index, int(correct)])
+
+        self.scores[slot], self.cursors[slot] = score, cursor
+        return score, verdicts
+
     def process_action(self, player_id: int, action: Dict[str, Any]) -> Dict[str, Any]:
         """Processes a player's action and returns the result."""
-        pass
+        scored = self.apply_actions(player_id, [(action.get(self.INDEX_KEY), action.get(self.ANSWER_KEY))])
+        if scored is None:
+            return {"result": "incorrect"}
+        score, verdicts = scored
+        correct = bool(verdicts) and verdicts[0][1] == 1
+        result = {"result": "correct" if correct else "incorrect", "score": score}
+        if self.has_won(player_id):
+            result["win"] = True
+        return result
+
+    def score_of(self, player_id: int) -> int:
+        slot = self.slots.get(player_id)
+        return self.scores[slot] if slot is not None else 0
+
+    def has_won(self, player_id: int) -> bool:
+        return self.win_score is not None and self.score_of(player_id) >= self.win_score
 
-    @abstractmethod
     def end(self) -> Dict[str, Any]:
         """Returns the final results of the game."""
-        pass
-    
+        return {"scores": {player_id: self.scores[slot] for player_id, slot in self.slots.items()}}
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Scoring state for GameSession.to_snapshot(); the content itself is rebuilt from picks or seed"""
+        return {
+            "seed": self.seed,
+            "count": self.count,
+            "picks": self.picks.tolist() if self.picks is not None else None,
+            "win_score": self.win_score,
+            "slots": [[player_id, slot] for player_id, slot in self.slots.items()],
+            "scores": self.scores.tolist(),
+            "cursors": self.cursors.tolist(),
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "BaseGame":
+        game = cls()
+        game.seed = data["seed"]
+        game.count = data["count"]
+        game.picks = array('H', data["picks"]) if data["picks"] is not None else None
+        game.win_score = data["win_score"]
+        game.slots = {player_id: slot for player_id, slot in data["slots"]}
+        game.scores = array('i', data["scores"])
+        game.cursors = array('i', data["cursors"])
+        return game
+
     @abstractmethod
     def calculate_results(self, session_players: List[Any]) -> List[Any]:
         """Calculates elimination logic or ranking."""
         pass
+
+
+class SeededGame(BaseGame):
+    """A game whose content is generated: only the seed and count are kept,
+    and generate() rebuilds any item from (seed, index) when it's needed"""
+
+    def setup_seeded(self, players: List[Dict[str, Any]], count: int, win_score: Optional[int] = None, seed: Optional[int] = None):
+        """Called from start() instead of setup_bank()"""
+        self._setup_players(players, win_score)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.picks = None
+        self.count = count
+
+    @abstractmethod
+    def generate(self, rng: random.Random) -> Any:
+        """Build one item (a dict with an "answer", or a bare answer) from rng"""
+        pass
+
+    def item_at(self, index: int) -> Any:
+        return self.generate(random.Random(f"{self.seed}:{index}"))
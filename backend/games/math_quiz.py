@@ -1,19 +1,20 @@
-from .base_game import BaseGame
+from .base_game import SeededGame
 from typing import List, Dict, Any
 import random
 
-class MathQuiz(BaseGame):
-    def __init__(self):
-        self.questions = []
-        self.scores = {} # player_id -> score
+class MathQuiz(SeededGame):
+    WRONG_POINTS = -1
+
+    # Generator descriptor: questions are rebuilt from (seed, index), never stored
+    QUESTION_COUNT = 50 # Generous pool
+    OPERAND_RANGE = (1, 12)
+    OPERATIONS = ('+', '-', '*', '/')
 
     def get_game_name(self) -> str:
         return "Math Quiz"
 
     def start(self, players: List[Dict[str, Any]]) -> Dict[str, Any]:
-        self.questions = [self._generate_question() for _ in range(50)] # Generous pool
-        # Use user_id as the key, fallback to 'id' if needed
-        self.scores = {p.get('user_id', p.get('id')): 0 for p in players}
+        self.setup_seeded(players, self.QUESTION_COUNT)
         
         return {
             "game_type": "math_quiz",
@@ -24,38 +25,26 @@ class MathQuiz(BaseGame):
             "tutorial": {
                 "text": "Solve as many math problems as you can!",
                 "rules": ["20 Second Time Limit", "Correct = +1 Point", "Wrong = -1 Point"]
-            },
-            "questions": self.questions
+            }
         }
 
-    def process_action(self, player_id: int, action: Dict[str, Any]) -> Dict[str, Any]:
-        # action = { "question_index": 0, "answer": 10 }
-        q_idx = action.get('question_index')
-        answer = action.get('answer')
-        
-        if 0 <= q_idx < len(self.questions):
-             correct = self.questions[q_idx]['answer']
-             if int(answer) == correct:
-                 self.scores[player_id] = self.scores.get(player_id, 0) + 1
-                 return {"result": "correct", "score": self.scores[player_id]}
-             else:
-                 # Optional: Penalty for wrong answer? Plan said -1
-                 self.scores[player_id] = max(0, self.scores.get(player_id, 0) - 1)
-                 return {"result": "incorrect", "score": self.scores[player_id]}
-        
-        return {"result": "incorrect"}
-
-    def end(self) -> Dict[str, Any]:
-        return {"scores": self.scores}
+    def normalize(self, answer: Any) -> str:
+        # "12", " 12" and 12 are the same answer; 12.9 or "12.0" are not integers, so never match
+        if isinstance(answer, int) and not isinstance(answer, bool):
+            return str(answer)
+        text = str(answer).strip()
+        if text.removeprefix('-').isdecimal():
+            return str(int(text))
+        return text
 
     def calculate_results(self, session_players: List[Any]) -> List[Any]:
         # Sort players by score
         pass
 
-    def _generate_question(self):
-        a = random.randint(1, 12)
-        b = random.randint(1, 12)
-        op = random.choice(['+', '-', '*', '/'])
+    def generate(self, rng: random.Random) -> Dict[str, Any]:
+        a = rng.randint(*self.OPERAND_RANGE)
+        b = rng.randint(*self.OPERAND_RANGE)
+        op = rng.choice(self.OPERATIONS)
         if op == '+': 
             ans = a + b
             return {"text": f"{a} {op} {b}", "answer": ans}
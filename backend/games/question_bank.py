@@ -0,0 +1,119 @@
+"""
+Question bank shared by every game that plays authored content.
+
+Content lives in backend/games/content/*.json, one file per game type:
+
+    {"game": "tech_sprint", "questions": [{"category": ..., "difficulty": ..., "text": ..., "answer": ...}]}
+
+It is loaded once per process into read-only storage: strings are interned and
+identical option lists become one shared tuple, so a bank holds a single copy of
+the content no matter how many sessions are playing it. Each game type is
+indexed by (category, difficulty) as compact arrays of item numbers. A round
+samples one of those arrays and keeps the picks (see BaseGame.setup_bank), never
+copies of the questions.
+"""
+import json
+import logging
+import random
+import sys
+from array import array
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_DIR = Path(__file__).parent / "content"
+INDEX_FIELDS = ("category", "difficulty")  # Indexed, not stored on the item
+
+
+class QuestionBank:
+    """Read-only question storage indexed by game type, category and difficulty"""
+
+    def __init__(self, directory: Path = CONTENT_DIR):
+        self.directory = directory
+        self._items: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+        self._index: Dict[str, Dict[Tuple[str, str], array]] = {}
+        self._selections: Dict[Tuple[str, Optional[str], Optional[str]], array] = {}
+        self._shared: Dict[Any, Any] = {}
+        self.loaded = False
+
+    def load(self):
+        """Read every content file; safe to call more than once (app startup calls it eagerly)"""
+        if self.loaded:
+            return
+        for path in sorted(self.directory.glob("*.json")):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            game_type = sys.intern(data["game"])
+            items, index = [], {}
+            for i, question in enumerate(data["questions"]):
+                key = tuple(sys.intern(str(question.get(field, ""))) for field in INDEX_FIELDS)
+                index.setdefault(key, array('H')).append(i)
+                items.append(MappingProxyType({
+                    sys.intern(k): self._share(v) for k, v in question.items() if k not in INDEX_FIELDS
+                }))
+            self._items[game_type] = tuple(items)
+            self._index[game_type] = index
+        self._shared.clear()  # Only needed while loading
+        self.loaded = True
+        logger.info(f"Question bank loaded: { {t: len(items) for t, items in self._items.items()} }")
+
+    def _share(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return sys.intern(value)
+        if isinstance(value, list):
+            value = tuple(self._share(v) for v in value)
+            return self._shared.setdefault(value, value)
+        return value
+
+    def _require(self, game_type: str) -> Tuple[Mapping[str, Any], ...]:
+        if not self.loaded:
+            self.load()
+        try:
+            return self._items[game_type]
+        except KeyError:
+            raise ValueError(f"No question content for game type '{game_type}'")
+
+    def get(self, game_type: str, number: int) -> Mapping[str, Any]:
+        """One question (read-only) by its item number"""
+        return self._require(game_type)[number]
+
+    def select(self, game_type: str, category: Optional[str] = None, difficulty: Optional[str] = None) -> array:
+        """Item numbers matching the filters (None matches anything); cached, don't modify"""
+        self._require(game_type)
+        key = (game_type, category, difficulty)
+        selection = self._selections.get(key)
+        if selection is None:
+            selection = array('H', sorted(
+                number
+                for (cat, diff), numbers in self._index[game_type].items()
+                if category in (None, cat) and difficulty in (None, diff)
+                for number in numbers
+            ))
+            self._selections[key] = selection
+        return selection
+
+    def sample(
+        self,
+        game_type: str,
+        count: int,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ) -> array:
+        """count item numbers: shuffled passes over the selection, so repeats only start once it's used up"""
+        pool = self.select(game_type, category, difficulty)
+        if not pool:
+            raise ValueError(f"No '{game_type}' questions for category={category!r}, difficulty={difficulty!r}")
+        rng = rng or random
+        picks = array('H')
+        while len(picks) < count:
+            passed = list(pool)
+            rng.shuffle(passed)
+            picks.extend(passed[:count - len(picks)])
+        return picks
+
+
+# Global instance
+question_bank = QuestionBank()
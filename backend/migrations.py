@@ -0,0 +1,127 @@
+"""
+Schema migrations with a version ledger.
+
+The schema_migrations table records every migration that has been applied.
+Startup reads the highest recorded version in one query; when it matches the
+newest migration nothing else runs. Otherwise pending migrations run in order
+inside one transaction, under a Postgres advisory lock so instances booting at
+the same time don't race each other.
+
+Adding a migration: append a (version, name, statements) entry to MIGRATIONS.
+Version 1 runs create_all, which already builds the newest models on a fresh
+database, so later migrations must be idempotent (IF NOT EXISTS and the like).
+
+    python -m backend.migrations      # apply pending migrations and exit
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, DateTime, Integer, String, Table, func, select, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from backend.database import Base, engine
+import backend.models  # noqa: F401  Registers every model on Base.metadata
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_xact_lock, shared by every instance
+MIGRATION_LOCK_ID = 7_311_904
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+CREATE_ALL = "create_all"  # Marker statement: Base.metadata.create_all
+
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "baseline", [CREATE_ALL]),
+    (2, "sessions_lobby_name", [
+        "ALTER TABLE sessions ADD COLUMN IF NOT EXISTS lobby_name VARCHAR NULL",
+    ]),
+    (3, "sessions_player_count", [
+        "ALTER TABLE sessions ADD COLUMN IF NOT EXISTS player_count INTEGER NOT NULL DEFAULT 0",
+        # Seat counter used by the atomic join, backfilled from session_players plus the host's seat
+        # (the host never joins, so they have no row)
+        "UPDATE sessions SET player_count = 1 + "
+        "(SELECT count(*) FROM session_players sp WHERE sp.session_id = sessions.id)",
+    ]),
+    (4, "ix_sessions_public_waiting", [
+        "CREATE INDEX IF NOT EXISTS ix_sessions_public_waiting ON sessions (created_at, id) "
+        "WHERE is_public = TRUE AND status = 'waiting'",
+    ]),
+    (5, "session_reaper", [
+        CREATE_ALL,  # sessions_archive, session_players_archive
+        "CREATE INDEX IF NOT EXISTS ix_sessions_open ON sessions (created_at, id) "
+        "WHERE status IN ('waiting', 'playing')",
+        "CREATE INDEX IF NOT EXISTS ix_sessions_done ON sessions (created_at, id) "
+        "WHERE status IN ('closed', 'finished')",
+    ]),
+    (6, "match_results_session_set_null", [
+        # Let the reaper delete sessions that have results; only databases built from
+        # database/schema.sql have match_results (there is no model for it)
+        "DO $$ BEGIN "
+        "IF to_regclass('match_results') IS NOT NULL THEN "
+        "ALTER TABLE match_results DROP CONSTRAINT IF EXISTS match_results_session_id_fkey; "
+        "ALTER TABLE match_results ADD CONSTRAINT match_results_session_id_fkey "
+        "FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE SET NULL; "
+        "END IF; "
+        "END $$",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+async def current_version(conn: AsyncConnection) -> Optional[int]:
+    """Highest applied version, or None when the ledger doesn't exist yet"""
+    try:
+        return await conn.scalar(select(func.max(schema_migrations.c.version)))
+    except ProgrammingError:
+        # Fresh or pre-ledger database; the caller's connection is only used for this probe
+        return None
+
+
+async def run_migrations(bind: AsyncEngine = engine) -> int:
+    """Bring the schema up to LATEST_VERSION. Returns the version afterwards."""
+    async with bind.connect() as conn:
+        version = await current_version(conn)  # The only query on a normal boot
+    if version == LATEST_VERSION:
+        logger.info(f"Schema at version {version}, no migrations needed")
+        return version
+
+    async with bind.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        await conn.run_sync(schema_migrations.create, checkfirst=True)
+
+        # Another instance may have migrated while we waited for the lock
+        version = await current_version(conn) or 0
+        for number, name, statements in MIGRATIONS:
+            if number <= version:
+                continue
+            logger.info(f"Applying migration {number}: {name}")
+            for statement in statements:
+                if statement == CREATE_ALL:
+                    await conn.run_sync(Base.metadata.create_all)
+                else:
+                    await conn.execute(text(statement))
+            await conn.execute(schema_migrations.insert().values(version=number, name=name))
+            version = number
+
+    logger.info(f"Schema migrated to version {version}")
+    return version
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        try:
+            await run_migrations()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
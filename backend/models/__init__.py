@@ -1,4 +1,5 @@
 from .user import User, UserCreate, UserResponse
 from .profile import Profile, ProfileUpdate, ProfileResponse
-from .session import Session, SessionCreate, SessionResponse
+from .session import Session, SessionCreate, SessionResponse, SessionTicketResponse
 from .player import SessionPlayer, PlayerResponse
+from .archive import SessionArchive, SessionPlayerArchive
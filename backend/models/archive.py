@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from datetime import datetime
+from backend.database import Base
+
+# Cold storage for finished lobbies, filled by SessionReaper. No foreign keys:
+# rows outlive the users and sessions they mention.
+
+class SessionArchive(Base):
+    __tablename__ = "sessions_archive"
+
+    id = Column(Integer, primary_key=True)  # Same id the row had in sessions
+    session_code = Column(String, index=True)
+    lobby_name = Column(String, nullable=True)
+    host_id = Column(Integer)
+    status = Column(String)
+    max_players = Column(Integer)
+    player_count = Column(Integer)
+    is_public = Column(Boolean)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow, server_default="now()", index=True)
+
+class SessionPlayerArchive(Base):
+    __tablename__ = "session_players_archive"
+
+    session_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+    score = Column(Integer)
+    is_eliminated = Column(Boolean)
+    joined_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_session_players_archive_user_id", "user_id"),
+    )
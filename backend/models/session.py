@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -14,11 +14,32 @@ class Session(Base):
     host_id = Column(Integer, ForeignKey("users.id"))
     status = Column(String, default="waiting") # waiting, active, finished, closed
     max_players = Column(Integer, default=50)
+    player_count = Column(Integer, nullable=False, default=0, server_default="0")  # Seats taken, host included; see MatchmakingService.join_session
     is_public = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     players = relationship("SessionPlayer", back_populates="session", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Lobby browser: only public waiting lobbies, walked newest-first by (created_at, id)
+        Index(
+            "ix_sessions_public_waiting",
+            "created_at", "id",
+            postgresql_where=(is_public == True) & (status == "waiting")
+        ),
+        # SessionReaper: open lobbies to check for abandonment, and dead ones to archive
+        Index(
+            "ix_sessions_open",
+            "created_at", "id",
+            postgresql_where=status.in_(("waiting", "playing"))
+        ),
+        Index(
+            "ix_sessions_done",
+            "created_at", "id",
+            postgresql_where=status.in_(("closed", "finished"))
+        ),
+    )
+
 class SessionCreate(BaseModel):
     host_id: int
     max_players: int = 50
@@ -31,5 +52,10 @@ class SessionResponse(BaseModel):
     status: str
     max_players: int
     is_public: bool
+    player_count: int | None = None
     
     model_config = ConfigDict(from_attributes=True)
+
+class SessionTicketResponse(SessionResponse):
+    """Create/join response: adds the signed ticket the WebSocket handshake presents"""
+    ticket: str | None = None
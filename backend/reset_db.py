@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from backend.database import engine, Base
-from backend.models import User, Profile, Session, SessionPlayer
+from backend.migrations import run_migrations
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,16 +11,16 @@ async def reset_database():
     logger.info("Starting database reset...")
     try:
         async with engine.begin() as conn:
-            # Drop all tables
+            # Drop all tables (the schema_migrations ledger included)
             logger.info("Dropping all tables...")
             await conn.run_sync(Base.metadata.drop_all)
             logger.info("All tables dropped.")
-            
-            # Create all tables
-            logger.info("Creating all tables...")
-            await conn.run_sync(Base.metadata.create_all)
-            logger.info("All tables created successfully.")
-            
+
+        # Recreate through the migrations so the ledger is stamped
+        logger.info("Creating all tables...")
+        await run_migrations()
+        logger.info("All tables created successfully.")
+
     except Exception as e:
         logger.error(f"Error resetting database: {e}")
     finally:
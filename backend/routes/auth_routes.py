@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.database import get_db
 from backend.models import User, UserCreate, UserResponse, Profile
-from backend.services.auth_service import AuthService
+from backend.services.auth_service import AuthService, HashingBusyError, password_hasher
 from datetime import timedelta
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -23,7 +23,7 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Username already registered")
         
         logger.info("Hashing password...")
-        hashed_pwd = AuthService.get_password_hash(user.password)
+        hashed_pwd = await AuthService.get_password_hash(user.password)
         
         logger.info("Creating user object...")
         new_user = User(username=user.username, password_hash=hashed_pwd)
@@ -44,6 +44,10 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
         logger.info("Registration successful")
         
         return new_user
+    except HTTPException:
+        raise
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail="Server busy, try again shortly", headers={"Retry-After": "2"})
     except Exception as e:
         logger.error(f"Registration CRITICAL error: {str(e)}", exc_info=True)
         await db.rollback()
@@ -54,8 +58,21 @@ async def login(user: UserCreate, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.username == user.username))
     db_user = result.scalars().first()
     
-    if not db_user or not AuthService.verify_password(user.password, db_user.password_hash):
+    if not db_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    try:
+        valid, new_hash = await AuthService.verify_and_update(user.password, db_user.password_hash)
+    except HashingBusyError:
+        raise HTTPException(status_code=503, detail="Server busy, try again shortly", headers={"Retry-After": "2"})
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Old cost parameters (or a legacy bcrypt hash): store the upgraded hash
+    if new_hash:
+        db_user.password_hash = new_hash
+        await db.commit()
+        logger.info(f"Rehashed password for user {db_user.id}")
     
     access_token = AuthService.create_access_token(data={"sub": str(db_user.id)})
     return {"access_token": access_token, "token_type": "bearer", "user_id": db_user.id}
@@ -64,12 +81,13 @@ async def login(user: UserCreate, db: AsyncSession = Depends(get_db)):
 async def debug_auth():
     try:
         test_pw = "TestPass123!"
-        hashed = AuthService.get_password_hash(test_pw)
-        valid = AuthService.verify_password(test_pw, hashed)
+        hashed = await AuthService.get_password_hash(test_pw)
+        valid = await AuthService.verify_password(test_pw, hashed)
         return {
             "status": "ok",
             "hashing_works": valid,
-            "hash_sample": hashed[:10] + "..."
+            "hash_sample": hashed[:10] + "...",
+            "hashing_pool": password_hasher.stats()
         }
     except Exception as e:
         logger.error(f"Debug failed: {e}", exc_info=True)
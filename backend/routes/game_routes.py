@@ -2,6 +2,15 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPExce
 from backend.services.game_service import game_service
 from backend.services.lobby_service import lobby_service
 from backend.services.game_session_service import game_session_service
+from backend.services.connection_manager import manager
+from backend.services.lobby_roster import LobbyRoster
+from backend.services.session_router import session_router
+from backend.services.snapshot_service import snapshot_service
+from backend.services.lobby_feed import lobby_feed, LOBBY_UPDATED, LOBBY_CLOSED
+from backend.services.auth_service import AuthService, InvalidTicketError
+from backend.services.matchmaking_service import MatchmakingService
+from backend.utils.codec import receive_message
+from backend.utils.rate_limit import InboundLimiter, DROP, CLOSE
 from backend.database import get_db, AsyncSessionLocal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import update, select
@@ -9,322 +18,423 @@ from sqlalchemy.orm import Session
 from backend.config import settings
 from backend.games import MathQuiz, SpeedTyping, TechSprint
 from backend.models import Session as GameSessionModel, User
-from typing import List, Dict
-import json
+from typing import List, Dict, Optional
+import logging
 import random
 
+logger = logging.getLogger(__name__)
 router = APIRouter(tags=["game"])
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[str, list[WebSocket]] = {} # session_code -> [ws]
-
-    async def connect(self, websocket: WebSocket, session_code: str):
-        await websocket.accept()
-        if session_code not in self.active_connections:
-            self.active_connections[session_code] = []
-        self.active_connections[session_code].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, session_code: str):
-        if session_code in self.active_connections:
-            self.active_connections[session_code].remove(websocket)
-            if not self.active_connections[session_code]:
-                del self.active_connections[session_code]
-
-    async def broadcast(self, message: dict, session_code: str):
-        # Use .get() to safely access list even if removed concurrently
-        connections = self.active_connections.get(session_code)
-        if connections:
-            # Debug logging
-            ids = [str(getattr(ws, 'user_id', '?')) for ws in connections]
-            print(f"📡 Broadcasting {message.get('type')} to {len(connections)} clients in {session_code}: {ids}")
-            
-            # Create a copy to avoid modification during iteration issues
-            for connection in connections[:]:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except Exception as e:
-                    print(f"⚠️ Error broadcasting to client {getattr(connection, 'user_id', '?')}: {e}")
-                    # Optionally remove dead connection here, but disconnect() should handle it
-
-# In-memory session state for the prototype (Should be in Redis/DB for prod)
-session_state = {} 
-
-manager = ConnectionManager()
+# Live lobby/game state for the sessions this worker owns (see services/session_router.py)
+session_state = {}
 
 @router.websocket("/ws/{session_code}/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, session_code: str, user_id: int):
-    # Attach user_id for debugging  
+async def websocket_endpoint(
+    websocket: WebSocket, session_code: str, user_id: int, ticket: Optional[str] = None, last_seq: Optional[int] = None
+):
+    # Attach user_id for debugging
     websocket.user_id = user_id
-    
-    # OPTIMIZED: Single DB query for both username and host_id
+
+    # Draining for a restart: turn the socket away, the client retries against the new process
+    if snapshot_service.draining:
+        await websocket.close(code=1012)
+        return
+
+    # Signed join ticket from create/join: everything we need, verified in memory
+    claims = None
+    if ticket:
+        try:
+            claims = AuthService.verify_join_ticket(ticket, session_code, user_id)
+        except InvalidTicketError as e:
+            print(f"⛔ Rejected join ticket for user {user_id} in {session_code}: {e}")
+            await websocket.close(code=1008)
+            return
+
+    if claims:
+        user_name, real_host_id, is_public = claims["name"], claims["host_id"], claims["pub"]
+    else:
+        # No ticket (or an expired one): look it up
+        user_name, real_host_id, is_public = await load_join_context(session_code, user_id)
+
+    # Connect IMMEDIATELY - no delays (negotiates the wire codec from the subprotocol)
+    conn = await manager.connect(websocket, session_code, user_id)
+
+    # Every event for this session runs on the worker that owns it (this one, unless multi-worker)
+    owner = await session_router.resolve_owner(session_code)
+    await session_router.dispatch(
+        owner, "join", session_code, user_id,
+        user_name=user_name, host_id=real_host_id, is_public=is_public, last_seq=last_seq
+    )
+
+    limiter = InboundLimiter()
+    try:
+        while True:
+            message = await receive_message(websocket, conn.codec)
+            conn.touch()
+            msg_type = message.get("type") if isinstance(message, dict) else message
+            verdict = limiter.check(msg_type)
+            if verdict == DROP:
+                continue  # Over its budget for this message type
+            if verdict == CLOSE:
+                # Kept flooding after drops: cut it off (1008 = policy violation); the drop handler makes it a leave
+                manager.drop(conn, reason=f"rate limited ({limiter.dropped} messages dropped)", code=1008)
+                return
+            if msg_type == "PONG":
+                continue  # Heartbeat reply: liveness is all it carries
+            await session_router.dispatch(owner, "message", session_code, user_id, message=message)
+
+    except WebSocketDisconnect:
+        manager.disconnect(websocket, session_code)
+
+        # Shutdown drain (started by the stop signal, never by a client close code): keep the player in the snapshot
+        if snapshot_service.draining:
+            return
+
+        # Skip if the user already reconnected on a newer socket (page change waiting room -> game)
+        if manager.get_connection(session_code, user_id) is None:
+            await session_router.dispatch(owner, "leave", session_code, user_id)
+
+
+async def handle_dropped(session_code: str, user_id: int):
+    """ConnectionManager evicted a socket (missed heartbeats or failed sends): the player leaves now"""
+    if snapshot_service.draining:
+        return
+    # A newer socket (reconnect) keeps the player in; handle_leave ignores players already gone
+    if manager.get_connection(session_code, user_id) is None:
+        owner = await session_router.resolve_owner(session_code)
+        await session_router.dispatch(owner, "leave", session_code, user_id)
+
+
+async def load_join_context(session_code: str, user_id: int):
+    """(username, host_id, is_public) from the DB, for sockets that present no join ticket"""
+    # OPTIMIZED: Single DB session for both username and host_id
     user_name = f"Player {user_id}"  # Fallback
     real_host_id = user_id  # Fallback
-    
+    is_public = False  # Fallback: keep unknown lobbies out of the lobby feed
+
     try:
-        from backend.database import AsyncSessionLocal
-        from sqlalchemy import select
-        from backend.models import User, Session
-        
         async with AsyncSessionLocal() as db:
-            # Single transaction for both queries
             user_result = await db.execute(select(User).where(User.id == user_id))
-            session_result = await db.execute(select(Session).where(Session.session_code == session_code))
-            
+            session_result = await db.execute(select(GameSessionModel).where(GameSessionModel.session_code == session_code))
+
             db_user = user_result.scalars().first()
             db_session = session_result.scalars().first()
-            
+
             if db_user:
                 user_name = db_user.username
             if db_session:
                 real_host_id = db_session.host_id
-                
+                is_public = db_session.is_public
+
         print(f"✓ Loaded user '{user_name}', host={real_host_id}")
     except Exception as e:
         print(f"⚠️ DB error: {e}, using fallbacks")
-    
-    # Connect IMMEDIATELY - no delays
-    await manager.connect(websocket, session_code)
-    
+
+    return user_name, real_host_id, is_public
+
+
+async def publish_lobby_event(session_code: str, event: str, **fields):
+    """Lobby browser feed (services/lobby_feed.py); private lobbies never appear in it"""
+    state = session_state.get(session_code)
+    if state and state.get("is_public"):
+        await lobby_feed.publish(event, {"session_code": session_code, **fields})
+
+
+# --- Owner-side handlers: called directly, or forwarded from other workers by session_router ---
+
+async def handle_join(
+    session_code: str, user_id: int, user_name: str, host_id: int, is_public: bool = False, last_seq: Optional[int] = None
+):
+    """A player's socket connected (on any worker). last_seq: the client is resuming after a dropped socket."""
+    resumed = False
+    if last_seq is not None and session_code in session_state:
+        missed = manager.replay_since(session_code, user_id, last_seq)
+        if missed is not None:
+            # Replay just what it missed; its own state is intact, so no late-join resync below
+            print(f"⏩ User {user_id} resumed {session_code} from seq {last_seq}: replaying {len(missed)} frame(s)")
+            for frame in missed:
+                await manager.send_to_user(frame, session_code, user_id)
+            resumed = True
+        else:
+            # Too far behind: a compact snapshot, then the usual late-join state
+            game_session = session_state[session_code].get("game_session")
+            await manager.send_to_user({
+                "type": "SESSION_RESYNC",
+                "seq": manager.last_seq(session_code),
+                "phase": game_session.phase if game_session else "lobby",
+                "round": game_session.current_round if game_session else None,
+                "ended": bool(game_session and game_session.ended),
+            }, session_code, user_id)
+
     # Check if game is already running and send ROUND_START immediately
     if session_code in session_state and "game_session" in session_state[session_code]:
         game_session = session_state[session_code]["game_session"]
-        current_state = game_session.get_current_state()
-        
+        game_session.player_connected(user_id)
+        current_state = None if resumed else game_session.current_state_frame()
+
         if current_state:
             print(f"⚡ Late join: Sending ROUND_START to user {user_id}")
-            await websocket.send_text(json.dumps(current_state))
-            
+            await manager.send_to_user(current_state, session_code, user_id)
+
             # If round is ALREADY synced, tell this late user immediately!
             if game_session.is_round_synced:
                  print(f"⚡ Round is ALREADY synced. Unblocking user {user_id}...")
-                 await websocket.send_text(json.dumps({
+                 await manager.send_to_user({
                      "type": "ALL_PLAYERS_READY",
                      "message": "Late join - unblocking immediately"
-                 }))
-    
+                 }, session_code, user_id)
+
     # Init Session Config if needed
     if session_code not in session_state:
-        session_state[session_code] = {"players": {}, "host_id": real_host_id}
-        
-    # Register Player
-    session_state[session_code]["players"][user_id] = {
+        roster = LobbyRoster(session_code, manager)
+        # "players" is the roster's own dict; mutate it only through the roster so deltas are recorded
+        session_state[session_code] = {
+            "players": roster.players, "roster": roster, "host_id": host_id, "is_public": is_public
+        }
+    roster = session_state[session_code]["roster"]
+
+    # Back in a session restored from a snapshot (see services/snapshot_service.py)
+    session_state[session_code].get("awaiting_reconnect", set()).discard(user_id)
+
+    # Register Player (everyone else hears about it in the next coalesced delta)
+    roster.add({
         "user_id": user_id,
         "name": user_name,
         "is_ready": False,
         "is_host": (session_state[session_code]["host_id"] == user_id),
-        "icon": "🎓" 
-    }
-    
-    # Broadcast Join Update
-    players_list = list(session_state[session_code]["players"].values())
-    await manager.broadcast({"type": "PLAYER_LIST_UPDATE", "players": players_list}, session_code)
+        "icon": "🎓"
+    })
+
+    # The joiner needs the whole roster once
+    await manager.send_to_user(roster.snapshot(), session_code, user_id)
+
+
+async def handle_message(session_code: str, user_id: int, message):
+    """One inbound client message"""
+    if session_code not in session_state:
+        print(f"⚠️ Message from {user_id} for unknown session {session_code} ignored")
+        return
+    roster = session_state[session_code]["roster"]
+
+    # Allow raw string commands for simple testing
+    msg_type = message.get("type", message) if isinstance(message, dict) else message
+
+    if msg_type == "GET_PLAYERS":
+         # Snapshot fallback: only the asking client (e.g. after a version gap) gets the full roster
+         known_version = message.get("known_version") if isinstance(message, dict) else None
+         logger.debug(f"Roster snapshot requested by {user_id} (known version: {known_version})")
+         await manager.send_to_user(roster.snapshot(), session_code, user_id)
+
+    elif msg_type == "PLAYER_READY":
+        is_ready = message.get("is_ready", True)
+        roster.update(user_id, is_ready=is_ready)
+
+    elif msg_type == "START_GAME":
+        # Check if host
+         actual_host = session_state[session_code]["host_id"]
+         print(f"DEBUG: START_GAME received from {user_id}. Host is {actual_host}. Msg: {message}")
+
+         if actual_host == user_id:
+             # Host is implicitly ready if they click Start
+             roster.update(user_id, is_ready=True)
+
+             force_test = message.get("force_test", False)
+
+             # Check DEV MODE bypass or ALL READY
+             all_ready = all(p["is_ready"] for p in session_state[session_code]["players"].values())
+             player_count = len(session_state[session_code]["players"])
+
+             should_start = False
+             if force_test:
+                 # Test mode: Allow solo play (1+ players)
+                 should_start = True
+                 print(f"✓ Force starting session {session_code} (Test Mode) with {player_count} player(s)")
+             elif (all_ready and player_count >= 2):
+                 should_start = True
+                 print(f"✓ Starting session {session_code} - all players ready")
+             elif settings.DEV_MODE:
+                 should_start = True
+                 print(f"✓ Starting session {session_code} (DEV_MODE)")
+
+             if should_start:
+                print(f"🎮 Starting game session for {session_code}")
 
-    try:
-        while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            
-            # Allow raw string commands for simple testing
-            msg_type = message.get("type", message) if isinstance(message, dict) else message
-
-            if msg_type == "GET_PLAYERS":
-                 players_list = list(session_state[session_code]["players"].values())
-                 await manager.broadcast({"type": "PLAYER_LIST_UPDATE", "players": players_list}, session_code)
-
-            elif msg_type == "PLAYER_READY":
-                is_ready = message.get("is_ready", True)
-                if user_id in session_state[session_code]["players"]:
-                    session_state[session_code]["players"][user_id]["is_ready"] = is_ready
-                
-                # Broadcast Update
-                players_list = list(session_state[session_code]["players"].values())
-                await manager.broadcast({"type": "PLAYER_LIST_UPDATE", "players": players_list}, session_code)
-            
-            elif msg_type == "START_GAME":
-                # Check if host
-                 actual_host = session_state[session_code]["host_id"]
-                 print(f"DEBUG: START_GAME received from {user_id}. Host is {actual_host}. Msg: {message}")
-                 
-                 if actual_host == user_id:
-                     # Host is implicitly ready if they click Start
-                     if user_id in session_state[session_code]["players"]:
-                         session_state[session_code]["players"][user_id]["is_ready"] = True
-                         
-                     force_test = message.get("force_test", False)
-                     
-                     # Check DEV MODE bypass or ALL READY
-                     all_ready = all(p["is_ready"] for p in session_state[session_code]["players"].values())
-                     player_count = len(session_state[session_code]["players"])
-                     
-                     should_start = False
-                     if force_test:
-                         # Test mode: Allow solo play (1+ players)
-                         should_start = True
-                         print(f"✓ Force starting session {session_code} (Test Mode) with {player_count} player(s)")
-                     elif (all_ready and player_count >= 2):
-                         should_start = True
-                         print(f"✓ Starting session {session_code} - all players ready")
-                     elif settings.DEV_MODE:
-                         should_start = True
-                         print(f"✓ Starting session {session_code} (DEV_MODE)")
-                     
-                     if should_start: 
-                        print(f"🎮 Starting game session for {session_code}")
-                        
-                        try:
-                            # Get players list
-                            players = list(session_state[session_code]["players"].values())
-                            print(f"   Players: {[p['name'] for p in players]}")
-                            
-                            # Start game session with full round management
-                            game_session = await game_session_service.start_session(
-                                session_code, 
-                                players,
-                                manager,
-                                is_test_mode=force_test
-                            )
-                            
-                            # Store session reference
-                            session_state[session_code]["game_session"] = game_session
-                            
-                            # Update DB status so polling works for late/sync-failed clients
-                            try:
-                                async with AsyncSessionLocal() as db:
-                                    await db.execute(
-                                        update(GameSessionModel)
-                                        .where(GameSessionModel.session_code == session_code)
-                                        .values(status='playing')
-                                    )
-                                    await db.commit()
-                                print(f"✓ Updated DB status to 'playing' for {session_code}")
-                            except Exception as e:
-                                print(f"⚠️ Failed to update DB status: {e}")
-                            
-                            # Force broadcast GAME_START
-                            print(f"📣 Force broadcasting GAME_START for {session_code}")
-                            await manager.broadcast({
-                                "type": "GAME_START",
-                                "session_code": session_code
-                            }, session_code)
-                            
-                            print(f"✓ Game session started successfully for {session_code}")
-                        except Exception as e:
-                            print(f"❌ ERROR starting game session for {session_code}: {e}")
-                            import traceback
-                            traceback.print_exc()
-                            await websocket.send_text(json.dumps({
-                                "type": "ERROR",
-                                "message": f"Failed to start game: {str(e)}"
-                            }))
-                     else:
-                         # Send error/warning to host
-                         await websocket.send_text(json.dumps({
-                             "type": "ERROR",
-                             "message": f"Cannot start: Need at least 2 players and all ready (current: {player_count} players, all_ready: {all_ready})"
-                         }))
-
-            elif msg_type == "ROUND_COMPLETE":
-                # Player finished the round (for Race Mode)
-                print(f"🏁 ROUND_COMPLETE received from {user_id}")
-                if "game_session" in session_state[session_code]:
-                    game_session = session_state[session_code]["game_session"]
-                    score = message.get("score", 0)
-                    
-                    # Trigger Race Logic
-                    await game_session.handle_player_finish(user_id, score)
-                else:
-                    print(f"⚠️ ROUND_COMPLETE ignore - game session not found for {session_code}")
-
-            elif msg_type == "GAME_ACTION":
-                # Handle game actions (answers, progress, etc.)
-                # Removed incorrect score tracking - frontend validates correctness
-                # Final score comes from ROUND_COMPLETE message
-                pass
-            
-            elif msg_type == "GET_GAME_STATE":
-                # Resend the current game state (ROUND_START) if active
-                if "game_session" in session_state[session_code]:
-                    game_session = session_state[session_code]["game_session"]
-                    current_state = game_session.get_current_state()
-                    if current_state:
-                        print(f"✓ Resending game state (ROUND_START) to user {user_id} - fallback for missed broadcast")
-                        await websocket.send_text(json.dumps(current_state))
-                    else:
-                        print(f"⚠️ Game session exists but no current state available for user {user_id}")
-                else:
-                    print(f"⚠️ GET_GAME_STATE requested by user {user_id} but no active game session found")
-            
-            elif msg_type == "PLAYER_READY_FOR_ROUND":
-                # Player has received ROUND_START and is ready to start game sequence
-                print(f"📥 PLAYER_READY_FOR_ROUND received from user {user_id} in session {session_code}")
-                
-                if "game_session" in session_state[session_code]:
-                    game_session = session_state[session_code]["game_session"]
-                    ready_count = game_session.mark_player_ready(user_id)
-                    
-                    print(f"   Ready count: {ready_count}/{game_session.total_expected_players}")
-                    print(f"   Ready players: {game_session.players_ready_for_round}")
-                    
-                    # Check if all players are ready
-                    if game_session.check_all_players_ready():
-                        print(f"✅ All players ready for {session_code}! Broadcasting ALL_PLAYERS_READY...")
-                        
-                        # Mark as synced so late joiners don't get stuck
-                        game_session.mark_round_synced()
-                        
-                        # Reset ready set for next round
-                        game_session.reset_ready_status()
-                        
-                        # Broadcast to all clients to start game sequence
-                        await manager.broadcast({
-                            "type": "ALL_PLAYERS_READY",
-                            "message": "All players synchronized! Starting game..."
-                        }, session_code)
-                        print(f"✓ ALL_PLAYERS_READY broadcasted to session {session_code}")
-                    else:
-                        print(f"⏳ Waiting for more players: {ready_count}/{game_session.total_expected_players}")
-                else:
-                    print(f"⚠️ PLAYER_READY_FOR_ROUND received but no active game session for {session_code}")
-            
-            # Duplicate ROUND_COMPLETE handler removed
-
-            
-    except WebSocketDisconnect:
-        manager.disconnect(websocket, session_code)
-        
-        if session_code in session_state and user_id in session_state[session_code]["players"]:
-            del session_state[session_code]["players"][user_id]
-            
-            # Auto-Dissolve if empty - UPDATE DATABASE FIRST
-            game_active = "game_session" in session_state[session_code]
-            
-            if not session_state[session_code]["players"] and not game_active:
-                print(f"Session {session_code} is empty and NO game active. Dissolving...")
-                
-                # Update DB to close session BEFORE clearing memory
-                from backend.database import AsyncSessionLocal
-                from sqlalchemy import update
-                from backend.models import Session
-                
                 try:
-                    async with AsyncSessionLocal() as db:
-                        await db.execute(
-                            update(Session)
-                            .where(Session.session_code == session_code)
-                            .values(status="closed")
-                        )
-                        await db.commit()
-                        print(f"✓ Session {session_code} marked as closed in DB.")
+                    # Get players list
+                    players = list(session_state[session_code]["players"].values())
+                    print(f"   Players: {[p['name'] for p in players]}")
+
+                    # Start game session with full round management
+                    game_session = await game_session_service.start_session(
+                        session_code,
+                        players,
+                        manager,
+                        is_test_mode=force_test
+                    )
+
+                    # Store session reference
+                    session_state[session_code]["game_session"] = game_session
+
+                    # Update DB status so polling works for late/sync-failed clients
+                    try:
+                        async with AsyncSessionLocal() as db:
+                            await db.execute(
+                                update(GameSessionModel)
+                                .where(GameSessionModel.session_code == session_code)
+                                .values(status='playing')
+                            )
+                            await db.commit()
+                        print(f"✓ Updated DB status to 'playing' for {session_code}")
+                    except Exception as e:
+                        print(f"⚠️ Failed to update DB status: {e}")
+
+                    # Drops out of every lobby browser's list
+                    await publish_lobby_event(session_code, LOBBY_UPDATED, status='playing')
+
+                    # Force broadcast GAME_START
+                    print(f"📣 Force broadcasting GAME_START for {session_code}")
+                    await manager.broadcast({
+                        "type": "GAME_START",
+                        "session_code": session_code
+                    }, session_code)
+
+                    print(f"✓ Game session started successfully for {session_code}")
                 except Exception as e:
-                    print(f"✗ ERROR closing session in DB: {e}")
-                    # Still clean up memory even if DB update fails
-                
-                # Now clean up in-memory state
-                del session_state[session_code]
-                print(f"✓ Session {session_code} removed from memory.")
+                    print(f"❌ ERROR starting game session for {session_code}: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    await manager.send_to_user({
+                        "type": "ERROR",
+                        "message": f"Failed to start game: {str(e)}"
+                    }, session_code, user_id)
+             else:
+                 # Send error/warning to host
+                 await manager.send_to_user({
+                     "type": "ERROR",
+                     "message": f"Cannot start: Need at least 2 players and all ready (current: {player_count} players, all_ready: {all_ready})"
+                 }, session_code, user_id)
+
+    elif msg_type == "ROUND_COMPLETE":
+        # Player finished the round; their score is the server's tally from GAME_ACTION, never a client claim
+        print(f"🏁 ROUND_COMPLETE received from {user_id}")
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
 
+            # Trigger Race Logic
+            await game_session.handle_player_finish(user_id)
+        else:
+            print(f"⚠️ ROUND_COMPLETE ignore - game session not found for {session_code}")
+
+    elif msg_type == "GAME_ACTION":
+        # Answers are scored server-side; clients batch them as "actions": [[question_index, answer], ...]
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
+            actions = message.get("actions")
+            if actions is None and game_session.current_game is not None:
+                # Older clients send one answer per frame
+                game = game_session.current_game
+                actions = [(message.get(game.INDEX_KEY), message.get(game.ANSWER_KEY))]
+            if isinstance(actions, list):
+                await game_session.handle_actions(user_id, actions)
+
+    elif msg_type == "GET_GAME_STATE":
+        # Resend the current game state (ROUND_START) if active
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
+            current_state = game_session.current_state_frame()
+            if current_state:
+                print(f"✓ Resending game state (ROUND_START) to user {user_id} - fallback for missed broadcast")
+                await manager.send_to_user(current_state, session_code, user_id)
             else:
-                # Broadcast updated player list to remaining players
-                players_list = list(session_state[session_code]["players"].values())
-                await manager.broadcast({"type": "PLAYER_LIST_UPDATE", "players": players_list}, session_code)
+                print(f"⚠️ Game session exists but no current state available for user {user_id}")
+        else:
+            print(f"⚠️ GET_GAME_STATE requested by user {user_id} but no active game session found")
+
+    elif msg_type == "GET_QUESTIONS":
+        # Client is running low on questions: send the next chunk to it alone
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
+            start = message.get("from")
+            if isinstance(start, int) and message.get("round") in (None, game_session.current_round):
+                chunk = game_session.question_chunk(start)
+                if chunk:
+                    await manager.send_to_user(chunk, session_code, user_id)
+
+    elif msg_type == "PHASE_ACK":
+        # Client finished a phase (on the game page, showed results/intermission/game over)
+        if "game_session" in session_state[session_code]:
+            session_state[session_code]["game_session"].ack_phase(user_id, message.get("phase"))
+
+    elif msg_type == "PLAYER_READY_FOR_ROUND":
+        # Player has received ROUND_START and is ready to start game sequence
+        print(f"📥 PLAYER_READY_FOR_ROUND received from user {user_id} in session {session_code}")
+
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
+            ready_count = game_session.mark_player_ready(user_id)
+
+            print(f"   Ready count: {ready_count}/{game_session.total_expected_players}")
+            print(f"   Ready players: {game_session.players_ready_for_round}")
+
+            # Check if all players are ready
+            if not await game_session.sync_round_if_ready():
+                print(f"⏳ Waiting for more players: {ready_count}/{game_session.total_expected_players}")
+        else:
+            print(f"⚠️ PLAYER_READY_FOR_ROUND received but no active game session for {session_code}")
+
+
+async def handle_leave(session_code: str, user_id: int):
+    """A player's last socket closed"""
+    if snapshot_service.draining:
+        return  # Shutting down: keep them in the roster so the snapshot brings them back
+    if session_code in session_state and user_id in session_state[session_code]["players"]:
+        roster = session_state[session_code]["roster"]
+        roster.remove(user_id)
+
+        # Phase and ready barriers stop waiting on a player who is gone
+        if "game_session" in session_state[session_code]:
+            game_session = session_state[session_code]["game_session"]
+            game_session.player_disconnected(user_id)
+            await game_session.sync_round_if_ready()
+
+        # Free their seat so the lobby doesn't fill up with players who already left
+        try:
+            async with AsyncSessionLocal() as db:
+                await MatchmakingService.leave_session(db, session_code, user_id)
+        except Exception as e:
+            logger.error(f"Error releasing seat of {user_id} in {session_code}: {e}")
+
+        # Auto-Dissolve if empty - UPDATE DATABASE FIRST
+        game_active = "game_session" in session_state[session_code]
+
+        if not session_state[session_code]["players"] and not game_active:
+            print(f"Session {session_code} is empty and NO game active. Dissolving...")
+
+            # Update DB to close session BEFORE clearing memory
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(GameSessionModel)
+                        .where(GameSessionModel.session_code == session_code)
+                        .values(status="closed")
+                    )
+                    await db.commit()
+                    print(f"✓ Session {session_code} marked as closed in DB.")
+            except Exception as e:
+                print(f"✗ ERROR closing session in DB: {e}")
+                # Still clean up memory even if DB update fails
+
+            await publish_lobby_event(session_code, LOBBY_CLOSED)
+
+            # Now clean up in-memory state
+            roster.close()
+            del session_state[session_code]
+            manager.forget_session(session_code)
+            await session_router.release(session_code)
+            print(f"✓ Session {session_code} removed from memory.")
+
+        # Otherwise the removal goes out to remaining players in the next roster delta
+
+
+session_router.bind(handle_join, handle_message, handle_leave)
+manager.on_drop(handle_dropped)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from backend.utils.pool_metrics import pool_stats
+from backend.utils.rate_limit import rate_limit_stats
+from backend.services.auth_service import password_hasher
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/")
+async def health():
+    """Liveness plus pressure gauges: DB pool, password hashing queue and WebSocket rate limiting"""
+    return {
+        "status": "ok",
+        "db_pool": pool_stats.as_dict(),
+        "hashing_pool": password_hasher.stats(),
+        "ws_rate_limit": rate_limit_stats.as_dict()
+    }
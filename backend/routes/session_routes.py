@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.database import get_db
-from backend.models import SessionCreate, SessionResponse, PlayerResponse, Session
-from backend.services.matchmaking_service import MatchmakingService
+from backend.database import get_db, AsyncSessionLocal
+from backend.models import SessionCreate, SessionResponse, SessionTicketResponse, PlayerResponse, Session
+from backend.services.matchmaking_service import MatchmakingService, JoinError, JOIN_NOT_FOUND
 from backend.services.lobby_service import lobby_service
+from backend.services.snapshot_service import snapshot_service
+from backend.services.lobby_feed import lobby_feed
+from backend.services.session_list_cache import session_list_cache
+from backend.utils.codec import JSON_CODEC
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
-@router.post("/", response_model=SessionResponse)
+@router.post("/", response_model=SessionTicketResponse)
 async def create_session(session_data: SessionCreate, db: AsyncSession = Depends(get_db)):
+    if snapshot_service.draining:
+        raise HTTPException(status_code=503, detail="Server is restarting, try again shortly")
     session = await MatchmakingService.create_session(
         db, 
         session_data.host_id, 
@@ -18,18 +25,67 @@ async def create_session(session_data: SessionCreate, db: AsyncSession = Depends
     )
     # Start inactivity monitor
     await lobby_service.start_tracking(session.session_code, lambda code: print(f"Session {code} dissolved"))
-    return session
+    return await MatchmakingService.issue_host_ticket(db, session)
 
-@router.post("/{code}/join", response_model=SessionResponse)
+@router.post("/{code}/join", response_model=SessionTicketResponse)
 async def join_session(code: str, user_id: int, db: AsyncSession = Depends(get_db)):
+    if snapshot_service.draining:
+        raise HTTPException(status_code=503, detail="Server is restarting, try again shortly")
     try:
         session = await MatchmakingService.join_session(db, code, user_id)
-        lobby_service.register_session_activity(code)
+        await lobby_service.register_session_activity(code)
         return session
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except JoinError as e:
+        # 404 for unknown codes, 409 for started/full lobbies
+        status_code = 404 if e.outcome == JOIN_NOT_FOUND else 409
+        raise HTTPException(status_code=status_code, detail={"outcome": e.outcome, "message": str(e)})
 
 @router.get("/", response_model=list[SessionResponse])
-async def list_sessions(db: AsyncSession = Depends(get_db)):
-    sessions = await MatchmakingService.get_public_sessions(db)
-    return sessions
+async def list_sessions(request: Request, limit: int | None = None, cursor: str | None = None, db: AsyncSession = Depends(get_db)):
+    # Later pages (and custom page sizes) are rare; only the default first page is cached
+    if cursor or limit:
+        try:
+            sessions, next_cursor = await MatchmakingService.get_public_sessions(db, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return Response(
+            content=JSON_CODEC.encode([s.model_dump() for s in sessions]),
+            media_type="application/json",
+            headers=headers
+        )
+
+    # Pre-serialized body; the ETag lets pollers skip the download when nothing changed
+    body, etag, next_cursor = await session_list_cache.get(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/feed")
+async def session_feed():
+    """Server-sent events: the public lobby list once, then lobby_created/updated/closed"""
+    queue = lobby_feed.subscribe()
+    # Own DB session: a request-scoped one would stay checked out for the life of the stream
+    try:
+        async with AsyncSessionLocal() as db:
+            body, _, _ = await session_list_cache.get(db)
+    except Exception:
+        lobby_feed.unsubscribe(queue)
+        raise
+    # The cached list body is already single-line JSON
+    snapshot = f"event: snapshot\ndata: {body.decode()}\n\n"
+    return StreamingResponse(
+        lobby_feed.stream(queue, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{code}", response_model=SessionResponse)
+async def get_session(code: str, db: AsyncSession = Depends(get_db)):
+    session = await MatchmakingService.get_session(db, code)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
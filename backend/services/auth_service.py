@@ -1,20 +1,97 @@
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
+import logging
 import jwt
 from backend.config import settings
 
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+class InvalidTicketError(Exception):
+    """Join ticket is forged, malformed or issued for another user/session"""
+    pass
+
+
+class HashingBusyError(Exception):
+    """Too many logins/registrations already waiting for a hashing worker"""
+    pass
+
+
+class PasswordHasher:
+    """Runs argon2 on a small thread pool so a login burst never stalls the event loop.
+
+    argon2-cffi releases the GIL while hashing, so threads run in parallel with
+    the loop. Callers queue on a semaphore (not inside the executor) so the
+    queue depth is observable and bounded.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._slots = asyncio.Semaphore(workers)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.waiting = 0  # Queue depth: callers waiting for a free worker
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HashingBusyError("Password hashing queue is full")
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(settings.HASH_WORKERS, settings.HASH_MAX_QUEUE)
+
 
 class AuthService:
     # Removed _pre_hash as argon2 handles long passwords natively
 
     @staticmethod
-    def verify_password(plain_password, hashed_password):
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password, hashed_password):
+        return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+    @staticmethod
+    async def verify_and_update(plain_password, hashed_password) -> tuple[bool, str | None]:
+        """Verify, and return a fresh hash if the stored one uses old parameters or bcrypt"""
+        return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
     @staticmethod
-    def get_password_hash(password):
-        return pwd_context.hash(password)
+    async def get_password_hash(password):
+        return await password_hasher.run(pwd_context.hash, password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -26,3 +103,33 @@ class AuthService:
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
+
+    @staticmethod
+    def create_join_ticket(user_id: int, username: str, session_code: str, host_id: int, is_public: bool) -> str:
+        """Short-lived ticket carrying everything the WebSocket handshake used to query"""
+        return AuthService.create_access_token(
+            data={
+                "typ": "join",
+                "sub": str(user_id),
+                "name": username,
+                "code": session_code,
+                "host": user_id == host_id,
+                "host_id": host_id,
+                "pub": is_public
+            },
+            expires_delta=timedelta(minutes=settings.JOIN_TICKET_EXPIRE_MINUTES)
+        )
+
+    @staticmethod
+    def verify_join_ticket(ticket: str, session_code: str, user_id: int) -> dict | None:
+        """Claims of a valid ticket, or None if it merely expired (caller falls back to the DB)"""
+        try:
+            claims = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            return None
+        except jwt.InvalidTokenError as e:
+            raise InvalidTicketError(str(e))
+
+        if claims.get("typ") != "join" or claims.get("code") != session_code or claims.get("sub") != str(user_id):
+            raise InvalidTicketError("ticket was issued for another user or session")
+        return claims
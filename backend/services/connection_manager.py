@@ -0,0 +1,330 @@
+"""
+Connection Manager - Fans session messages out to WebSocket clients.
+
+Each message is serialized once per wire codec (see backend/utils/codec.py) and
+handed to every connection's bounded outbound queue. A dedicated writer task per
+connection drains its queue, so one slow client can never hold up
+ROUND_START/ROUND_RESULT for the others.
+
+With a distributed state backend, every frame is also published on the
+session's bus channel so workers holding the session's other sockets deliver
+it too (see backend/services/session_router.py).
+
+Game-flow messages (REPLAYED_TYPES) carry a per-session "seq" and the last
+WS_REPLAY_BUFFER_SIZE of them are kept, so a client that reconnects with the
+last seq it saw gets just the frames it missed (see replay_since). They are
+stamped by the session's owner, which is where every game-flow message starts.
+
+A heartbeat task sends PING every WS_PING_INTERVAL. A socket that sends nothing
+(PONG or otherwise) for WS_PING_TIMEOUT, or whose sends fail, is evicted, and
+the drop handler turns that into a leave right away (see game_routes), instead
+of the session waiting for TCP to notice a half-open connection.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from fastapi import WebSocket
+from backend.config import settings
+from backend.utils.codec import OutboundFrame, negotiate
+
+
+# Roster deltas resync through their own versions and QUESTION_CHUNK is re-requested, so neither is replayed
+REPLAYED_TYPES = frozenset({
+    "GAME_START", "ROUND_START", "ALL_PLAYERS_READY", "ROUND_RESULT",
+    "INTERMISSION", "GAME_SESSION_END", "REDIRECT_TO_LOBBY",
+})
+
+
+PING_FRAME = OutboundFrame({"type": "PING"})  # Shared by every heartbeat
+
+
+class ReplayBuffer:
+    """Recent sequenced frames of one session: (seq, recipients or None for everyone, frame)"""
+
+    def __init__(self, size: int):
+        self.frames: deque = deque(maxlen=size)
+        self.seq = 0  # Last sequence number handed out
+
+    def add(self, message: dict, user_ids: Iterable[int] | None) -> OutboundFrame:
+        self.seq += 1
+        frame = OutboundFrame({**message, "seq": self.seq})
+        recipients: FrozenSet[int] | None = frozenset(user_ids) if user_ids is not None else None
+        self.frames.append((self.seq, recipients, frame))
+        return frame
+
+    def since(self, user_id: int, last_seq: int) -> List[OutboundFrame] | None:
+        """Frames after last_seq meant for user_id, or None if they can't all be replayed"""
+        if last_seq > self.seq:
+            return None  # Seen under an earlier buffer (server restarted)
+        if last_seq < self.seq and (not self.frames or self.frames[0][0] > last_seq + 1):
+            return None  # Part of the gap has already been evicted
+        return [frame for seq, recipients, frame in self.frames
+                if seq > last_seq and (recipients is None or user_id in recipients)]
+
+
+class ClientConnection:
+    """Outbound side of one WebSocket: a bounded queue drained by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, session_code: str, user_id: int, manager: "ConnectionManager", codec):
+        self.websocket = websocket
+        self.session_code = session_code
+        self.user_id = user_id
+        self.manager = manager
+        self.codec = codec
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_SIZE)
+        self.degraded = False  # Set while the backlog is above the high-water mark
+        self.closed = False
+        self.last_seen = time.monotonic()  # Last frame received from the client
+        self.writer_task = asyncio.create_task(self._writer())
+
+    def touch(self):
+        """The client sent something, so the socket is alive"""
+        self.last_seen = time.monotonic()
+
+    def enqueue(self, payload: str | bytes) -> bool:
+        """Queue an already-encoded frame without blocking. Returns False if the client can't keep up."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            return False
+
+        if not self.degraded and self.queue.qsize() >= settings.WS_SEND_QUEUE_HIGH_WATER:
+            self.degraded = True
+            print(f"🐢 Client {self.user_id} in {self.session_code} is lagging ({self.queue.qsize()} frames queued)")
+        return True
+
+    async def _writer(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                if self.codec.binary:
+                    send = self.websocket.send_bytes(payload)
+                else:
+                    send = self.websocket.send_text(payload)
+                await asyncio.wait_for(send, timeout=settings.WS_SEND_TIMEOUT)
+                if self.degraded and self.queue.qsize() < settings.WS_SEND_QUEUE_HIGH_WATER // 2:
+                    self.degraded = False
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Error sending to client {self.user_id} in {self.session_code}: {e}")
+            self.manager.drop(self, reason="send failed")
+
+    def close(self):
+        """Stop the writer task and discard anything still queued"""
+        self.closed = True
+        if self.writer_task and not self.writer_task.done():
+            self.writer_task.cancel()
+
+
+class ConnectionManager:
+    def __init__(self):
+        self.active_connections: Dict[str, List[ClientConnection]] = {}  # session_code -> [conn]
+        self.user_connections: Dict[Tuple[str, int], ClientConnection] = {}  # (session_code, user_id) -> conn
+        self.background_tasks = set()
+        self.replay_buffers: Dict[str, ReplayBuffer] = {}  # session_code -> sequenced game-flow frames
+        self.bus = None  # StateBackend, set by attach_bus() when running multi-worker
+        self.worker_id = None
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self.drop_handler: Optional[Callable[[str, int], Awaitable[None]]] = None
+
+    def attach_bus(self, backend, worker_id: str):
+        """Relay frames through a distributed state backend so every worker's sockets get them"""
+        if backend.distributed:
+            self.bus = backend
+            self.worker_id = worker_id
+
+    def on_drop(self, handler: Callable[[str, int], Awaitable[None]]):
+        """handler(session_code, user_id) runs after a socket is evicted (slow, broken or silent)"""
+        self.drop_handler = handler
+
+    def start_heartbeat(self):
+        if settings.WS_PING_INTERVAL > 0 and self.heartbeat_task is None:
+            self.heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def close(self):
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+            try:
+                await self.heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self.heartbeat_task = None
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.WS_PING_INTERVAL)
+            deadline = time.monotonic() - settings.WS_PING_TIMEOUT
+            for conn in [c for conns in self.active_connections.values() for c in conns]:
+                if conn.last_seen < deadline:
+                    self.drop(conn, reason=f"no heartbeat for {settings.WS_PING_TIMEOUT:.0f}s")
+                else:
+                    self._deliver(conn, PING_FRAME)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def connect(self, websocket: WebSocket, session_code: str, user_id: int) -> ClientConnection:
+        codec, subprotocol = negotiate(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        conn = ClientConnection(websocket, session_code, user_id, self, codec)
+        if self.bus and session_code not in self.active_connections:
+            # First local socket for this session: start receiving its frames from other workers
+            await self.bus.subscribe(f"session:{session_code}", self._on_bus_frame)
+        self.active_connections.setdefault(session_code, []).append(conn)
+        # A reconnecting user replaces their stale socket in the index straight away
+        self.user_connections[(session_code, user_id)] = conn
+        return conn
+
+    def _find(self, websocket: WebSocket, session_code: str) -> ClientConnection | None:
+        for conn in self.active_connections.get(session_code, []):
+            if conn.websocket is websocket:
+                return conn
+        return None
+
+    def _remove(self, conn: ClientConnection):
+        connections = self.active_connections.get(conn.session_code)
+        if connections and conn in connections:
+            connections.remove(conn)
+            if not connections:
+                del self.active_connections[conn.session_code]
+                if self.bus:
+                    self._spawn(self._unsubscribe_if_idle(conn.session_code))
+        key = (conn.session_code, conn.user_id)
+        if self.user_connections.get(key) is conn:
+            del self.user_connections[key]
+        conn.close()
+
+    async def _unsubscribe_if_idle(self, session_code: str):
+        # A new socket may have joined while this task was waiting to run
+        if session_code not in self.active_connections:
+            await self.bus.unsubscribe(f"session:{session_code}")
+
+    def disconnect(self, websocket: WebSocket, session_code: str):
+        conn = self._find(websocket, session_code)
+        if conn:
+            self._remove(conn)
+
+    def drop(self, conn: ClientConnection, reason: str, code: int = 1013):
+        """Detach a slow, broken or abusive client and close its socket in the background"""
+        if conn.closed:
+            return
+        print(f"✂️ Dropping client {conn.user_id} from {conn.session_code}: {reason}")
+        self._remove(conn)
+
+        # 1013 = Try Again Later; the client reconnects and is resynced via late-join.
+        # 1008 (rate limited) tells it not to come back.
+        self._spawn(self._close_socket(conn.websocket, code))
+
+        # Don't wait for the socket's receive loop to notice: it may never hear back from a half-open client
+        if self.drop_handler:
+            self._spawn(self.drop_handler(conn.session_code, conn.user_id))
+
+    async def _close_socket(self, websocket: WebSocket, code: int):
+        try:
+            reason = "rate limited" if code == 1008 else None
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=settings.WS_SEND_TIMEOUT)
+        except Exception:
+            pass  # Socket is already gone
+
+    def _deliver(self, conn: ClientConnection, frame: OutboundFrame):
+        if not conn.enqueue(frame.encode(conn.codec)):
+            self.drop(conn, reason=f"outbound queue full ({settings.WS_SEND_QUEUE_SIZE} frames)")
+
+    def get_connection(self, session_code: str, user_id: int) -> ClientConnection | None:
+        return self.user_connections.get((session_code, user_id))
+
+    def _sequence(self, message: dict | OutboundFrame, session_code: str, user_ids: Iterable[int] | None = None):
+        """Stamp a game-flow message with the session's next seq and keep it for replay"""
+        if isinstance(message, OutboundFrame) or message.get("type") not in REPLAYED_TYPES:
+            return message
+        buffer = self.replay_buffers.get(session_code)
+        if buffer is None:
+            buffer = self.replay_buffers[session_code] = ReplayBuffer(settings.WS_REPLAY_BUFFER_SIZE)
+        return buffer.add(message, user_ids)
+
+    def replay_since(self, session_code: str, user_id: int, last_seq: int) -> List[OutboundFrame] | None:
+        """What a client resuming from last_seq missed, or None when it has to resync from a snapshot"""
+        buffer = self.replay_buffers.get(session_code)
+        if buffer is None:
+            return [] if last_seq == 0 else None
+        return buffer.since(user_id, last_seq)
+
+    def last_seq(self, session_code: str) -> int:
+        buffer = self.replay_buffers.get(session_code)
+        return buffer.seq if buffer else 0
+
+    def forget_session(self, session_code: str):
+        """Drop a dissolved session's replay buffer"""
+        self.replay_buffers.pop(session_code, None)
+
+    async def _publish(self, message: dict | OutboundFrame, session_code: str, user_ids: List[int] | None = None):
+        if self.bus:
+            if isinstance(message, OutboundFrame):
+                message = message.message
+            await self.bus.publish(f"session:{session_code}", {
+                "origin": self.worker_id,
+                "session_code": session_code,
+                "message": message,
+                "user_ids": user_ids  # None = everyone in the session
+            })
+
+    async def _on_bus_frame(self, data: dict):
+        """Deliver a frame published by another worker to our local sockets"""
+        if data.get("origin") == self.worker_id:
+            return
+        self._deliver_local(data["message"], data["session_code"], data.get("user_ids"))
+
+    def _deliver_local(self, message: dict | OutboundFrame, session_code: str, user_ids: Iterable[int] | None = None) -> int:
+        """Queue a message on this worker's sockets. Returns how many sockets got it."""
+        frame = message if isinstance(message, OutboundFrame) else OutboundFrame(message)
+        if user_ids is None:
+            # Create a copy since dropping a slow client mutates the list
+            targets = self.active_connections.get(session_code, [])[:]
+        else:
+            targets = [c for c in (self.user_connections.get((session_code, uid)) for uid in user_ids) if c]
+        for conn in targets:
+            self._deliver(conn, frame)
+        return len(targets)
+
+    async def send_to_user(self, message: dict | OutboundFrame, session_code: str, user_id: int) -> bool:
+        """Queue a message for one player only, preserving order with broadcasts.
+        A cached OutboundFrame reuses its encoding instead of serializing again."""
+        message = self._sequence(message, session_code, [user_id])
+        if self._deliver_local(message, session_code, [user_id]):
+            return True
+        if self.bus:
+            # Player's socket may live on another worker
+            await self._publish(message, session_code, [user_id])
+            return True
+        return False
+
+    async def send_to_many(self, message: dict, session_code: str, user_ids: Iterable[int]):
+        """Queue the same message for a subset of players, encoded once"""
+        user_ids = list(user_ids)
+        message = self._sequence(message, session_code, user_ids)
+        self._deliver_local(message, session_code, user_ids)
+        await self._publish(message, session_code, user_ids)
+
+    async def broadcast(self, message: dict, session_code: str):
+        msg_type = message.get("type")
+        message = self._sequence(message, session_code)
+        # Use .get() to safely access list even if removed concurrently
+        connections = self.active_connections.get(session_code)
+        if connections:
+            # Debug logging
+            ids = [str(conn.user_id) for conn in connections]
+            print(f"📡 Broadcasting {msg_type} to {len(connections)} clients in {session_code}: {ids}")
+
+            # Encoded at most once per codec, then the same bytes go to every writer queue
+            self._deliver_local(message, session_code)
+
+        await self._publish(message, session_code)
+
+
+manager = ConnectionManager()
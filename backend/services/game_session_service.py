@@ -3,8 +3,36 @@ Game Session Service - Orchestrates multi-round game sessions with elimination
 """
 import random
 import asyncio
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Set
+from backend.config import settings
 from backend.games import MathQuiz, SpeedTyping, TechSprint, TrueFalse, FixSyntax
+from backend.utils.codec import OutboundFrame
+
+
+class PhaseBarrier:
+    """Completes once every expected player has acknowledged a phase"""
+
+    def __init__(self, phase: str, expected: Set[int]):
+        self.phase = phase
+        self.expected = set(expected)
+        self.acked: Set[int] = set()
+        self.done = asyncio.Event()
+        self._check()
+
+    def ack(self, user_id: int):
+        self.acked.add(user_id)
+        self._check()
+
+    def discard(self, user_id: int):
+        """Stop waiting for a player who disconnected"""
+        self.expected.discard(user_id)
+        self._check()
+
+    def _check(self):
+        if self.expected <= self.acked:
+            self.done.set()
+
 
 class GameSession:
     """Represents a single game session with multiple rounds"""
@@ -19,9 +47,14 @@ class GameSession:
         self.game_history = []  # Track which games have been played
         self.available_games = [MathQuiz, SpeedTyping, TechSprint, TrueFalse, FixSyntax]
         self.current_game_config = None
+        self.current_game = None  # BaseGame instance of the round in play; scores answers server-side
         self.is_test_mode = is_test_mode # Store test mode flag
         self.current_game_mode = None  # "race" or "timed" - set in start_round()
         self.round_timer_task = None  # Track backend timer for timed games
+        self.round_deadline = None  # Wall-clock time the backend timer fires (for snapshots)
+        self.round_in_progress = False  # True between ROUND_START and complete_round
+        self.restored_time_left = None  # Timer remainder carried over by from_snapshot()
+        self.ended = False
         
         # Player synchronization tracking
         self.players_ready_for_round = set()  # Track which players confirmed ready
@@ -31,23 +64,167 @@ class GameSession:
         # Battle Royale / Race Logic
         self.finished_players = [] # List of user_ids who finished/qualified
         self.slots_available = len(players) # Default to all
+        self.round_results = {}
 
-    def get_current_state(self):
-        """Get the current state of the game session for reconnects"""
-        if not self.current_game_config:
-            return None
-            
-        return {
+        # Phase state machine: each transition waits for client acks, bounded by a timeout
+        self.phase = "starting"  # starting -> playing -> results -> intermission -> playing ... -> ended
+        self.barrier: PhaseBarrier | None = None
+        self.connected = {p["user_id"] for p in players}  # Kept by game_routes join/leave
+        self.background_tasks = set()
+
+        # Encoded late-join ROUND_START, rebuilt only when the state it describes moves on
+        self._state_frame: OutboundFrame | None = None
+        self._state_frame_key = None
+
+    # Plain attributes carried across a restart by to_snapshot()/from_snapshot()
+    SNAPSHOT_FIELDS = (
+        "current_round", "total_rounds", "active_players", "eliminated_players",
+        "game_history", "current_game_config", "is_test_mode", "current_game_mode",
+        "total_expected_players", "is_round_synced", "finished_players",
+        "slots_available", "round_in_progress", "ended",
+    )
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """JSON-safe copy of the live state (see services/snapshot_service.py)"""
+        data = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        data["session_code"] = self.session_code
+        data["players_ready_for_round"] = list(self.players_ready_for_round)
+        # JSON object keys are strings, so results travel as pairs
+        data["round_results"] = [[uid, res] for uid, res in self.round_results.items()]
+        data["round_time_left"] = max(0.0, self.round_deadline - time.time()) if self.round_deadline else None
+        game = self.current_game
+        data["game_state"] = {"name": type(game).__name__, "state": game.to_snapshot()} if game else None
+        return data
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any], manager) -> "GameSession":
+        session = cls(data["session_code"], data["active_players"], manager, data["is_test_mode"])
+        for field in cls.SNAPSHOT_FIELDS:
+            setattr(session, field, data[field])
+        session.players_ready_for_round = set(data["players_ready_for_round"])
+        session.round_results = {uid: res for uid, res in data["round_results"]}
+        session.restored_time_left = data["round_time_left"]
+        game = data.get("game_state")
+        if game:
+            game_class = next(g for g in session.available_games if g.__name__ == game["name"])
+            session.current_game = game_class.from_snapshot(game["state"])
+        return session
+
+    async def resume(self):
+        """Pick a restored session up where the previous process left it"""
+        if self.ended:
+            return
+        # Give clients time to reconnect before anything moves
+        await asyncio.sleep(settings.SNAPSHOT_RESUME_GRACE)
+
+        if self.round_in_progress:
+            # Same round continues; reconnecting clients get it from the late-join path
+            time_left = self.restored_time_left
+            if self.current_game_mode == "timed" and time_left is not None:
+                print(f"   [Timer] Resuming {self.session_code} round {self.current_round} with {time_left:.0f}s left")
+                self._arm_round_timer(time_left)
+        elif not self.current_game_config:
+            # Stopped during the start sequence
+            await self.start_round()
+        else:
+            # Stopped between rounds (results/intermission)
+            await self.advance()
+
+    def player_connected(self, user_id: int):
+        self.connected.add(user_id)
+
+    def player_disconnected(self, user_id: int):
+        self.connected.discard(user_id)
+        # The start barrier expects everyone: its sockets drop while pages switch over
+        if self.barrier and self.barrier.phase != "starting":
+            self.barrier.discard(user_id)
+
+    def ack_phase(self, user_id: int, phase: str):
+        """A client finished showing a phase (PHASE_ACK)"""
+        if self.barrier and self.barrier.phase == phase:
+            self.barrier.ack(user_id)
+
+    async def wait_for_acks(self, phase: str, expected: Set[int], timeout: float) -> bool:
+        """Enter phase and wait until every expected player acks it, or timeout. True if all acked."""
+        self.phase = phase
+        barrier = PhaseBarrier(phase, expected)
+        self.barrier = barrier
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(barrier.done.wait(), timeout=timeout)
+            print(f"   [Phase] {phase}: all {len(barrier.expected)} acked in {time.monotonic() - started:.2f}s")
+            return True
+        except asyncio.TimeoutError:
+            missing = barrier.expected - barrier.acked
+            print(f"   [Phase] {phase}: moving on after {timeout}s without acks from {sorted(missing)}")
+            return False
+        finally:
+            if self.barrier is barrier:
+                self.barrier = None
+
+    def _active_ids(self) -> Set[int]:
+        return {p["user_id"] for p in self.active_players}
+
+    def _complete_round_soon(self):
+        """Finish the round off the caller's task: a socket's message loop must stay free to deliver acks"""
+        task = asyncio.create_task(self.complete_round())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    def _arm_round_timer(self, seconds: float):
+        """(Re)start the backend timer that force-ends a timed round"""
+        if self.round_timer_task:
+            self.round_timer_task.cancel()
+        self.round_deadline = time.time() + seconds
+        self.round_timer_task = asyncio.create_task(self._round_timer(seconds))
+
+    def round_start_message(self) -> Dict[str, Any]:
+        """ROUND_START: round metadata plus the first window of answer-stripped items (see question_chunk)"""
+        message = {
             "type": "ROUND_START",
             "round": self.current_round,
             "total_rounds": self.total_rounds,
             "active_players": len(self.active_players),
             "eliminated_count": len(self.eliminated_players),
             "is_test_mode": self.is_test_mode,
-            "slots_available": self.slots_available, # Include slots info
-            "is_synced": self.is_round_synced, # Send sync status
+            "slots_available": self.slots_available,
             **self.current_game_config
         }
+        game = self.current_game
+        if game is not None:
+            message[game.ITEMS_KEY] = game.item_window(0, settings.QUESTION_WINDOW)
+            message["question_count"] = game.count
+        return message
+
+    def question_chunk(self, start: int) -> Dict[str, Any] | None:
+        """QUESTION_CHUNK for GET_QUESTIONS: the next items as a player works through the round"""
+        game = self.current_game
+        if not self.round_in_progress or game is None:
+            return None
+        return {
+            "type": "QUESTION_CHUNK",
+            "round": self.current_round,
+            "from": start,
+            game.ITEMS_KEY: game.item_window(start, settings.QUESTION_CHUNK_SIZE),
+        }
+
+    def get_current_state(self):
+        """Get the current state of the game session for reconnects"""
+        if not self.current_game_config:
+            return None
+
+        state = self.round_start_message()
+        state["is_synced"] = self.is_round_synced # Send sync status
+        return state
+
+    def current_state_frame(self) -> OutboundFrame | None:
+        """get_current_state() as a shared frame, so a burst of reconnects encodes it once per codec"""
+        key = (self.current_round, self.phase, self.round_in_progress, self.is_round_synced, len(self.active_players))
+        if key != self._state_frame_key:
+            state = self.get_current_state()
+            self._state_frame = OutboundFrame(state) if state else None
+            self._state_frame_key = key
+        return self._state_frame
         
     async def start_round(self):
         """Start a new round"""
@@ -62,6 +239,8 @@ class GameSession:
             # Reset finishers for new round
             self.finished_players = []
             self.round_results = {} # Reset specific results (score/time)
+            self.round_in_progress = True
+            self.phase = "playing"
             
             # Calculate Slots for this round
             total_active = len(self.active_players)
@@ -111,6 +290,7 @@ class GameSession:
             print(f"   [Step 4] Generating config...")
             game_config = self.get_game_config(game_instance)
             self.current_game_config = game_config  # Store for late joiners/reconnects
+            self.current_game = game_instance
             
             # Detect and store game mode
             self.current_game_mode = game_config.get("mode", "timed")
@@ -127,23 +307,15 @@ class GameSession:
             # Start backend timer for timed games
             if self.current_game_mode == "timed" and game_config.get("time_limit"):
                 time_limit = game_config["time_limit"]
-                # Add buffer for Frontend Intro (3s) + Tutorial (5s) + Countdown (3s) + Network
-                adjusted_limit = time_limit + 15 
-                print(f"   [Timer] Starting {adjusted_limit}s backend timer ({time_limit}s + 15s buffer)")
-                self.round_timer_task = asyncio.create_task(self._round_timer(adjusted_limit))
+                # Upper bound covering sync + Intro (3s) + Tutorial (5s) + Countdown (3s) + Network;
+                # tightened by mark_round_synced() once every client is actually in
+                adjusted_limit = time_limit + settings.ROUND_START_BUFFER
+                print(f"   [Timer] Starting {adjusted_limit}s backend timer ({time_limit}s + {settings.ROUND_START_BUFFER}s buffer)")
+                self._arm_round_timer(adjusted_limit)
             
             # Broadcast round start
             print(f"   [Step 5] Broadcasting ROUND_START...")
-            await self.manager.broadcast({
-                "type": "ROUND_START",
-                "round": self.current_round,
-                "total_rounds": self.total_rounds,
-                "active_players": len(self.active_players),
-                "eliminated_count": len(self.eliminated_players),
-                "is_test_mode": self.is_test_mode,
-                "slots_available": self.slots_available,
-                **game_config
-            }, self.session_code)
+            await self.manager.broadcast(self.round_start_message(), self.session_code)
             print(f"✅ ROUND_START broadcast sent.")
             
             return game_instance
@@ -159,27 +331,56 @@ class GameSession:
             await asyncio.sleep(time_limit)
             print(f"⏰ Timer expired for timed game!")
             
-            # Wait 2 seconds for frontend to send ROUND_COMPLETE with final scores
-            print(f"⏳ Waiting 2s for players to send final scores...")
-            await asyncio.sleep(2)
+            # Wait for connected players still owing ROUND_COMPLETE, at most ROUND_SUBMIT_GRACE
+            pending = (self._active_ids() & self.connected) - set(self.finished_players)
+            print(f"⏳ Waiting up to {settings.ROUND_SUBMIT_GRACE}s for final scores from {sorted(pending)}...")
+            await self.wait_for_acks("submit", pending, settings.ROUND_SUBMIT_GRACE)
             
             print(f"🛑 Grace period ended, force ending round...")
             await self.complete_round()
         except asyncio.CancelledError:
             print(f"⏰ Timer cancelled (round ended early)")
     
-    async def handle_player_finish(self, user_id: int, score: int = 0):
-        """Called when a player completes the objective (Race Logic) OR submits score (Timed Logic)"""
-        import time
+    async def handle_actions(self, user_id: int, actions: List[Any]):
+        """Score a batch of GAME_ACTION answers and tell the player how each one went (ACTION_RESULT);
+        a race player reaching win_score finishes right here"""
+        if not self.round_in_progress or self.current_game is None:
+            return
+        scored = self.current_game.apply_actions(user_id, actions)
+        if scored is None:
+            return
+        score, verdicts = scored
+        await self.manager.send_to_user({
+            "type": "ACTION_RESULT",
+            "score": score,
+            "results": verdicts
+        }, self.session_code, user_id)
+        if self.current_game_mode == "race" and user_id not in self.finished_players and self.current_game.has_won(user_id):
+            await self.handle_player_finish(user_id)
+
+    async def handle_player_finish(self, user_id: int):
+        """Called when a player completes the objective (Race Logic) OR is done answering (Timed Logic)"""
         arrival_time = time.time()
+        if not self.round_in_progress:
+            print(f"⚠️ Finish from {user_id} after round {self.current_round} ended - ignored")
+            return
+
+        score = 0
+        if self.current_game is not None:
+            # The server's tally is the score; ROUND_COMPLETE only signals "done"
+            score = self.current_game.score_of(user_id)
+            if self.current_game_mode == "race":
+                if user_id in self.finished_players:
+                    return  # Already finished by handle_actions; keep the original arrival time
+                if not self.current_game.has_won(user_id):
+                    print(f"⚠️ Player {user_id} claimed a race finish at {score}/{self.current_game.win_score} - ignored")
+                    return
+        self.ack_phase(user_id, "submit")
         
         # Check if already finished
         is_new_finish = user_id not in self.finished_players
         
         # Store Result - Track: Score, Arrival Time
-        if not hasattr(self, 'round_results'):
-            self.round_results = {}
-            
         self.round_results[user_id] = {
             "score": score,
             "time": arrival_time,
@@ -197,7 +398,7 @@ class GameSession:
         if self.current_game_mode == "race":
             if len(self.finished_players) >= self.slots_available:
                 print(f"🛑 Race mode: {self.slots_available} qualifiers reached, ending round...")
-                await self.complete_round()
+                self._complete_round_soon()
         
         # TIMED MODE: Wait for ALL players to submit OR timer to expire
         elif self.current_game_mode == "timed":
@@ -207,7 +408,7 @@ class GameSession:
                 # Cancel timer since all players finished
                 if self.round_timer_task:
                     self.round_timer_task.cancel()
-                await self.complete_round()
+                self._complete_round_soon()
             else:
                 print(f"⏳ Timed mode: Waiting for remaining players ({len(self.finished_players)}/{total_active})")
 
@@ -223,14 +424,15 @@ class GameSession:
             for player in self.active_players:
                 uid = player["user_id"]
                 res = self.round_results.get(uid, {"score": 0, "time": 0})
-                await self.manager.broadcast({
+                await self.manager.send_to_user({
                     "type": "ROUND_RESULT",
                     "status": "qualified",
                     "rank": 1,
                     "score": res["score"],
                     "total_players": 1,
-                    "message": "You qualified!"
-                }, self.session_code)  # Broadcast to all since it's solo
+                    "message": "You qualified!",
+                    "user_id": uid
+                }, self.session_code, uid)
             return
 
         # 1. Collect Results for ALL active players
@@ -238,9 +440,6 @@ class GameSession:
         submitted_results = []
         non_submitted_players = []
         
-        if not hasattr(self, 'round_results'):
-            self.round_results = {}
-            
         for player in self.active_players:
             uid = player["user_id"]
             
@@ -288,7 +487,7 @@ class GameSession:
             submitted = "(submitted)" if r in submitted_results else "(NO SUBMIT)"
             print(f"   #{i+1}: User {r['user_id']} - Score: {r['score']}, Time: {r['time']:.3f} - {status} {submitted}")
         
-        # 5. Broadcast individual results to each player
+        # 5. Send each player only their own result (one frame per player, not N per player)
         for i, result in enumerate(all_results):
             rank = i + 1
             is_qualified = result in qualifiers  # Check if in qualifiers list
@@ -304,11 +503,10 @@ class GameSession:
                 "message": f"You qualified! (Rank #{rank})" if is_qualified else f"You were eliminated (Rank #{rank})"
             }
             
-            # Broadcast to everyone so each client can check if it's them
-            await self.manager.broadcast({
+            await self.manager.send_to_user({
                 **message_data,
-                "user_id": result["user_id"]  # Include user_id so client knows who this is for
-            }, self.session_code)
+                "user_id": result["user_id"]  # Kept so older clients that filter by user_id still match
+            }, self.session_code, result["user_id"])
         
         # 6. Update active/eliminated player lists
         to_eliminate = [r["player"] for r in all_eliminated]
@@ -344,137 +542,73 @@ class GameSession:
         return ready_count
     
     def check_all_players_ready(self) -> bool:
-        """Check if all players have confirmed ready for current round"""
-        ready_count = len(self.players_ready_for_round)
-        return ready_count >= self.total_expected_players
+        """Check if every connected active player has confirmed ready for the current round.
+        Disconnected players don't hold the round up; they catch up through the late-join path."""
+        expected = self._active_ids() & self.connected
+        return bool(expected) and expected <= self.players_ready_for_round
+
+    async def sync_round_if_ready(self) -> bool:
+        """Start the round on every client once all connected players are ready. True if it did."""
+        if not self.round_in_progress or self.is_round_synced or not self.check_all_players_ready():
+            return False
+        print(f"✅ All players ready for {self.session_code}! Broadcasting ALL_PLAYERS_READY...")
+
+        # Mark as synced so late joiners don't get stuck
+        self.mark_round_synced()
+
+        # Reset ready set for next round
+        self.reset_ready_status()
+
+        # Broadcast to all clients to start game sequence
+        await self.manager.broadcast({
+            "type": "ALL_PLAYERS_READY",
+            "message": "All players synchronized! Starting game..."
+        }, self.session_code)
+        print(f"✓ ALL_PLAYERS_READY broadcasted to session {self.session_code}")
+        return True
     
     def mark_round_synced(self):
         """Mark the current round as synchronized (all players ready)"""
         self.is_round_synced = True
         print(f"   [Sync] Round {self.current_round} marked as SYNCED")
 
+        # Everyone starts the intro now, so the timer no longer needs the full start buffer
+        time_limit = (self.current_game_config or {}).get("time_limit")
+        if self.round_in_progress and self.current_game_mode == "timed" and time_limit and self.round_deadline:
+            synced_limit = time_limit + settings.ROUND_INTRO_TIME
+            if time.time() + synced_limit < self.round_deadline:
+                print(f"   [Timer] Synced: round ends in {synced_limit}s")
+                self._arm_round_timer(synced_limit)
+
     def reset_ready_status(self):
         """Reset ready tracking for next round"""
         print(f"Resetting ready status for {self.session_code}")
         self.players_ready_for_round.clear()
     
-    def generate_math_questions(self) -> List[Dict]:
-        """Generate random math questions"""
-        questions = []
-        for i in range(5):
-            a = random.randint(1, 20)
-            b = random.randint(1, 20)
-            operation = random.choice(['+', '-', '*'])
-            
-            if operation == '+':
-                answer = a + b
-            elif operation == '-':
-                answer = a - b
-            else:
-                answer = a * b
-            
-            # Generate wrong options
-            options = [answer]
-            while len(options) < 4:
-                wrong = answer + random.randint(-10, 10)
-                # Allow negative options if the answer is negative
-                if wrong not in options:
-                    options.append(wrong)
-            
-            random.shuffle(options)
-            
-            questions.append({
-                "text": f"What is {a} {operation} {b}?",
-                "options": [str(o) for o in options],
-                "answer": str(answer)
-            })
-        
-        return questions
-    
-    def generate_tech_questions(self) -> List[Dict]:
-        """Generate tech/coding questions"""
-        questions = [
-            {
-                "text": "What does HTML stand for?",
-                "options": ["Hyper Text Markup Language", "High Tech Modern Language", "Home Tool Markup Language", "Hyperlinks and Text Markup Language"],
-                "answer": "Hyper Text Markup Language"
-            },
-            {
-                "text": "Which language is used for styling web pages?",
-                "options": ["CSS", "HTML", "Python", "JavaScript"],
-                "answer": "CSS"
-            },
-            {
-                "text": "What does CPU stand for?",
-                "options": ["Central Processing Unit", "Computer Personal Unit", "Central Program Utility", "Central Processor Utility"],
-                "answer": "Central Processing Unit"
-            },
-            {
-                "text": "Which of these is a programming language?",
-                "options": ["Python", "Eagle", "Falcon", "Sparrow"],
-                "answer": "Python"
-            },
-            {
-                "text": "What is the result of 2 ** 3 in Python?",
-                "options": ["8", "6", "9", "5"],
-                "answer": "8"
-            }
-        ]
-        return random.sample(questions, min(5, len(questions)))
-    
-    def generate_true_false_questions(self) -> List[Dict]:
-        """Generate true/false questions"""
-        pool = [
-            {"text": "Python arrays are 1-indexed.", "answer": "False"},
-            {"text": "HTML stands for HyperText Markup Language.", "answer": "True"},
-            {"text": "A byte consists of 8 bits.", "answer": "True"},
-            {"text": "Java and JavaScript are the same language.", "answer": "False"},
-            {"text": "SQL is used for database management.", "answer": "True"},
-            {"text": "CSS stands for Computer Style Sheets.", "answer": "False"},
-            {"text": "Python is a compiled language.", "answer": "False"},
-            {"text": "HTTP stands for HyperText Transfer Protocol.", "answer": "True"},
-            {"text": "1 GB equals 1000 MB.", "answer": "False"},  # Actually 1024
-            {"text": "The Internet and the World Wide Web are the same thing.", "answer": "False"},
-            {"text": "RAM is volatile memory.", "answer": "True"},
-            {"text": "0 is considered False in Python.", "answer": "True"}
-        ]
-        # Return 10 random questions
-        return random.sample(pool, min(10, len(pool)))
-    
-    def generate_syntax_puzzles(self) -> List[Dict]:
-        """Generate code syntax puzzles"""
-        pool = [
-            {"code": "print('Hello ' + ____)", "answer": "world", "hint": "Common greeting suffix"},
-            {"code": "if x ____ 10:\n  print('Ten')", "answer": "==", "hint": "Equality operator"},
-            {"code": "def my_func(___):\n  return x", "answer": "x", "hint": "Function argument"},
-            {"code": "lst = [1, 2, 3]\nprint(lst[___])", "answer": "0", "hint": "First index"},
-            {"code": "import ____ as pd", "answer": "pandas", "hint": "Data Science Library"},
-            {"code": "for i in ______(5):\n  print(i)", "answer": "range", "hint": "Loop function"},
-            {"code": "my_dict = {'key': ____}", "answer": "value", "hint": "Dictionary pair"},
-            {"code": "class MyClass:\n  def ______(self):\n    pass", "answer": "__init__", "hint": "Constructor method"},
-            {"code": "with ____ as f:\n  content = f.read()", "answer": "open", "hint": "File handling"},
-            {"code": "result = 10 ____ 2", "answer": "/", "hint": "Division operator"}
-        ]
-        # Return 5 random puzzles
-        return random.sample(pool, min(5, len(pool)))
-    
-
-    
     async def complete_round(self):
         """Handle round completion"""
+        # Race finishes, the all-submitted check and the timer can all get here; only the first counts
+        if not self.round_in_progress:
+            return
+        self.round_in_progress = False
         print(f"Round {self.current_round} complete for session {self.session_code}")
         
-        # Cancel any running timer
-        if self.round_timer_task:
+        # Cancel any running timer (unless we are running inside it)
+        if self.round_timer_task and self.round_timer_task is not asyncio.current_task():
             self.round_timer_task.cancel()
-            self.round_timer_task = None
+        self.round_timer_task = None
+        self.round_deadline = None
         
         # FIRST: Calculate who qualified and who got eliminated
+        recipients = self._active_ids()
         await self.calculate_and_broadcast_results()
         
-        # Wait to show results
-        await asyncio.sleep(3)
-        
+        # Results stay up until every connected player has seen theirs
+        await self.wait_for_acks("results", recipients & self.connected, settings.PHASE_RESULTS_TIMEOUT)
+        await self.advance()
+
+    async def advance(self):
+        """After results: intermission and the next round, or the end of the game"""
         # Check if game should continue
         # Continue if rounds remain AND (more than 1 player OR test mode)
         should_continue = self.current_round < self.total_rounds
@@ -490,7 +624,7 @@ class GameSession:
                 "message": f"Round {self.current_round} Complete! Preparing next round..."
             }, self.session_code)
             
-            await asyncio.sleep(3)
+            await self.wait_for_acks("intermission", self._active_ids() & self.connected, settings.PHASE_INTERMISSION_TIMEOUT)
             self.current_round += 1
             await self.start_round()
         else:
@@ -499,6 +633,8 @@ class GameSession:
     async def end_session(self):
         """End the game session"""
         print(f"Game session {self.session_code} ended")
+        self.ended = True
+        self.phase = "ended"
         
         # Determine winner (player with highest score or last remaining)
         winner = self.active_players[0] if self.active_players else None
@@ -511,7 +647,8 @@ class GameSession:
         }, self.session_code)
         
         # Wait before redirecting
-        await asyncio.sleep(5)
+        everyone = self._active_ids() | {p["user_id"] for p in self.eliminated_players}
+        await self.wait_for_acks("end", everyone & self.connected, settings.PHASE_END_TIMEOUT)
         
         # Redirect to lobby
         await self.manager.broadcast({
@@ -539,6 +676,17 @@ class GameSessionService:
         
         return session
 
+    def restore_session(self, data: Dict[str, Any], manager) -> GameSession:
+        """Re-create a session from a snapshot and resume it in the background"""
+        session = GameSession.from_snapshot(data, manager)
+        self.sessions[session.session_code] = session
+
+        task = asyncio.create_task(session.resume())
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+        return session
+
     async def _run_start_sequence(self, session, session_code, manager):
         """Handle the delayed start sequence"""
         print(f"🚀 _run_start_sequence initiated for {session_code}")
@@ -551,9 +699,9 @@ class GameSessionService:
                 "message": "Game is starting! Redirecting to game..."
             }, session_code)
             
-            # Wait for clients to redirect and reconnect WebSocket (increased from 1s to 3s to fix race condition)
-            print("⏳ Waiting 3s for client redirect/reconnect...")
-            await asyncio.sleep(3)
+            # Wait for clients to redirect and reconnect from the game page (at most PHASE_START_TIMEOUT)
+            print(f"⏳ Waiting up to {settings.PHASE_START_TIMEOUT}s for client redirect/reconnect...")
+            await session.wait_for_acks("starting", session._active_ids(), settings.PHASE_START_TIMEOUT)
             
             # Then start the first round (which will broadcast ROUND_START)
             print("▶️ Calling session.start_round()...")
@@ -1,23 +1,30 @@
-import asyncio
-from typing import Dict, Any
+from typing import Dict
+from backend.config import settings
 from backend.utils.timer import GameTimer
 
 class InactivityService:
+    """Per-session inactivity deadlines, all held by the shared timer scheduler"""
+
     def __init__(self):
         self._timers: Dict[str, GameTimer] = {}
 
     async def start_monitoring(self, session_code: str, callback):
-        # 10 minutes = 600 seconds
-        timer = GameTimer(600, on_finish=lambda: asyncio.create_task(callback(session_code)))
+        """Call callback(session_code) (sync or async) after LOBBY_INACTIVITY_TIMEOUT without activity"""
+        def on_timeout():
+            self._timers.pop(session_code, None)
+            return callback(session_code)
+
+        self.stop_monitoring(session_code)
+        timer = GameTimer(settings.LOBBY_INACTIVITY_TIMEOUT, on_finish=on_timeout)
         self._timers[session_code] = timer
-        await timer.start()
+        timer.start()
 
     def update_activity(self, session_code: str):
-        if session_code in self._timers:
-            # Restart timer
-            asyncio.create_task(self._timers[session_code].start())
+        timer = self._timers.get(session_code)
+        if timer:
+            timer.reset()
 
     def stop_monitoring(self, session_code: str):
-        if session_code in self._timers:
-            self._timers[session_code].stop()
-            del self._timers[session_code]
+        timer = self._timers.pop(session_code, None)
+        if timer:
+            timer.stop()
@@ -0,0 +1,95 @@
+"""
+Lobby Feed - Server-sent events for the lobby browser.
+
+Instead of polling GET /api/sessions/, browsers open one EventSource on
+/api/sessions/feed, receive the public lobby list once and then only
+lobby_created / lobby_updated / lobby_closed events. Events travel over the
+state backend bus so subscribers on every worker see them.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from backend.config import settings
+from backend.services.state_backend import StateBackend, state_backend
+
+logger = logging.getLogger(__name__)
+
+FEED_CHANNEL = "lobby_feed"
+LOBBY_CREATED, LOBBY_UPDATED, LOBBY_CLOSED = "lobby_created", "lobby_updated", "lobby_closed"
+
+
+def sse_frame(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class LobbyFeed:
+    """Fans lobby events out to every open feed stream on this worker"""
+
+    def __init__(self, backend: StateBackend):
+        self.backend = backend
+        self.subscribers: set[asyncio.Queue] = set()
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []  # In-process hooks, e.g. caches
+
+    async def start(self):
+        await self.backend.subscribe(FEED_CHANNEL, self._on_event)
+
+    async def publish(self, event: str, data: Dict[str, Any]):
+        """Announce a lobby change to every worker's subscribers"""
+        try:
+            await self.backend.publish(FEED_CHANNEL, {"event": event, "data": data})
+        except Exception as e:
+            # The feed is best-effort; a lost event heals on the client's next reconnect
+            logger.warning(f"Failed to publish {event} for {data.get('session_code')}: {e}")
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Call listener(event, data) for every lobby event seen by this worker"""
+        self.listeners.append(listener)
+
+    async def _on_event(self, message: Dict[str, Any]):
+        for listener in self.listeners:
+            listener(message["event"], message["data"])
+
+        frame = sse_frame(message["event"], message["data"])
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Too far behind: end the stream, the browser reconnects and gets a fresh snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                self.subscribers.discard(queue)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Start buffering events (before the snapshot query, so nothing falls in between)"""
+        queue = asyncio.Queue(maxsize=settings.LOBBY_FEED_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    async def stream(self, queue: asyncio.Queue, snapshot: str) -> AsyncIterator[str]:
+        """SSE body: retry hint, snapshot, then events with keepalive comments"""
+        # Streams end after LOBBY_FEED_MAX_AGE so a restart never waits on them for long
+        deadline = time.monotonic() + settings.LOBBY_FEED_MAX_AGE
+        try:
+            yield "retry: 2000\n\n"
+            yield snapshot
+            while time.monotonic() < deadline:
+                try:
+                    frame: Optional[str] = await asyncio.wait_for(queue.get(), timeout=settings.LOBBY_FEED_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+
+# Global instance
+lobby_feed = LobbyFeed(state_backend)
@@ -0,0 +1,107 @@
+"""
+Lobby Roster - Versioned player list for one lobby.
+
+Joins, ready toggles and leaves are recorded as pending changes and broadcast as
+a single PLAYER_LIST_DELTA once per coalescing window, instead of sending the
+whole roster to everyone on every change. Clients that miss a version ask for a
+full PLAYER_LIST_UPDATE snapshot.
+"""
+import asyncio
+from typing import Dict, Any
+from backend.config import settings
+
+ADDED, CHANGED, REMOVED = "added", "changed", "removed"
+
+
+class LobbyRoster:
+    """Player roster for one session with delta broadcasting"""
+
+    def __init__(self, session_code: str, manager):
+        self.session_code = session_code
+        self.manager = manager
+        self.players: Dict[int, Dict[str, Any]] = {}  # user_id -> player dict (join order)
+        self.version = 0  # Bumped once per flushed delta
+        self._pending: Dict[int, str] = {}  # user_id -> net change since last flush
+        self._flush_task: asyncio.Task | None = None
+
+    def add(self, player: Dict[str, Any]):
+        """Add (or replace, on reconnect) a player"""
+        user_id = player["user_id"]
+        self.players[user_id] = player
+        previous = self._pending.get(user_id)
+        if previous is None:
+            self._pending[user_id] = ADDED
+        elif previous == REMOVED:
+            self._pending[user_id] = CHANGED  # Left and came back inside one window
+        self._schedule_flush()
+
+    def update(self, user_id: int, **fields):
+        player = self.players.get(user_id)
+        if player is None:
+            return
+        if all(player.get(k) == v for k, v in fields.items()):
+            return  # Nothing changed (e.g. a repeated PLAYER_READY): nothing to broadcast
+        player.update(fields)
+        self._pending.setdefault(user_id, CHANGED)  # A pending ADDED already carries the new fields
+        self._schedule_flush()
+
+    def remove(self, user_id: int):
+        if self.players.pop(user_id, None) is None:
+            return
+        if self._pending.get(user_id) == ADDED:
+            del self._pending[user_id]  # Joined and left inside one window: nothing to send
+        else:
+            self._pending[user_id] = REMOVED
+        self._schedule_flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full roster message, used for new joiners and version-gap recovery"""
+        return {
+            "type": "PLAYER_LIST_UPDATE",
+            "version": self.version,
+            "players": list(self.players.values())
+        }
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        return {"version": self.version, "players": list(self.players.values())}
+
+    @classmethod
+    def from_snapshot(cls, session_code: str, manager, data: Dict[str, Any]) -> "LobbyRoster":
+        roster = cls(session_code, manager)
+        # Unflushed changes died with the old process; skip a version so clients resync
+        roster.version = data["version"] + 1
+        for player in data["players"]:
+            roster.players[player["user_id"]] = player
+        return roster
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(settings.ROSTER_COALESCE_WINDOW)
+        await self.flush()
+
+    async def flush(self):
+        """Broadcast everything that changed since the last flush as one delta"""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        base_version = self.version
+        self.version += 1
+
+        delta = {
+            "type": "PLAYER_LIST_DELTA",
+            "base_version": base_version,
+            "version": self.version,
+            "added": [self.players[uid] for uid, op in pending.items() if op == ADDED],
+            "changed": [self.players[uid] for uid, op in pending.items() if op == CHANGED],
+            "removed": [uid for uid, op in pending.items() if op == REMOVED]
+        }
+        await self.manager.broadcast(delta, self.session_code)
+
+    def close(self):
+        """Stop any pending flush (lobby dissolved)"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
@@ -1,9 +1,77 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from backend.models import Session, SessionPlayer, User
+from sqlalchemy import tuple_, text
+from backend.models import Session, SessionPlayer, User, SessionResponse, SessionTicketResponse
+from backend.services.auth_service import AuthService
+from backend.config import settings
+from backend.services.lobby_feed import lobby_feed, LOBBY_CREATED, LOBBY_UPDATED
 import uuid
 import random
 import string
+import base64
+from datetime import datetime
+
+class JoinError(ValueError):
+    """A join that was refused; outcome is one of the JOIN_* constants"""
+
+    def __init__(self, outcome: str, message: str):
+        super().__init__(message)
+        self.outcome = outcome
+
+
+JOIN_OK, JOIN_NOT_FOUND, JOIN_STARTED, JOIN_FULL = "joined", "not_found", "started", "full"
+
+# One round trip: read the lobby, claim a seat and insert the player.
+# Capacity lives in sessions.player_count so the seat UPDATE re-checks it against
+# the latest row version - concurrent joiners queue on the row lock and the lobby
+# can't overfill. A count(*) in the same statement would see a stale snapshot.
+# The host never calls join, so create_session starts the count at 1 for their seat.
+JOIN_SQL = text("""
+WITH target AS (
+    SELECT s.id, s.session_code, s.lobby_name, s.status, s.max_players, s.is_public, s.host_id,
+           (SELECT u.username FROM users u WHERE u.id = :user_id) AS username,
+           EXISTS (
+               SELECT 1 FROM session_players sp WHERE sp.session_id = s.id AND sp.user_id = :user_id
+           ) AS already_joined
+    FROM sessions s
+    WHERE s.session_code = :code
+),
+seat AS (
+    UPDATE sessions SET player_count = sessions.player_count + 1
+    FROM target
+    WHERE sessions.id = target.id
+      AND NOT target.already_joined
+      AND sessions.status = 'waiting'
+      AND sessions.player_count < sessions.max_players
+    RETURNING sessions.id, sessions.player_count
+),
+joined AS (
+    INSERT INTO session_players (session_id, user_id, score, is_eliminated, joined_at)
+    SELECT id, :user_id, 0, FALSE, :joined_at FROM seat
+    ON CONFLICT DO NOTHING
+    RETURNING session_id
+)
+SELECT target.*,
+       (SELECT player_count FROM seat) AS seat_count,
+       EXISTS (SELECT 1 FROM seat) AS seated,
+       EXISTS (SELECT 1 FROM joined) AS inserted
+FROM target
+""")
+
+# Hand a seat back: drop the player's row and decrement the counter in one statement.
+# Only a deleted row frees a seat, so a repeated leave (or the host, who has no row) is a no-op.
+LEAVE_SQL = text("""
+WITH gone AS (
+    DELETE FROM session_players sp USING sessions s
+    WHERE sp.session_id = s.id AND s.session_code = :code AND sp.user_id = :user_id
+    RETURNING sp.session_id
+)
+UPDATE sessions SET player_count = GREATEST(sessions.player_count - 1, 0)
+FROM gone
+WHERE sessions.id = gone.session_id
+RETURNING sessions.session_code, sessions.player_count, sessions.is_public, sessions.status
+""")
+
 
 class MatchmakingService:
     @staticmethod
@@ -18,44 +86,142 @@ class MatchmakingService:
             lobby_name=lobby_name,
             host_id=host_id,
             max_players=max_players,
+            player_count=1,  # The host's seat; joiners fill the rest
             is_public=is_public,
             status="waiting"
         )
         db.add(new_session)
         await db.commit()
         await db.refresh(new_session)
+
+        # Private lobbies are joined by code only and never show up in the feed
+        if is_public:
+            await lobby_feed.publish(LOBBY_CREATED, SessionResponse.model_validate(new_session).model_dump())
         return new_session
 
     @staticmethod
-    async def join_session(db: AsyncSession, session_code: str, user_id: int) -> Session:
+    async def join_session(db: AsyncSession, session_code: str, user_id: int) -> SessionTicketResponse:
+        """Atomically join a lobby (idempotent for players already in it).
+
+        Returns the lobby plus a signed join ticket for the WebSocket handshake.
+        Raises JoinError with outcome not_found / started / full.
+        """
+        result = await db.execute(JOIN_SQL, {
+            "code": session_code,
+            "user_id": user_id,
+            "joined_at": datetime.utcnow()
+        })
+        row = result.mappings().first()
+
+        if row is None:
+            await db.rollback()
+            raise JoinError(JOIN_NOT_FOUND, "Session not found")
+
+        if row["seated"] and not row["inserted"]:
+            # Same user raced themselves (double click): the row exists, hand the seat back
+            await db.execute(
+                text("UPDATE sessions SET player_count = player_count - 1 WHERE id = :id"),
+                {"id": row["id"]}
+            )
+        await db.commit()
+
+        if not row["already_joined"] and not row["inserted"]:
+            if row["status"] != "waiting":
+                raise JoinError(JOIN_STARTED, "Session already started")
+            raise JoinError(JOIN_FULL, "Session is full")
+
+        if row["inserted"] and row["is_public"]:
+            await lobby_feed.publish(LOBBY_UPDATED, {
+                "session_code": row["session_code"],
+                "player_count": row["seat_count"]
+            })
+
+        return SessionTicketResponse(
+            session_code=row["session_code"],
+            lobby_name=row["lobby_name"],
+            status=row["status"],
+            max_players=row["max_players"],
+            is_public=row["is_public"],
+            player_count=row["seat_count"],
+            ticket=AuthService.create_join_ticket(
+                user_id, row["username"] or f"Player {user_id}", row["session_code"], row["host_id"], row["is_public"]
+            )
+        )
+
+    @staticmethod
+    async def leave_session(db: AsyncSession, session_code: str, user_id: int) -> int | None:
+        """Release a player's seat so the lobby can be joined again.
+
+        Returns the new player_count, or None when the player held no seat.
+        """
+        result = await db.execute(LEAVE_SQL, {"code": session_code, "user_id": user_id})
+        row = result.mappings().first()
+        await db.commit()
+        if row is None:
+            return None
+
+        if row["is_public"] and row["status"] == "waiting":
+            await lobby_feed.publish(LOBBY_UPDATED, {
+                "session_code": row["session_code"],
+                "player_count": row["player_count"]
+            })
+        return row["player_count"]
+
+    @staticmethod
+    async def issue_host_ticket(db: AsyncSession, session: Session) -> SessionTicketResponse:
+        """The host never calls join, so create hands them their ticket"""
+        host = await db.get(User, session.host_id)
+        username = host.username if host else f"Player {session.host_id}"
+        return SessionTicketResponse.model_validate(session).model_copy(update={
+            "ticket": AuthService.create_join_ticket(
+                session.host_id, username, session.session_code, session.host_id, session.is_public
+            )
+        })
+
+    @staticmethod
+    async def get_session(db: AsyncSession, session_code: str) -> Session | None:
         result = await db.execute(select(Session).where(Session.session_code == session_code))
-        session = result.scalars().first()
-        
-        if not session:
-            raise ValueError("Session not found")
-            
-        if session.status != "waiting":
-            raise ValueError("Session already started")
-            
-        # Check player count (need to load players or count query)
-        # For simplicity assuming naive check or we add a count query here.
-        # Ideally using select(func.count())...
-        
-        # Check if already joined
-        result_player = await db.execute(select(SessionPlayer).where(
-            SessionPlayer.session_id == session.id, 
-            SessionPlayer.user_id == user_id
-        ))
-        existing_player = result_player.scalars().first()
-        
-        if not existing_player:
-            new_player = SessionPlayer(session_id=session.id, user_id=user_id)
-            db.add(new_player)
-            await db.commit()
-            
-        return session
-
-    @staticmethod
-    async def get_public_sessions(db: AsyncSession):
-        result = await db.execute(select(Session).where(Session.is_public == True, Session.status == "waiting"))
-        return result.scalars().all()
+        return result.scalars().first()
+
+    @staticmethod
+    def encode_cursor(session: Session) -> str:
+        """Opaque keyset position: the (created_at, id) of the last lobby on a page"""
+        return base64.urlsafe_b64encode(f"{session.created_at.isoformat()}|{session.id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            created_at, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), int(session_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    async def get_public_sessions(db: AsyncSession, limit: int | None = None, cursor: str | None = None) -> tuple[list[SessionResponse], str | None]:
+        """One page of public waiting lobbies, newest first, with live player counts.
+
+        Keyset pagination over (created_at, id) on ix_sessions_public_waiting, so
+        every page costs the same no matter how many lobbies are open. Returns
+        (lobbies, next_cursor); next_cursor is None on the last page.
+        """
+        limit = min(limit or settings.LOBBY_PAGE_SIZE, settings.LOBBY_PAGE_MAX)
+
+        query = (
+            select(Session)
+            .where(Session.is_public == True, Session.status == "waiting")
+            .order_by(Session.created_at.desc(), Session.id.desc())
+            .limit(limit + 1)  # One extra row tells us whether another page exists
+        )
+        if cursor:
+            created_at, session_id = MatchmakingService.decode_cursor(cursor)
+            query = query.where(tuple_(Session.created_at, Session.id) < tuple_(created_at, session_id))
+
+        rows = (await db.execute(query)).scalars().all()
+        page = rows[:limit]
+        # player_count is the seat counter maintained by join_session
+        sessions = [SessionResponse.model_validate(session) for session in page]
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = MatchmakingService.encode_cursor(page[-1])
+        return sessions, next_cursor
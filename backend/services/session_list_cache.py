@@ -0,0 +1,58 @@
+"""
+Session List Cache - Pre-serialized first page of GET /api/sessions/ with an ETag.
+
+The public lobby list only changes when a lobby is created, fills up, starts
+or closes, and every such change already goes out on the lobby feed. The feed
+invalidates this cache, so between changes the list costs no query and no
+Pydantic serialization, and pollers that send If-None-Match get a 304.
+"""
+import asyncio
+import hashlib
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.services.matchmaking_service import MatchmakingService
+from backend.services.lobby_feed import lobby_feed
+from backend.utils.codec import JSON_CODEC
+
+
+class SessionListCache:
+    """One cached body per worker, rebuilt on the first request after a change"""
+
+    def __init__(self):
+        self.version = 0  # Bumped on every invalidation
+        self._body: bytes | None = None
+        self._etag: str | None = None
+        self._next_cursor: str | None = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.version += 1
+        self._body = None
+
+    async def get(self, db: AsyncSession) -> Tuple[bytes, str, Optional[str]]:
+        """(body, etag, next_cursor) for the first page, querying only after an invalidation"""
+        if self._body is not None:
+            return self._body, self._etag, self._next_cursor
+
+        # One query per change even when a polling storm misses at once
+        async with self._lock:
+            if self._body is not None:
+                return self._body, self._etag, self._next_cursor
+
+            version = self.version
+            sessions, next_cursor = await MatchmakingService.get_public_sessions(db)
+            body = JSON_CODEC.encode([s.model_dump() for s in sessions]).encode()
+            # Content digest rather than the raw version, so workers that built the same list agree
+            etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+            # An invalidation that landed mid-query means this body may already be stale
+            if version == self.version:
+                self._body, self._etag, self._next_cursor = body, etag, next_cursor
+            return body, etag, next_cursor
+
+
+# Global instance
+session_list_cache = SessionListCache()
+
+# create_session, START_GAME and disconnect-dissolve all announce themselves on the feed
+lobby_feed.add_listener(lambda event, data: session_list_cache.invalidate())
@@ -0,0 +1,205 @@
+"""
+Session Reaper - Closes abandoned lobbies and archives dead sessions.
+
+Runs on every worker as a background task. Each pass walks the open sessions
+(ix_sessions_open) in small batches and closes the ones no worker is serving,
+then moves closed/finished sessions older than ARCHIVE_AFTER_HOURS, with their
+players, into the archive tables (ix_sessions_done). Finally it purges archived
+rows past ARCHIVE_RETENTION_DAYS. Every batch is its own short transaction and
+uses SKIP LOCKED, so workers reaping at the same time never block each other or
+the join path.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import select, text, tuple_, update
+from backend.config import settings
+from backend.database import AsyncSessionLocal
+from backend.models import Session
+from backend.services.state_backend import StateBackend, state_backend
+from backend.services.snapshot_service import snapshot_service
+from backend.services.lobby_feed import lobby_feed, LOBBY_CLOSED
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("waiting", "playing")
+
+# One statement per batch: lock a batch of dead sessions, move their players, then the sessions.
+# session_players' foreign key is checked at the end of the statement, when both are gone.
+# match_results rows stay behind as leaderboard history (their session_id is SET NULL, migration 6).
+ARCHIVE_SQL = text("""
+WITH moved AS (
+    SELECT id FROM sessions
+    WHERE status IN ('closed', 'finished') AND created_at < :cutoff
+    ORDER BY created_at, id
+    LIMIT :batch
+    FOR UPDATE SKIP LOCKED
+), players AS (
+    DELETE FROM session_players sp USING moved
+    WHERE sp.session_id = moved.id
+    RETURNING sp.session_id, sp.user_id, sp.score, sp.is_eliminated, sp.joined_at
+), archived_players AS (
+    INSERT INTO session_players_archive (session_id, user_id, score, is_eliminated, joined_at)
+    SELECT session_id, user_id, score, is_eliminated, joined_at FROM players
+    ON CONFLICT DO NOTHING
+), gone AS (
+    DELETE FROM sessions s USING moved
+    WHERE s.id = moved.id
+    RETURNING s.id, s.session_code, s.lobby_name, s.host_id, s.status, s.max_players,
+              s.player_count, s.is_public, s.created_at
+)
+INSERT INTO sessions_archive (id, session_code, lobby_name, host_id, status, max_players,
+                              player_count, is_public, created_at)
+SELECT * FROM gone
+ON CONFLICT DO NOTHING
+""")
+
+PURGE_SQL = text("""
+WITH expired AS (
+    SELECT id FROM sessions_archive
+    WHERE archived_at < :cutoff
+    ORDER BY archived_at
+    LIMIT :batch
+    FOR UPDATE SKIP LOCKED
+), players AS (
+    DELETE FROM session_players_archive spa USING expired
+    WHERE spa.session_id = expired.id
+)
+DELETE FROM sessions_archive sa USING expired
+WHERE sa.id = expired.id
+""")
+
+
+class SessionReaper:
+    """Periodic, batched cleanup of the sessions tables"""
+
+    def __init__(self, backend: StateBackend):
+        self.backend = backend
+        self.session_state: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session_state: Dict[str, dict]):
+        """Begin reaping; session_state is this worker's live sessions (game_routes.session_state)"""
+        self.session_state = session_state
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Session reaper pass failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.REAPER_INTERVAL)
+
+    async def run_once(self):
+        closed = await self.close_abandoned()
+        archived = await self.archive_done()
+        purged = await self.purge_archive()
+        if closed or archived or purged:
+            logger.info(f"Reaper: closed {closed}, archived {archived}, purged {purged} session(s)")
+
+    async def _is_live(self, session_code: str, pending: set) -> Optional[bool]:
+        """None: not served anywhere. False: served here but the game is over. True: live."""
+        state = self.session_state.get(session_code)
+        if state is not None:
+            game_session = state.get("game_session")
+            return not (game_session and game_session.ended)
+        if session_code in pending:
+            return True  # Snapshot waiting for a worker to restore it
+        if self.backend.distributed and await self.backend.get(f"owner:{session_code}") is not None:
+            return True  # Owned by another worker
+        return None
+
+    async def close_abandoned(self) -> int:
+        """Close open sessions nobody is serving. Returns how many were closed."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.REAPER_LOBBY_GRACE)
+        pending = set(await snapshot_service.pending_codes())
+        after = None
+        total = 0
+
+        while True:
+            async with AsyncSessionLocal() as db:
+                query = (
+                    select(Session.id, Session.session_code, Session.created_at)
+                    .where(Session.status.in_(OPEN_STATUSES), Session.created_at < cutoff)
+                    .order_by(Session.created_at, Session.id)
+                    .limit(settings.REAPER_BATCH_SIZE)
+                )
+                if after:
+                    query = query.where(tuple_(Session.created_at, Session.id) > after)
+                rows = (await db.execute(query)).all()
+            if not rows:
+                return total
+            after = (rows[-1].created_at, rows[-1].id)
+
+            # Liveness may need the state backend; no connection is held meanwhile
+            by_status: Dict[str, List[int]] = {"closed": [], "finished": []}
+            for row in rows:
+                live = await self._is_live(row.session_code, pending)
+                if live is None:
+                    by_status["closed"].append(row.id)
+                elif live is False:
+                    by_status["finished"].append(row.id)
+
+            closed_public = []
+            if by_status["closed"] or by_status["finished"]:
+                async with AsyncSessionLocal() as db:
+                    for status, ids in by_status.items():
+                        if not ids:
+                            continue
+                        # Re-checks status, so a lobby that moved on since the scan is left alone
+                        result = await db.execute(
+                            update(Session)
+                            .where(Session.id.in_(ids), Session.status.in_(OPEN_STATUSES))
+                            .values(status=status)
+                            .returning(Session.session_code, Session.is_public)
+                        )
+                        changed = result.all()
+                        total += len(changed)
+                        closed_public += [row.session_code for row in changed if row.is_public]
+                    await db.commit()
+
+            for code in closed_public:
+                await lobby_feed.publish(LOBBY_CLOSED, {"session_code": code})
+
+            if len(rows) < settings.REAPER_BATCH_SIZE:
+                return total
+            await asyncio.sleep(0)  # Let request handlers in between batches
+
+    async def archive_done(self) -> int:
+        """Move old closed/finished sessions and their players to the archive tables"""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.ARCHIVE_AFTER_HOURS)
+        return await self._batched(ARCHIVE_SQL, cutoff)
+
+    async def purge_archive(self) -> int:
+        """Drop archived sessions past their retention"""
+        if not settings.ARCHIVE_RETENTION_DAYS:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+        return await self._batched(PURGE_SQL, cutoff)
+
+    async def _batched(self, statement, cutoff: datetime) -> int:
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(statement, {"cutoff": cutoff, "batch": settings.REAPER_BATCH_SIZE})
+                await db.commit()
+            total += max(result.rowcount, 0)
+            if result.rowcount < settings.REAPER_BATCH_SIZE:
+                return total
+            await asyncio.sleep(0)
+
+
+# Global instance
+session_reaper = SessionReaper(state_backend)
@@ -0,0 +1,100 @@
+"""
+Session Router - Routes every session to the worker that owns it.
+
+Live game state (session_state, GameSession, timers) stays in the owning
+worker's memory. Other workers only hold sockets: they forward join, message
+and leave events to the owner over the state backend bus, and the owner's
+broadcasts come back to them through ConnectionManager's session channel.
+With the in-memory backend every session is owned locally.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+from backend.config import settings
+from backend.services.state_backend import StateBackend, state_backend
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRouter:
+    """Claims session ownership and dispatches connection events to the owner"""
+
+    def __init__(self, backend: StateBackend, worker_id: str):
+        self.backend = backend
+        self.worker_id = worker_id
+        self.owned: set[str] = set()
+        self._handlers: Dict[str, Callable[..., Awaitable[None]]] = {}
+        self._renew_task: Optional[asyncio.Task] = None
+
+    def bind(self, on_join, on_message, on_leave):
+        """Register the owner-side handlers (see backend/routes/game_routes.py)"""
+        self._handlers = {"join": on_join, "message": on_message, "leave": on_leave}
+
+    async def start(self):
+        await self.backend.subscribe(f"worker:{self.worker_id}", self._on_forwarded)
+        if self.backend.distributed:
+            self._renew_task = asyncio.create_task(self._renew_loop())
+
+    async def close(self):
+        if self._renew_task:
+            self._renew_task.cancel()
+        for code in list(self.owned):
+            await self.release(code)
+
+    async def resolve_owner(self, session_code: str) -> str:
+        """Return the owning worker id, claiming the session if nobody owns it yet"""
+        key = f"owner:{session_code}"
+        if await self.backend.set_if_absent(key, self.worker_id, ttl=settings.SESSION_OWNER_TTL):
+            self.owned.add(session_code)
+            logger.info(f"Worker {self.worker_id} now owns session {session_code}")
+            return self.worker_id
+
+        owner = await self.backend.get(key)
+        if owner is None:
+            # Expired between the two calls - try once more
+            return await self.resolve_owner(session_code)
+        if owner == self.worker_id:
+            self.owned.add(session_code)
+        return owner
+
+    async def release(self, session_code: str):
+        """Give up ownership (session dissolved or worker shutting down)"""
+        if session_code in self.owned:
+            self.owned.discard(session_code)
+            if await self.backend.get(f"owner:{session_code}") == self.worker_id:
+                await self.backend.delete(f"owner:{session_code}")
+
+    async def dispatch(self, owner: str, kind: str, session_code: str, user_id: int, **payload):
+        """Run an event on the owner: directly if local, over the bus otherwise"""
+        if owner == self.worker_id:
+            await self._handlers[kind](session_code, user_id, **payload)
+        else:
+            await self.backend.publish(f"worker:{owner}", {
+                "kind": kind,
+                "session_code": session_code,
+                "user_id": user_id,
+                "payload": payload
+            })
+
+    async def _on_forwarded(self, event: dict):
+        handler = self._handlers.get(event.get("kind"))
+        if not handler:
+            return
+        try:
+            await handler(event["session_code"], event["user_id"], **event.get("payload", {}))
+        except Exception as e:
+            logger.error(f"Error handling forwarded {event.get('kind')} for {event.get('session_code')}: {e}", exc_info=True)
+
+    async def _renew_loop(self):
+        """Keep ownership keys alive while this worker is running"""
+        while True:
+            await asyncio.sleep(settings.SESSION_OWNER_TTL / 3)
+            for code in list(self.owned):
+                try:
+                    await self.backend.set(f"owner:{code}", self.worker_id, ttl=settings.SESSION_OWNER_TTL)
+                except Exception as e:
+                    logger.warning(f"Failed to renew ownership of {code}: {e}")
+
+
+# Global instance
+session_router = SessionRouter(state_backend, settings.WORKER_ID)
@@ -0,0 +1,157 @@
+"""
+Snapshot Service - Carries live sessions across a graceful restart.
+
+On shutdown the worker drains (no new joins or sockets), then writes one
+snapshot per owned session to the state backend: host, lobby roster and the
+GameSession state. On startup snapshots are claimed through the session
+router, restored into session_state and resumed, so clients that reconnect
+land in the same lobby or round instead of being dumped back to the lobby.
+"""
+import asyncio
+import logging
+import signal
+import time
+from typing import Awaitable, Callable, Dict, List
+from backend.config import settings
+from backend.services.state_backend import StateBackend, state_backend
+from backend.services.session_router import SessionRouter, session_router
+from backend.services.game_session_service import game_session_service
+from backend.services.lobby_roster import LobbyRoster
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INDEX = "snapshots"  # Set of session codes with a stored snapshot
+
+
+class SnapshotService:
+    """Drain mode plus save/restore of session_state entries"""
+
+    def __init__(self, backend: StateBackend, router: SessionRouter):
+        self.backend = backend
+        self.router = router
+        self.draining = False
+        self.background_tasks = set()
+
+    def begin_drain(self):
+        """Stop accepting joins and sockets; live state is about to be saved"""
+        if not self.draining:
+            self.draining = True
+            logger.info("Draining: refusing new joins until restart")
+
+    def drain_on_signals(self, signals=(signal.SIGTERM, signal.SIGINT)):
+        """Start draining the moment the server is told to stop.
+
+        uvicorn closes every WebSocket (1012) before the lifespan shutdown runs,
+        so draining there is too late: each disconnect would already have been a
+        leave. The handler installed before ours (uvicorn's) still runs after it.
+        """
+        for sig in signals:
+            previous = signal.getsignal(sig)
+
+            def handler(signum, frame, previous=previous):
+                self.begin_drain()
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous == signal.SIG_DFL:
+                    # Nobody else handles it: let the default action (exit) happen
+                    signal.signal(signum, signal.SIG_DFL)
+                    signal.raise_signal(signum)
+
+            try:
+                signal.signal(sig, handler)
+            except ValueError:
+                # Not the main thread (e.g. an embedded server); the lifespan shutdown still drains
+                logger.warning("Can't hook shutdown signals outside the main thread; draining at lifespan shutdown")
+                return
+
+    async def save_sessions(self, session_state: Dict[str, dict]) -> int:
+        """Write a snapshot for every live session this worker owns"""
+        saved = 0
+        for code, state in session_state.items():
+            game_session = state.get("game_session")
+            if game_session is not None and game_session.ended:
+                continue  # Nothing left to resume
+
+            snapshot = {
+                "session_code": code,
+                "host_id": state["host_id"],
+                "is_public": state.get("is_public", False),
+                "saved_at": time.time(),
+                "roster": state["roster"].to_snapshot(),
+                "game": game_session.to_snapshot() if game_session else None
+            }
+            try:
+                await self.backend.set(f"snapshot:{code}", snapshot)
+                await self.backend.set_add(SNAPSHOT_INDEX, code)
+                saved += 1
+            except Exception as e:
+                logger.error(f"Failed to snapshot session {code}: {e}")
+
+        logger.info(f"Saved {saved} session snapshot(s)")
+        return saved
+
+    async def pending_codes(self) -> List[str]:
+        """Session codes that have a snapshot waiting to be restored"""
+        return await self.backend.set_members(SNAPSHOT_INDEX)
+
+    async def restore_sessions(
+        self,
+        session_state: Dict[str, dict],
+        manager,
+        on_abandon: Callable[[str, int], Awaitable[None]]
+    ) -> List[str]:
+        """Restore every snapshot this worker can claim. Returns the restored codes."""
+        restored = []
+        for code in await self.pending_codes():
+            # With several workers starting at once, whoever claims ownership restores it
+            if await self.router.resolve_owner(code) != self.router.worker_id:
+                continue
+
+            snapshot = await self.backend.get(f"snapshot:{code}")
+            await self.backend.delete(f"snapshot:{code}")
+            await self.backend.set_remove(SNAPSHOT_INDEX, code)
+
+            if snapshot is None or time.time() - snapshot["saved_at"] > settings.SNAPSHOT_MAX_AGE:
+                logger.info(f"Discarding stale snapshot for session {code}")
+                await self.router.release(code)
+                continue
+
+            roster = LobbyRoster.from_snapshot(code, manager, snapshot["roster"])
+            state = {
+                "players": roster.players,
+                "roster": roster,
+                "host_id": snapshot["host_id"],
+                "is_public": snapshot.get("is_public", False),
+                # Cleared by handle_join as players come back; the rest are swept
+                "awaiting_reconnect": set(roster.players)
+            }
+            if snapshot["game"]:
+                state["game_session"] = game_session_service.restore_session(snapshot["game"], manager)
+
+            session_state[code] = state
+            restored.append(code)
+            self._spawn(self._sweep_absent(session_state, code, on_abandon))
+
+        if restored:
+            logger.info(f"Restored {len(restored)} session(s): {restored}")
+        return restored
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def _sweep_absent(self, session_state: Dict[str, dict], code: str, on_abandon):
+        """Treat restored players who never reconnected as having left"""
+        await asyncio.sleep(settings.SNAPSHOT_RECONNECT_GRACE)
+        state = session_state.get(code)
+        if not state:
+            return
+        absent = state.pop("awaiting_reconnect", set())
+        for user_id in absent:
+            logger.info(f"Player {user_id} did not return to restored session {code}")
+            await on_abandon(code, user_id)
+
+
+# Global instance
+snapshot_service = SnapshotService(state_backend, session_router)
@@ -0,0 +1,308 @@
+"""
+State Backend - Shared key/value state plus a publish/subscribe bus.
+
+InMemoryStateBackend keeps everything inside one process (single uvicorn worker,
+the default) and can persist keys without a TTL to a file across restarts.
+BrokerStateBackend talks to a networked broker so several workers can agree on
+session ownership and fan broadcasts out to sockets held by any of them.
+backend/broker.py is a stand-in broker for local runs and CI.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], Awaitable[None]]
+
+
+class BrokerError(Exception):
+    pass
+
+
+class StateBackend(ABC):
+    """Key/value store with optional TTLs and a channel-based message bus"""
+
+    # True when other processes can see our state and bus messages
+    distributed = False
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Atomically set key unless it already holds a live value. Returns True if set."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    async def set_add(self, key: str, member: str):
+        pass
+
+    @abstractmethod
+    async def set_remove(self, key: str, member: str):
+        pass
+
+    @abstractmethod
+    async def set_members(self, key: str) -> list:
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Any):
+        pass
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: Handler):
+        """Register this process's handler for a channel (one handler per channel)"""
+        pass
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str):
+        pass
+
+
+class InMemoryStateBackend(StateBackend):
+    """Process-local state; the bus only reaches handlers in this process"""
+
+    def __init__(self, persist_path: Optional[str] = None):
+        self.persist_path = persist_path
+        self._data: Dict[str, tuple[Any, Optional[float]]] = {}  # key -> (value, expires_at)
+        self._sets: Dict[str, set] = {}
+        self._subscribers: Dict[str, Handler] = {}
+
+    async def start(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path) as f:
+                saved = json.load(f)
+            self._data = {key: (value, None) for key, value in saved.get("data", {}).items()}
+            self._sets = {key: set(members) for key, members in saved.get("sets", {}).items()}
+            os.remove(self.persist_path)  # Consumed; a fresh file is written on the next shutdown
+            logger.info(f"Loaded {len(self._data)} persisted state keys from {self.persist_path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load persisted state from {self.persist_path}: {e}")
+
+    async def close(self):
+        """Persist keys without a TTL (TTL keys such as ownership are per-process)"""
+        durable = {key: value for key, (value, expires_at) in self._data.items() if expires_at is None}
+        if not self.persist_path or not (durable or self._sets):
+            return
+        try:
+            with open(self.persist_path, "w") as f:
+                json.dump({"data": durable, "sets": {k: sorted(v) for k, v in self._sets.items()}}, f)
+            logger.info(f"Persisted {len(durable)} state keys to {self.persist_path}")
+        except OSError as e:
+            logger.error(f"Could not persist state to {self.persist_path}: {e}")
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl else None
+
+    async def get(self, key: str) -> Any:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (value, self._expiry(ttl))
+
+    async def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        if self._live(key):
+            return False
+        self._data[key] = (value, self._expiry(ttl))
+        return True
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def set_add(self, key: str, member: str):
+        self._sets.setdefault(key, set()).add(member)
+
+    async def set_remove(self, key: str, member: str):
+        members = self._sets.get(key)
+        if members is not None:
+            members.discard(member)
+            if not members:
+                del self._sets[key]
+
+    async def set_members(self, key: str) -> list:
+        return list(self._sets.get(key, ()))
+
+    async def publish(self, channel: str, message: Any):
+        handler = self._subscribers.get(channel)
+        if handler:
+            await handler(message)
+
+    async def subscribe(self, channel: str, handler: Handler):
+        self._subscribers[channel] = handler
+
+    async def unsubscribe(self, channel: str):
+        self._subscribers.pop(channel, None)
+
+
+class BrokerStateBackend(StateBackend):
+    """Client for the line-delimited JSON broker protocol (see backend/broker.py)"""
+
+    distributed = True
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 7070
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._subscribers: Dict[str, Handler] = {}
+        self._connected = asyncio.Event()
+        self._run_task: Optional[asyncio.Task] = None
+        self._handler_tasks = set()
+        self._closing = False
+
+    async def start(self):
+        self._run_task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._connected.wait(), timeout=settings.BROKER_TIMEOUT)
+
+    async def close(self):
+        self._closing = True
+        if self._run_task:
+            self._run_task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    async def _run(self):
+        """Keep a connection open, reconnecting (and resubscribing) with backoff"""
+        delay = 0.5
+        while not self._closing:
+            try:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                logger.info(f"Connected to state broker at {self.host}:{self.port}")
+                delay = 0.5
+                for channel in self._subscribers:
+                    self._send({"op": "subscribe", "channel": channel})
+                self._connected.set()
+                await self._read_loop()
+            except asyncio.CancelledError:
+                return
+            except OSError as e:
+                logger.warning(f"State broker unavailable ({e}), retrying in {delay}s")
+
+            self._connected.clear()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(BrokerError("connection to broker lost"))
+            self._pending.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10)
+
+    async def _read_loop(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                logger.warning("State broker closed the connection")
+                return
+            msg = json.loads(line)
+
+            if msg.get("op") == "message":
+                handler = self._subscribers.get(msg["channel"])
+                if handler:
+                    # Run handlers off the read loop so a slow one can't stall replies
+                    task = asyncio.create_task(handler(msg["data"]))
+                    self._handler_tasks.add(task)
+                    task.add_done_callback(self._handler_tasks.discard)
+                continue
+
+            future = self._pending.pop(msg.get("id"), None)
+            if future and not future.done():
+                if "error" in msg:
+                    future.set_exception(BrokerError(msg["error"]))
+                else:
+                    future.set_result(msg.get("result"))
+
+    def _send(self, request: dict):
+        self._writer.write(json.dumps(request).encode() + b"\n")
+
+    async def _request(self, op: str, **fields) -> Any:
+        await asyncio.wait_for(self._connected.wait(), timeout=settings.BROKER_TIMEOUT)
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._send({"id": request_id, "op": op, **fields})
+        await self._writer.drain()
+        try:
+            return await asyncio.wait_for(future, timeout=settings.BROKER_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def get(self, key: str) -> Any:
+        return await self._request("get", key=key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._request("set", key=key, value=value, ttl=ttl)
+
+    async def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return await self._request("setnx", key=key, value=value, ttl=ttl)
+
+    async def delete(self, key: str):
+        await self._request("delete", key=key)
+
+    async def set_add(self, key: str, member: str):
+        await self._request("sadd", key=key, member=member)
+
+    async def set_remove(self, key: str, member: str):
+        await self._request("srem", key=key, member=member)
+
+    async def set_members(self, key: str) -> list:
+        return await self._request("smembers", key=key)
+
+    async def publish(self, channel: str, message: Any):
+        await self._request("publish", channel=channel, data=message)
+
+    async def subscribe(self, channel: str, handler: Handler):
+        self._subscribers[channel] = handler
+        await self._request("subscribe", channel=channel)
+
+    async def unsubscribe(self, channel: str):
+        if self._subscribers.pop(channel, None) is not None:
+            await self._request("unsubscribe", channel=channel)
+
+
+def create_state_backend() -> StateBackend:
+    if settings.STATE_BACKEND == "broker":
+        return BrokerStateBackend(settings.BROKER_URL)
+    return InMemoryStateBackend(persist_path=settings.STATE_PERSIST_PATH or None)
+
+
+# Global instance
+state_backend = create_state_backend()
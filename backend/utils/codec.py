@@ -0,0 +1,155 @@
+"""
+Wire codecs for the game WebSocket.
+
+Clients pick a codec at the handshake by offering a subprotocol:
+- ``edu-party.msgpack.v1``: MessagePack binary frames. Known keys and message
+  types are interned to small integers (see KEYS / MESSAGE_TYPES).
+- ``edu-party.json.v1`` (or no subprotocol): JSON text frames.
+
+Clients always send JSON text upstream; the codec accepts either frame kind.
+"""
+import json
+from typing import Any
+from fastapi import WebSocket, WebSocketDisconnect
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Binary subprotocol is simply never negotiated
+    msgpack = None
+
+# Interning tables - APPEND ONLY, the index is the wire value.
+# Mirrored in frontend/js/codec.js.
+MESSAGE_TYPES = [
+    "PLAYER_LIST_UPDATE", "GAME_START", "ROUND_START", "ALL_PLAYERS_READY",
+    "ROUND_RESULT", "INTERMISSION", "GAME_SESSION_END", "REDIRECT_TO_LOBBY",
+    "ERROR", "PLAYER_LIST_DELTA", "QUESTION_CHUNK",
+    "SESSION_RESYNC", "PING", "ACTION_RESULT",
+]
+
+KEYS = [
+    "type", "message", "round", "total_rounds", "active_players",
+    "eliminated_count", "is_test_mode", "slots_available", "is_synced",
+    "game_type", "game_title", "game_icon", "mode", "time_limit", "win_score",
+    "tutorial", "text", "rules", "questions", "options", "answer", "code",
+    "word_list", "players", "user_id", "name", "is_ready", "is_host", "icon",
+    "status", "rank", "score", "total_players", "qualifiers_count",
+    "session_code", "round_completed", "next_round", "winner",
+    "final_rankings", "details", "version", "base_version", "added",
+    "changed", "removed", "key", "question_count", "from",
+    "seq", "phase", "ended", "results",
+]
+
+_KEY_INDEX = {key: i for i, key in enumerate(KEYS)}
+_TYPE_INDEX = {name: i for i, name in enumerate(MESSAGE_TYPES)}
+_TYPE_KEY = _KEY_INDEX["type"]
+
+
+def _intern(value: Any) -> Any:
+    # Int keys on the wire always mean "interned", so a message may only use str keys;
+    # an int-keyed dict (e.g. keyed by user id) would decode into the wrong field names
+    if isinstance(value, dict):
+        for k in value:
+            if not isinstance(k, str):
+                raise TypeError(f"Message dicts must have str keys, got {k!r}; send a list of pairs instead")
+        return {_KEY_INDEX.get(k, k): _intern(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_intern(v) for v in value]
+    return value
+
+
+def _unintern(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {(KEYS[k] if isinstance(k, int) else k): _unintern(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unintern(v) for v in value]
+    return value
+
+
+class JsonCodec:
+    """Text frames. Uses orjson when installed."""
+    name = "json"
+    subprotocol = "edu-party.json.v1"
+    binary = False
+
+    def encode(self, message: dict) -> str:
+        if orjson is not None:
+            return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(message)
+
+    def decode(self, data: str | bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """Binary frames with interned keys and message types"""
+    name = "msgpack"
+    subprotocol = "edu-party.msgpack.v1"
+    binary = True
+
+    def encode(self, message: dict) -> bytes:
+        packed = _intern(message)
+        msg_type = message.get("type")
+        if msg_type in _TYPE_INDEX:
+            packed[_TYPE_KEY] = _TYPE_INDEX[msg_type]
+        return msgpack.packb(packed, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        message = _unintern(msgpack.unpackb(data, raw=False, strict_map_key=False))
+        if isinstance(message, dict) and isinstance(message.get("type"), int):
+            message["type"] = MESSAGE_TYPES[message["type"]]
+        return message
+
+
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = MsgpackCodec() if msgpack is not None else None
+
+# Preference order when a client offers several subprotocols
+_SUPPORTED = [c for c in (MSGPACK_CODEC, JSON_CODEC) if c is not None]
+
+
+def negotiate(websocket: WebSocket) -> tuple[JsonCodec | MsgpackCodec, str | None]:
+    """Pick a codec from the client's offered subprotocols.
+
+    Returns (codec, subprotocol to accept). If the client offered subprotocols we
+    must answer with one of them, otherwise browsers fail the handshake.
+    """
+    offered = websocket.scope.get("subprotocols") or []
+    for codec in _SUPPORTED:
+        if codec.subprotocol in offered:
+            return codec, codec.subprotocol
+    return JSON_CODEC, None
+
+
+class OutboundFrame:
+    """A message that is encoded lazily, at most once per codec.
+    The message must not be changed once the frame exists: frames can be cached and resent."""
+    __slots__ = ("message", "_encoded")
+
+    def __init__(self, message: dict):
+        self.message = message
+        self._encoded: dict[str, str | bytes] = {}
+
+    def encode(self, codec) -> str | bytes:
+        payload = self._encoded.get(codec.name)
+        if payload is None:
+            payload = codec.encode(self.message)
+            self._encoded[codec.name] = payload
+        return payload
+
+
+async def receive_message(websocket: WebSocket, codec) -> Any:
+    """Receive and decode one inbound frame (text or binary)"""
+    event = await websocket.receive()
+    if event["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(event.get("code", 1000))
+
+    if event.get("bytes") is not None:
+        return codec.decode(event["bytes"]) if codec.binary else JSON_CODEC.decode(event["bytes"])
+    return JSON_CODEC.decode(event["text"])
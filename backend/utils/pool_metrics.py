@@ -0,0 +1,100 @@
+"""
+Connection pool instrumentation.
+
+InstrumentedPool times every checkout, including the wait for a free
+connection, which pool events alone can't see. Checkin/checkout events keep
+the in-use and overflow gauges. Everything lands in the module-level
+``pool_stats`` shown by GET /api/health.
+"""
+import logging
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Counters and gauges for one engine's pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.in_use = 0
+        self.overflow = 0  # Connections currently open beyond pool_size (negative while the pool fills)
+        self.peak_overflow = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.slow_waits = 0
+        self.timeouts = 0
+        self.slow_wait_ms = 100.0
+        self.pool_size = 0
+        self.max_overflow = 0
+
+    def record_wait(self, elapsed_ms: float):
+        self.wait_total_ms += elapsed_ms
+        self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+        if elapsed_ms >= self.slow_wait_ms:
+            self.slow_waits += 1
+            logger.warning(
+                f"DB pool checkout waited {elapsed_ms:.0f}ms "
+                f"(in use {self.in_use}, overflow {self.overflow}/{self.max_overflow})"
+            )
+
+    def as_dict(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "in_use": self.in_use,
+            "overflow": self.overflow,
+            "peak_overflow": self.peak_overflow,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 2) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max_ms, 2),
+            "slow_waits": self.slow_waits,
+            "timeouts": self.timeouts,
+        }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.timeouts += 1
+            logger.error(f"DB pool exhausted: checkout timed out after {self._timeout}s")
+            raise
+        finally:
+            pool_stats.record_wait((time.perf_counter() - start) * 1000)
+
+
+def instrument_engine(engine, slow_wait_ms: float):
+    """Attach checkout/checkin hooks to an engine built with poolclass=InstrumentedPool"""
+    sync_engine = engine.sync_engine
+    pool_stats.slow_wait_ms = slow_wait_ms
+    pool_stats.pool_size = sync_engine.pool.size()
+    pool_stats.max_overflow = sync_engine.pool._max_overflow
+
+    def _gauges():
+        pool = sync_engine.pool  # Looked up each time: dispose() swaps the pool
+        pool_stats.in_use = pool.checkedout()
+        pool_stats.overflow = pool.overflow()
+        pool_stats.peak_overflow = max(pool_stats.peak_overflow, pool_stats.overflow)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats.checkouts += 1
+        _gauges()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_stats.checkins += 1
+        _gauges()
@@ -0,0 +1,95 @@
+"""
+Inbound rate limiting for game WebSockets.
+
+Every connection gets an InboundLimiter: one token bucket per message type
+(MESSAGE_BUDGETS, types not listed share the "*" budget). A message that finds
+its bucket empty is dropped without being dispatched. Each drop also costs a
+token from a strike bucket (WS_RATE_LIMIT_STRIKES per WS_RATE_LIMIT_WINDOW);
+once that runs dry the client is abusive and its socket is closed with 1008.
+Drops and closes are counted in rate_limit_stats (exposed on /api/health).
+"""
+import logging
+import time
+from typing import Any, Dict, Tuple
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# message type -> (tokens per second, burst)
+MESSAGE_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "GAME_ACTION": (10.0, 20.0),  # Clients batch answers every 250ms
+    "GET_QUESTIONS": (2.0, 5.0),
+    "GET_PLAYERS": (1.0, 3.0),
+    "GET_GAME_STATE": (1.0, 3.0),
+    "PLAYER_READY": (2.0, 5.0),
+    "START_GAME": (0.5, 2.0),
+    "PLAYER_READY_FOR_ROUND": (1.0, 4.0),
+    "ROUND_COMPLETE": (1.0, 4.0),
+    "PHASE_ACK": (4.0, 8.0),
+    "PONG": (1.0, 3.0),
+    "*": (5.0, 10.0),
+}
+
+ALLOW, DROP, CLOSE = "allow", "drop", "close"
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RateLimitStats:
+    """Dropped messages per type and sockets closed for abuse, across this worker"""
+
+    def __init__(self):
+        self.dropped: Dict[str, int] = {}
+        self.closed = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "dropped": dict(self.dropped),
+            "dropped_total": sum(self.dropped.values()),
+            "closed": self.closed,
+        }
+
+
+rate_limit_stats = RateLimitStats()
+
+
+class InboundLimiter:
+    """Per-connection budgets; check() says whether to dispatch, drop or close"""
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.strikes = TokenBucket(settings.WS_RATE_LIMIT_STRIKES / settings.WS_RATE_LIMIT_WINDOW, settings.WS_RATE_LIMIT_STRIKES)
+        self.dropped = 0
+
+    def check(self, msg_type: Any) -> str:
+        # Unknown or junk types share one bucket, so made-up names can't mint fresh budgets
+        key = msg_type if isinstance(msg_type, str) and msg_type in MESSAGE_BUDGETS else "*"
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(*MESSAGE_BUDGETS[key])
+        if bucket.take():
+            return ALLOW
+
+        self.dropped += 1
+        rate_limit_stats.dropped[key] = rate_limit_stats.dropped.get(key, 0) + 1
+        if self.strikes.take():
+            return DROP
+        rate_limit_stats.closed += 1
+        return CLOSE
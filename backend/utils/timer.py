@@ -1,37 +1,119 @@
+"""
+Deadline scheduler shared by every GameTimer.
+
+All deadlines live in one heap served by a single background task that sleeps
+until the earliest one. Resetting a timer only moves its deadline (O(1)): the
+stale heap entry is noticed when it surfaces and re-queued at the new time, so
+frequently reset timers (lobby activity) never touch the heap per reset.
+"""
 import asyncio
-from typing import Callable, Optional
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TimerScheduler:
+    """One heap of deadlines, one task firing them"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, "GameTimer"]] = []
+        self._seq = itertools.count()  # Tie-breaker so equal deadlines never compare timers
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._callback_tasks = set()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, timer: "GameTimer"):
+        timer._queued_at = timer.deadline
+        heapq.heappush(self._heap, (timer.deadline, next(self._seq), timer))
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif self._heap[0][2] is timer:
+            self._wakeup.set()  # New earliest deadline: shorten the current sleep
+
+    def schedule(self, timer: "GameTimer"):
+        # An entry already queued at or before the new deadline will re-queue itself when it surfaces
+        if timer._queued_at is None or timer.deadline < timer._queued_at:
+            self._push(timer)
+
+    async def _run(self):
+        while self._heap:
+            deadline, _, timer = self._heap[0]
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if timer._queued_at != deadline:
+                continue  # Superseded by an earlier entry for the same timer
+            timer._queued_at = None
+            if timer.deadline is None:
+                continue  # Stopped
+            if timer.deadline > deadline:
+                self._push(timer)  # Reset since it was queued
+                continue
+            timer.deadline = None
+            self._fire(timer)
+
+    def _fire(self, timer: "GameTimer"):
+        if not timer.on_finish:
+            return
+        try:
+            result = timer.on_finish()
+        except Exception as e:
+            logger.error(f"Timer callback failed: {e}", exc_info=True)
+            return
+        if asyncio.iscoroutine(result):
+            # Run async callbacks off the scheduler so a slow one can't delay other deadlines
+            task = asyncio.create_task(result)
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_tasks.discard)
+
 
 class GameTimer:
-    def __init__(self, duration: int, on_tick: Optional[Callable[[int], None]] = None, on_finish: Optional[Callable[[], None]] = None):
+    """Handle on a deadline in the shared scheduler; on_finish may be sync or async"""
+
+    def __init__(self, duration: float, on_finish: Optional[Callable[[], object]] = None, scheduler: Optional[TimerScheduler] = None):
         self.duration = duration
-        self.remaining = duration
-        self.on_tick = on_tick
         self.on_finish = on_finish
-        self.task: Optional[asyncio.Task] = None
-        self._cancelled = False
+        self.scheduler = scheduler or timer_scheduler
+        self.deadline: Optional[float] = None  # time.monotonic() when it fires; None when idle
+        self._queued_at: Optional[float] = None  # Deadline of this timer's live heap entry
 
-    async def start(self):
-        self._cancelled = False
-        self.remaining = self.duration
-        self.task = asyncio.create_task(self._run())
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic()) if self.deadline is not None else 0.0
 
-    async def _run(self):
-        while self.remaining > 0 and not self._cancelled:
-            if self.on_tick:
-                if asyncio.iscoroutinefunction(self.on_tick):
-                    await self.on_tick(self.remaining)
-                else:
-                    self.on_tick(self.remaining)
-            await asyncio.sleep(1)
-            self.remaining -= 1
-        
-        if not self._cancelled and self.on_finish:
-             if asyncio.iscoroutinefunction(self.on_finish):
-                await self.on_finish()
-             else:
-                self.on_finish()
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None
+
+    def start(self, duration: Optional[float] = None):
+        """(Re)arm the timer for duration seconds from now"""
+        if duration is not None:
+            self.duration = duration
+        self.deadline = time.monotonic() + self.duration
+        self.scheduler.schedule(self)
+
+    def reset(self):
+        """Push the deadline back to a full duration from now"""
+        self.start()
 
     def stop(self):
-        self._cancelled = True
-        if self.task:
-            self.task.cancel()
+        self.deadline = None
+
+
+# Global instance
+timer_scheduler = TimerScheduler()
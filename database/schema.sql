@@ -24,9 +24,23 @@ CREATE TABLE IF NOT EXISTS sessions (
     status VARCHAR(20) DEFAULT 'waiting', -- waiting, active, finished
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     max_players INTEGER DEFAULT 50,
+    player_count INTEGER NOT NULL DEFAULT 0, -- seats taken (host included), kept by the atomic join
     is_public BOOLEAN DEFAULT TRUE
 );
 
+-- Lobby browser: public waiting lobbies, keyset-paginated newest-first over (created_at, id)
+CREATE INDEX IF NOT EXISTS ix_sessions_public_waiting
+    ON sessions (created_at, id)
+    WHERE is_public = TRUE AND status = 'waiting';
+
+-- Session reaper: open lobbies checked for abandonment, dead ones waiting to be archived
+CREATE INDEX IF NOT EXISTS ix_sessions_open
+    ON sessions (created_at, id)
+    WHERE status IN ('waiting', 'playing');
+CREATE INDEX IF NOT EXISTS ix_sessions_done
+    ON sessions (created_at, id)
+    WHERE status IN ('closed', 'finished');
+
 -- Session Players (Join Table)
 CREATE TABLE IF NOT EXISTS session_players (
     session_id INTEGER REFERENCES sessions(id) ON DELETE CASCADE,
@@ -40,9 +54,42 @@ CREATE TABLE IF NOT EXISTS session_players (
 -- Match Results (Leaderboard History)
 CREATE TABLE IF NOT EXISTS match_results (
     id SERIAL PRIMARY KEY,
-    session_id INTEGER REFERENCES sessions(id),
+    session_id INTEGER REFERENCES sessions(id) ON DELETE SET NULL, -- results outlive archived sessions
     user_id INTEGER REFERENCES users(id),
     rank_position INTEGER, -- 1, 2, 3, etc.
     final_score INTEGER,
     game_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Archive (filled by the session reaper; no foreign keys so rows outlive users)
+CREATE TABLE IF NOT EXISTS sessions_archive (
+    id INTEGER PRIMARY KEY, -- id the row had in sessions
+    session_code VARCHAR,
+    lobby_name VARCHAR,
+    host_id INTEGER,
+    status VARCHAR,
+    max_players INTEGER,
+    player_count INTEGER,
+    is_public BOOLEAN,
+    created_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_sessions_archive_session_code ON sessions_archive (session_code);
+CREATE INDEX IF NOT EXISTS ix_sessions_archive_archived_at ON sessions_archive (archived_at);
+
+CREATE TABLE IF NOT EXISTS session_players_archive (
+    session_id INTEGER,
+    user_id INTEGER,
+    score INTEGER,
+    is_eliminated BOOLEAN,
+    joined_at TIMESTAMP,
+    PRIMARY KEY (session_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS ix_session_players_archive_user_id ON session_players_archive (user_id);
+
+-- Migration ledger (see backend/migrations.py); startup skips all schema work when the newest version is recorded
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,116 @@
+// Wire codec for the game WebSocket.
+// Mirrors backend/utils/codec.py - keep the interning tables in sync (APPEND ONLY).
+
+export const MSGPACK_PROTOCOL = 'edu-party.msgpack.v1';
+export const JSON_PROTOCOL = 'edu-party.json.v1';
+
+const MESSAGE_TYPES = [
+    'PLAYER_LIST_UPDATE', 'GAME_START', 'ROUND_START', 'ALL_PLAYERS_READY',
+    'ROUND_RESULT', 'INTERMISSION', 'GAME_SESSION_END', 'REDIRECT_TO_LOBBY',
+    'ERROR', 'PLAYER_LIST_DELTA', 'QUESTION_CHUNK',
+    'SESSION_RESYNC', 'PING', 'ACTION_RESULT',
+];
+
+const KEYS = [
+    'type', 'message', 'round', 'total_rounds', 'active_players',
+    'eliminated_count', 'is_test_mode', 'slots_available', 'is_synced',
+    'game_type', 'game_title', 'game_icon', 'mode', 'time_limit', 'win_score',
+    'tutorial', 'text', 'rules', 'questions', 'options', 'answer', 'code',
+    'word_list', 'players', 'user_id', 'name', 'is_ready', 'is_host', 'icon',
+    'status', 'rank', 'score', 'total_players', 'qualifiers_count',
+    'session_code', 'round_completed', 'next_round', 'winner',
+    'final_rankings', 'details', 'version', 'base_version', 'added',
+    'changed', 'removed', 'key', 'question_count', 'from',
+    'seq', 'phase', 'ended', 'results',
+];
+
+const textDecoder = new TextDecoder();
+
+// Minimal MessagePack decoder - covers everything msgpack.packb emits for our messages
+class Reader {
+    constructor(buffer) {
+        this.view = new DataView(buffer);
+        this.bytes = new Uint8Array(buffer);
+        this.pos = 0;
+    }
+
+    u8() { return this.view.getUint8(this.pos++); }
+    u16() { const v = this.view.getUint16(this.pos); this.pos += 2; return v; }
+    u32() { const v = this.view.getUint32(this.pos); this.pos += 4; return v; }
+
+    str(len) {
+        const s = textDecoder.decode(this.bytes.subarray(this.pos, this.pos + len));
+        this.pos += len;
+        return s;
+    }
+
+    bin(len) {
+        const b = this.bytes.slice(this.pos, this.pos + len);
+        this.pos += len;
+        return b;
+    }
+
+    array(len) {
+        const out = new Array(len);
+        for (let i = 0; i < len; i++) out[i] = this.value();
+        return out;
+    }
+
+    map(len) {
+        const out = {};
+        for (let i = 0; i < len; i++) {
+            const k = this.value();
+            // Integer keys are always interned: codec.py refuses to encode dicts with non-str keys
+            const key = typeof k === 'number' ? KEYS[k] : k;
+            out[key] = this.value();
+        }
+        return out;
+    }
+
+    value() {
+        const b = this.u8();
+        if (b <= 0x7f) return b;
+        if (b >= 0xe0) return b - 0x100;
+        if ((b & 0xf0) === 0x80) return this.map(b & 0x0f);
+        if ((b & 0xf0) === 0x90) return this.array(b & 0x0f);
+        if ((b & 0xe0) === 0xa0) return this.str(b & 0x1f);
+
+        let v;
+        switch (b) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return this.bin(this.u8());
+            case 0xc5: return this.bin(this.u16());
+            case 0xc6: return this.bin(this.u32());
+            case 0xca: v = this.view.getFloat32(this.pos); this.pos += 4; return v;
+            case 0xcb: v = this.view.getFloat64(this.pos); this.pos += 8; return v;
+            case 0xcc: return this.u8();
+            case 0xcd: return this.u16();
+            case 0xce: return this.u32();
+            case 0xcf: v = this.view.getBigUint64(this.pos); this.pos += 8; return Number(v);
+            case 0xd0: v = this.view.getInt8(this.pos); this.pos += 1; return v;
+            case 0xd1: v = this.view.getInt16(this.pos); this.pos += 2; return v;
+            case 0xd2: v = this.view.getInt32(this.pos); this.pos += 4; return v;
+            case 0xd3: v = this.view.getBigInt64(this.pos); this.pos += 8; return Number(v);
+            case 0xd9: return this.str(this.u8());
+            case 0xda: return this.str(this.u16());
+            case 0xdb: return this.str(this.u32());
+            case 0xdc: return this.array(this.u16());
+            case 0xdd: return this.array(this.u32());
+            case 0xde: return this.map(this.u16());
+            case 0xdf: return this.map(this.u32());
+        }
+        throw new Error(`Unsupported MessagePack byte 0x${b.toString(16)}`);
+    }
+}
+
+export function decodeFrame(data) {
+    if (typeof data === 'string') return JSON.parse(data);
+
+    const message = new Reader(data).value();
+    if (message && typeof message.type === 'number') {
+        message.type = MESSAGE_TYPES[message.type];
+    }
+    return message;
+}
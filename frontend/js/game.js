@@ -36,6 +36,86 @@ let currentMode = 'quiz';
 let myScore = 0;
 let gameActive = false;
 
+// Answers go up in batches and are scored by the server; myScore mirrors the score it reports back
+const ACTION_FLUSH_MS = 250;
+const ACTION_BATCH_MAX = 20;
+let pendingActions = [];
+let flushTimer = null;
+
+function queueAction(index, answer) {
+    pendingActions.push([index, answer]);
+    if (pendingActions.length >= ACTION_BATCH_MAX) flushActions();
+    else if (!flushTimer) flushTimer = setTimeout(flushActions, ACTION_FLUSH_MS);
+}
+
+function flushActions() {
+    if (flushTimer) {
+        clearTimeout(flushTimer);
+        flushTimer = null;
+    }
+    if (pendingActions.length === 0) return;
+    socket.send('GAME_ACTION', { actions: pendingActions });
+    pendingActions = [];
+}
+
+// Clients never hold answers: the server says whether each one was right (ACTION_RESULT)
+const VERDICT_TIMEOUT_MS = 3000;
+const pendingVerdicts = new Map(); // question index -> resolve(true | false | null)
+
+// Resolves with the server's verdict, or null if none arrives in time
+function submitAnswer(index, answer) {
+    return new Promise(resolve => {
+        settleVerdict(index, null); // A stale wait for the same (looped) index
+        pendingVerdicts.set(index, resolve);
+        queueAction(index, answer);
+        flushActions(); // The player is waiting on this one
+        setTimeout(() => {
+            if (pendingVerdicts.get(index) === resolve) settleVerdict(index, null);
+        }, VERDICT_TIMEOUT_MS);
+    });
+}
+
+function settleVerdict(index, verdict) {
+    const resolve = pendingVerdicts.get(index);
+    if (!resolve) return;
+    pendingVerdicts.delete(index);
+    resolve(verdict);
+}
+
+// Questions come without answers: a first window in ROUND_START, the rest via GET_QUESTIONS.
+const QUESTION_PREFETCH = 5; // ask for the next chunk this many items before running out
+const CHUNK_RETRY_MS = 2000;
+let questionCount = 0;
+let chunkRequestedAt = 0; // 0 when no GET_QUESTIONS is outstanding
+let onQuestionsLoaded = null;
+
+function loadQuestions(items, count) {
+    questions = items.slice();
+    questionCount = count || questions.length;
+    chunkRequestedAt = 0;
+    onQuestionsLoaded = null;
+}
+
+// Item for a (looping) question index; fetches ahead as the player nears the end of what has arrived
+function questionAt(index) {
+    if (questionCount === 0) return undefined;
+    const i = index % questionCount;
+    const loaded = questions.length;
+    const pending = chunkRequestedAt && Date.now() - chunkRequestedAt < CHUNK_RETRY_MS;
+    if (loaded < questionCount && i + QUESTION_PREFETCH >= loaded && !pending) {
+        chunkRequestedAt = Date.now();
+        socket.send('GET_QUESTIONS', { round: currentRoundNumber, from: loaded });
+    }
+    return questions[i];
+}
+
+// Render the current question now, or as soon as its chunk arrives
+function withCurrentQuestion(render) {
+    const q = questionAt(currentQuestionIndex);
+    if (q !== undefined) render(q);
+    else onQuestionsLoaded = () => withCurrentQuestion(render);
+}
+
 class GameFlow {
     static showStage(stageName) {
         Object.values(stages).forEach(el => el.classList.remove('active-stage'));
@@ -140,6 +220,8 @@ class GameFlow {
         console.log(`🎮 Starting game - Score reset to 0`);
 
         currentQuestionIndex = 0;
+        pendingActions = [];
+        for (const index of [...pendingVerdicts.keys()]) settleVerdict(index, null);
         this.updateProgress(0); // Reset dot
 
         // Re-enable all inputs (critical fix for multi-round)
@@ -174,36 +256,27 @@ class GameFlow {
     // --- 1. MATH QUIZ ---
     static setupMathQuiz(data) {
         modes.math.classList.remove('hidden');
-        questions = data.questions;
+        loadQuestions(data.questions, data.question_count);
 
         const renderScaleQuestion = () => {
             if (!gameActive) return;
             // Loop questions if run out (for infinite feel in timed mode)
-            const q = questions[currentQuestionIndex % questions.length];
-            document.getElementById('math-problem').textContent = q.text;
-            document.getElementById('math-input').value = '';
-            document.getElementById('math-input').focus();
+            withCurrentQuestion(q => {
+                document.getElementById('math-problem').textContent = q.text;
+                document.getElementById('math-input').value = '';
+                document.getElementById('math-input').focus();
+            });
         };
 
         const submitMath = async () => {
             const val = document.getElementById('math-input').value;
-            if (!val) return;
-
-            // Optimistic scoring (Frontend guesses, Backend validates)
-            const q = questions[currentQuestionIndex % questions.length];
-            const isCorrect = parseInt(val) == q.answer;
-            if (isCorrect) myScore++;
-            else myScore = Math.max(0, myScore - 1);
+            const q = questionAt(currentQuestionIndex);
+            if (!val || !q) return;
 
             const input = document.getElementById('math-input');
+            const isCorrect = await submitAnswer(currentQuestionIndex % questionCount, val);
             await this.showFeedback(input, isCorrect);
 
-            socket.send('GAME_ACTION', {
-                action: 'ANSWER',
-                question_index: currentQuestionIndex % questions.length,
-                answer: val
-            });
-
             currentQuestionIndex++;
             renderScaleQuestion();
         };
@@ -222,13 +295,15 @@ class GameFlow {
     // --- 2. SPEED TYPING ---
     static setupTyping(data) {
         modes.typing.classList.remove('hidden');
-        const words = data.word_list;
+        loadQuestions(data.word_list, data.question_count);
 
         const renderWord = () => {
             if (!gameActive) return;
             // Infinite loop of words
-            const target = words[currentQuestionIndex % words.length];
+            withCurrentQuestion(target => showWord(target));
+        };
 
+        const showWord = (target) => {
             const display = document.getElementById('typing-target');
             display.innerHTML = `<span style="font-size: 2em; color: white;">${target}</span>`;
 
@@ -246,11 +321,7 @@ class GameFlow {
                     myScore++;
                     await this.showFeedback(input, true);
 
-                    socket.send('GAME_ACTION', {
-                        action: 'TYPE',
-                        word_index: currentQuestionIndex % words.length,
-                        word: val
-                    });
+                    queueAction(currentQuestionIndex % questionCount, val);
                     currentQuestionIndex++;
                     renderWord();
                 }
@@ -264,15 +335,12 @@ class GameFlow {
     static setupTechSprint(data) {
         modes.quiz.classList.remove('hidden');
         document.getElementById('track-container').style.display = 'flex'; // Show track
-        questions = data.questions;
+        loadQuestions(data.questions, data.question_count);
 
         this.renderQuizQuestion(data, async (isCorrect, btnElement) => {
             await this.showFeedback(btnElement, isCorrect);
 
-            if (isCorrect) myScore++; // Move forward
-            else myScore = Math.max(0, myScore - 1); // Move back
-
-            this.updateProgress(myScore); // 0-10 Scale
+            this.updateProgress(myScore); // 0-10 Scale, as scored by the server
 
             if (myScore >= 10) {
                 this.finishGame(); // Win!
@@ -283,33 +351,27 @@ class GameFlow {
     // --- 4. TRUE FALSE ---
     static setupTrueFalse(data) {
         modes.tf.classList.remove('hidden');
-        questions = data.questions;
+        loadQuestions(data.questions, data.question_count);
 
         const renderTF = () => {
-            if (currentQuestionIndex >= questions.length) {
+            if (currentQuestionIndex >= questionCount) {
                 // Loop if needed, or wait
                 currentQuestionIndex = 0;
             }
-            const q = questions[currentQuestionIndex];
-            document.getElementById('tf-statement').textContent = q.text;
             document.getElementById('tf-score-goal').textContent = `${myScore}/10 Correct`;
+            withCurrentQuestion(q => {
+                document.getElementById('tf-statement').textContent = q.text;
+            });
         };
 
         const handleTF = async (choice, btnId) => {
-            const q = questions[currentQuestionIndex];
-            const isCorrect = (choice === q.answer);
+            const q = questionAt(currentQuestionIndex);
+            if (!q) return;
             const btn = document.getElementById(btnId);
+            const isCorrect = await submitAnswer(currentQuestionIndex, choice);
 
             await this.showFeedback(btn, isCorrect);
 
-            if (isCorrect) myScore++;
-
-            socket.send('GAME_ACTION', {
-                action: 'ANSWER',
-                question_index: currentQuestionIndex,
-                answer: choice
-            });
-
             currentQuestionIndex++;
             renderTF();
 
@@ -325,33 +387,28 @@ class GameFlow {
     // --- 5. FIX SYNTAX ---
     static setupSyntax(data) {
         modes.syntax.classList.remove('hidden');
-        questions = data.questions;
+        loadQuestions(data.questions, data.question_count);
 
         const renderSyntaxPuzzle = () => {
             if (!gameActive) return;
-            const q = questions[currentQuestionIndex % questions.length];
-            document.getElementById('syntax-code').textContent = q.code;
-            const input = document.getElementById('syntax-input');
-            input.value = '';
-            input.focus();
+            withCurrentQuestion(q => {
+                document.getElementById('syntax-code').textContent = q.code;
+                const input = document.getElementById('syntax-input');
+                input.value = '';
+                input.focus();
+            });
         };
 
         const submitSyntax = async () => {
             const input = document.getElementById('syntax-input');
             const val = input.value.trim();
-            if (!val) return;
+            const q = questionAt(currentQuestionIndex);
+            if (!val || !q) return;
 
-            const q = questions[currentQuestionIndex % questions.length];
-            const isCorrect = val == q.answer;
+            const isCorrect = await submitAnswer(currentQuestionIndex % questionCount, val);
 
             await this.showFeedback(input, isCorrect);
 
-            socket.send('GAME_ACTION', {
-                action: 'ANSWER',
-                question_index: currentQuestionIndex % questions.length,
-                answer: val
-            });
-
             // No immediate score feedback in UI for Syntax? Or maybe just flash?
             // Simple incremental:
             currentQuestionIndex++;
@@ -368,11 +425,14 @@ class GameFlow {
 
     // --- HELPER: GENERIC QUIZ RENDERER ---
     static renderQuizQuestion(data, callback) {
-        if (currentQuestionIndex >= questions.length) {
+        if (currentQuestionIndex >= questionCount) {
             currentQuestionIndex = 0; // Loop
         }
 
-        const q = questions[currentQuestionIndex];
+        withCurrentQuestion(q => this.showQuizQuestion(q, data, callback));
+    }
+
+    static showQuizQuestion(q, data, callback) {
         document.getElementById('question-text').textContent = q.text;
 
         const grid = document.getElementById('answer-options');
@@ -383,19 +443,13 @@ class GameFlow {
             btn.className = 'answer-btn';
             btn.textContent = opt;
             btn.onclick = async () => {
-                const isCorrect = (opt === q.answer);
+                const isCorrect = await submitAnswer(currentQuestionIndex, opt);
 
                 // Show feedback on THIS button
                 await this.showFeedback(btn, isCorrect);
 
                 callback(isCorrect, btn);
 
-                socket.send('GAME_ACTION', {
-                    action: 'ANSWER',
-                    question_index: currentQuestionIndex,
-                    answer: opt
-                });
-
                 currentQuestionIndex++;
                 if (gameActive) this.renderQuizQuestion(data, callback);
             };
@@ -417,8 +471,9 @@ class GameFlow {
         // Disable inputs
         document.querySelectorAll('input, button').forEach(el => el.disabled = true);
 
-        // Notify Backend
-        socket.send('ROUND_COMPLETE', { score: myScore });
+        // Notify Backend (answers first, so the server's score is final when ROUND_COMPLETE lands)
+        flushActions();
+        socket.send('ROUND_COMPLETE', {});
 
         // Show "Qualified" Overlay (Wait Screen)
         const overlay = document.createElement('div');
@@ -485,6 +540,8 @@ class GameFlow {
     static wait(ms) { return new Promise(r => setTimeout(r, ms)); }
 
     static showFeedback(element, isCorrect) {
+        // null: the server's verdict never came (e.g. reconnecting), so there is nothing to show
+        if (isCorrect === null) return Promise.resolve();
         return new Promise(resolve => {
             // 1. Text Overlay Feedback
             let overlay = document.getElementById('feedback-overlay');
@@ -596,6 +653,13 @@ class GameFlow {
 let currentRoundNumber = 0;  // Track which round we're on
 let pendingGameData = null;
 
+// The server advances a phase as soon as every client acks it (its timeouts are only the upper bound),
+// so each screen acks once it has been up long enough to read
+const PHASE_MIN_DISPLAY_MS = 1500;
+function ackPhase(phase, delay = PHASE_MIN_DISPLAY_MS) {
+    setTimeout(() => socket.send('PHASE_ACK', { phase }), delay);
+}
+
 socket.on('ROUND_START', (data) => {
     console.log('🎮 ROUND_START received for round:', data.round);
 
@@ -620,6 +684,22 @@ socket.on('ROUND_START', (data) => {
     socket.send('PLAYER_READY_FOR_ROUND', { session_code: sessionCode, user_id: parseInt(userId) });
 });
 
+socket.on('QUESTION_CHUNK', (data) => {
+    if (data.round !== currentRoundNumber) return;
+    const items = data.questions || data.word_list || [];
+    items.forEach((item, i) => { questions[data.from + i] = item; });
+    chunkRequestedAt = 0;
+
+    const waiting = onQuestionsLoaded;
+    onQuestionsLoaded = null;
+    if (waiting) waiting();
+});
+
+socket.on('ACTION_RESULT', (data) => {
+    myScore = data.score;
+    for (const [index, correct] of data.results || []) settleVerdict(index, correct === 1);
+});
+
 socket.on('ALL_PLAYERS_READY', () => {
     console.log('✅ All players ready!');
     loadingManager.hide();
@@ -631,6 +711,8 @@ socket.on('ALL_PLAYERS_READY', () => {
 });
 
 socket.connect(sessionCode, userId);
+// On the game page now; queued until the socket opens
+socket.send('PHASE_ACK', { phase: 'starting' });
 
 socket.onReady(() => {
     console.log('✓ WebSocket connected and ready!');
@@ -648,6 +730,8 @@ socket.on('ROUND_RESULT', (data) => {
         const waitingOverlay = document.getElementById('qualified-overlay');
         if (waitingOverlay) waitingOverlay.remove();
 
+        ackPhase('results');
+
         // Show QUALIFIED or ELIMINATED screen
         if (data.status === 'qualified') {
             // Show green QUALIFIED screen
@@ -691,6 +775,16 @@ socket.on('ROUND_RESULT', (data) => {
 
 
 
-socket.on('INTERMISSION', (data) => GameFlow.showIntermission(data));
-socket.on('GAME_SESSION_END', (data) => GameFlow.showGameEnd(data));
+socket.on('INTERMISSION', (data) => {
+    GameFlow.showIntermission(data);
+    ackPhase('intermission');
+});
+socket.on('GAME_SESSION_END', (data) => {
+    GameFlow.showGameEnd(data);
+    ackPhase('end', 2500);
+});
 socket.on('REDIRECT_TO_LOBBY', () => window.location.href = 'lobby.html');
+// Reconnected too late to replay what we missed; a running round follows as ROUND_START
+socket.on('SESSION_RESYNC', (data) => {
+    if (data.ended) window.location.href = 'lobby.html';
+});
@@ -31,8 +31,7 @@ function init() {
     profileNameDisplay.textContent = currentProfile.name;
     editNameInput.value = currentProfile.name;
     userAvatarSmall.textContent = currentProfile.icon;
-    loadSessions();
-    setInterval(loadSessions, 5000);
+    connectLobbyFeed();
 }
 
 // Slider Logic
@@ -69,6 +68,7 @@ createBtn.onclick = async () => {
 
         if (response.ok) {
             const session = await response.json();
+            if (session.ticket) sessionStorage.setItem(`join_ticket:${session.session_code}`, session.ticket);
             loadingManager.updateMessage('Entering waiting room...');
             await new Promise(resolve => setTimeout(resolve, 300));
             window.location.href = `waiting_room.html?code=${session.session_code}`;
@@ -147,12 +147,16 @@ async function joinSession(code) {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         if (res.ok) {
+            const session = await res.json();
+            if (session.ticket) sessionStorage.setItem(`join_ticket:${code}`, session.ticket);
             loadingManager.updateMessage('Entering waiting room...');
             await new Promise(resolve => setTimeout(resolve, 300));
             window.location.href = `waiting_room.html?code=${code}`;
         } else {
             await loader.hide();
-            alert("Found no session or session full");
+            // Server says why: not_found, started or full
+            const body = await res.json().catch(() => null);
+            alert(body?.detail?.message || "Found no session or session full");
         }
     } catch (e) {
         console.error(e);
@@ -161,14 +165,48 @@ async function joinSession(code) {
     }
 }
 
-async function loadSessions() {
+// Open lobbies: session_code -> lobby, kept current by the server's lobby feed
+const sessions = new Map();
+
+// Server-sent events replace polling: one snapshot, then only changes.
+// EventSource reconnects by itself and every reconnect starts with a fresh snapshot.
+function connectLobbyFeed() {
+    const feed = new EventSource('/api/sessions/feed');
+
+    feed.addEventListener('snapshot', (event) => {
+        sessions.clear();
+        JSON.parse(event.data).forEach(s => sessions.set(s.session_code, s));
+        renderSessions();
+    });
+
+    feed.addEventListener('lobby_created', (event) => {
+        const s = JSON.parse(event.data);
+        sessions.set(s.session_code, s);
+        renderSessions();
+    });
+
+    feed.addEventListener('lobby_updated', (event) => {
+        const update = JSON.parse(event.data);
+        const s = sessions.get(update.session_code);
+        if (!s) return;
+        Object.assign(s, update);
+        if (s.status !== 'waiting') sessions.delete(s.session_code); // Started: no longer joinable
+        renderSessions();
+    });
+
+    feed.addEventListener('lobby_closed', (event) => {
+        sessions.delete(JSON.parse(event.data).session_code);
+        renderSessions();
+    });
+
+    feed.onerror = () => console.warn('Lobby feed interrupted, reconnecting...');
+}
+
+function renderSessions() {
     const list = document.getElementById('session-list');
     try {
-        const res = await fetch('/api/sessions/', { headers: { 'Authorization': `Bearer ${token}` } });
-        const sessions = await res.json();
-
         list.innerHTML = '';
-        if (sessions.length === 0) {
+        if (sessions.size === 0) {
             list.innerHTML = '<p style="font-family: \'Sniglet\'; opacity:0.8;">No active classes. Be the first!</p>';
             return;
         }
@@ -186,10 +224,11 @@ async function loadSessions() {
 
             // Display lobby name if available, otherwise use session code
             const displayName = s.lobby_name || `Class #${s.session_code}`;
+            const slots = s.player_count != null ? `${s.player_count}/${s.max_players}` : s.max_players;
 
             item.innerHTML = `
                 <div style="font-family: var(--font-heading); font-size: 1.2em;">${displayName}</div>
-                <div style="background: rgba(0,0,0,0.3); padding: 5px 10px; border-radius: 10px;">${s.max_players} Slots</div>
+                <div style="background: rgba(0,0,0,0.3); padding: 5px 10px; border-radius: 10px;">${slots} Slots</div>
             `;
             item.onclick = () => {
                 document.getElementById('join-code').value = s.session_code;
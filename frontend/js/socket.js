@@ -1,3 +1,8 @@
+import { decodeFrame, MSGPACK_PROTOCOL, JSON_PROTOCOL } from './codec.js';
+
+// The server pings every 15s (WS_PING_INTERVAL); this much silence means the connection is dead
+const HEARTBEAT_TIMEOUT_MS = 50000;
+
 class GameSocket {
     constructor() {
         this.socket = null;
@@ -5,6 +10,11 @@ class GameSocket {
         this.onConnected = null;
         this.messageQueue = []; // Queue for offline messages
         this.isConnecting = false;
+        // Game-flow frames carry a per-session seq; reconnecting with the last one replays what was missed
+        this.lastSeq = null;
+        this.seenSeqs = new Set(); // Recent seqs, so a replay overlapping live frames isn't handled twice
+        this.lastRx = 0;
+        this.watchdog = null;
     }
 
     connect(sessionCode, userId) {
@@ -20,13 +30,35 @@ class GameSocket {
         }
 
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const url = `${protocol}//${window.location.host}/ws/${sessionCode}/${userId}`;
-        console.log(`WebSocket URL: ${url}`);
-        this.socket = new WebSocket(url);
+        // Signed join ticket from create/join lets the server skip its DB lookups
+        const ticketKey = `join_ticket:${sessionCode}`;
+        const ticket = sessionStorage.getItem(ticketKey);
+        const params = new URLSearchParams();
+        if (ticket) params.set('ticket', ticket);
+        if (this.lastSeq !== null) params.set('last_seq', this.lastSeq);
+        const query = params.toString() ? `?${params}` : '';
+        const url = `${protocol}//${window.location.host}/ws/${sessionCode}/${userId}${query}`;
+        console.log(`WebSocket URL: ${url.split('?')[0]}${ticket ? ' (with join ticket)' : ''}`);
+        let opened = false;
+        // Offer the compact binary protocol first; the server picks one it supports
+        this.socket = new WebSocket(url, [MSGPACK_PROTOCOL, JSON_PROTOCOL]);
+        this.socket.binaryType = 'arraybuffer';
 
         this.socket.onopen = () => {
-            console.log('✓ WebSocket connected');
+            console.log(`✓ WebSocket connected (protocol: ${this.socket.protocol || 'json'})`);
             this.isConnecting = false;
+            opened = true;
+
+            // Half-open connections never fire onclose on their own: close it ourselves and reconnect
+            this.lastRx = Date.now();
+            clearInterval(this.watchdog);
+            this.watchdog = setInterval(() => {
+                if (Date.now() - this.lastRx > HEARTBEAT_TIMEOUT_MS) {
+                    console.warn('💔 No frames from the server, reconnecting...');
+                    clearInterval(this.watchdog);
+                    this.socket.close(4000, 'heartbeat timeout');
+                }
+            }, 5000);
 
             // Send queued messages
             if (this.messageQueue.length > 0) {
@@ -48,8 +80,14 @@ class GameSocket {
         };
 
         this.socket.onmessage = (event) => {
-            const data = JSON.parse(event.data);
+            this.lastRx = Date.now();
+            const data = decodeFrame(event.data);
+            if (data.type === 'PING') {
+                this.socket.send(JSON.stringify({ type: 'PONG' }));
+                return;
+            }
             console.log('📩 RX:', data.type, data);
+            if (!this.trackSeq(data)) return;
             this.trigger(data.type, data);
         };
 
@@ -61,9 +99,25 @@ class GameSocket {
         this.socket.onclose = (event) => {
             console.log('WebSocket disconnected', event);
             this.isConnecting = false;
+            clearInterval(this.watchdog);
+
+            // Closed for flooding the server: don't come straight back
+            if (event.code === 1008 && event.reason === 'rate limited') {
+                console.error('⛔ Disconnected by the server for sending too many messages');
+                return;
+            }
 
-            // Try to reconnect if not clean close
-            if (!event.wasClean) {
+            // Ticket refused (policy close, or handshake rejected): retry without it
+            if (ticket && (event.code === 1008 || !opened)) {
+                console.warn('⚠️ Join ticket rejected, reconnecting without it...');
+                sessionStorage.removeItem(ticketKey);
+                setTimeout(() => this.connect(sessionCode, userId), 500);
+                return;
+            }
+
+            // Try to reconnect if not clean close, or if the server is restarting (1012)
+            // dropped us for falling behind (1013), or the heartbeat watchdog gave up on it (4000)
+            if (!event.wasClean || event.code === 1012 || event.code === 1013 || event.code === 4000) {
                 console.log('🔄 Attempting to reconnect in 2s...');
                 setTimeout(() => {
                     this.connect(sessionCode, userId);
@@ -72,6 +126,22 @@ class GameSocket {
         };
     }
 
+    // False for a frame already handled
+    trackSeq(data) {
+        if (typeof data.seq !== 'number') return true;
+        if (data.type === 'SESSION_RESYNC') {
+            // Too far behind (or the server restarted): start counting again from here
+            this.lastSeq = data.seq;
+            this.seenSeqs.clear();
+            return true;
+        }
+        if (this.seenSeqs.has(data.seq)) return false;
+        this.seenSeqs.add(data.seq);
+        if (this.seenSeqs.size > 128) this.seenSeqs.delete(this.seenSeqs.values().next().value);
+        this.lastSeq = Math.max(this.lastSeq ?? 0, data.seq);
+        return true;
+    }
+
     onReady(callback) {
         if (this.socket && this.socket.readyState === WebSocket.OPEN) {
             callback();
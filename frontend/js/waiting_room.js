@@ -9,15 +9,14 @@ if (!sessionCode || !userId) window.location.href = 'lobby.html';
 
 document.getElementById('session-code-display').textContent = sessionCode;
 
-// Fetch and display lobby name
+// Fetch and display lobby name (once - live changes arrive over the WebSocket)
 async function fetchLobbyName() {
     try {
         const token = localStorage.getItem('access_token');
-        const res = await fetch('/api/sessions/', {
+        const res = await fetch(`/api/sessions/${sessionCode}`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
-        const sessions = await res.json();
-        const currentSession = sessions.find(s => s.session_code === sessionCode);
+        const currentSession = res.ok ? await res.json() : null;
 
         if (currentSession) {
             // Auto-redirect if game is playing (fallback for missed WS event)
@@ -40,8 +39,6 @@ async function fetchLobbyName() {
 }
 
 fetchLobbyName();
-// Poll every 3s to sync status/name
-setInterval(fetchLobbyName, 3000);
 
 // Elements
 const teacherArea = document.getElementById('teacher-area');
@@ -52,14 +49,36 @@ const testBtn = document.getElementById('test-btn');
 
 let isReady = false;
 
+// Roster mirror: user_id -> player, kept in sync by versioned deltas
+const roster = new Map();
+let rosterVersion = null;
+
 // Connect WS
 socket.connect(sessionCode, userId);
 
 // WS Events
 socket.on('PLAYER_JOIN', (data) => console.log("Player join", data));
 
+// Full snapshot (on join, or after we reported a version gap)
 socket.on('PLAYER_LIST_UPDATE', (data) => {
-    renderPlayers(data.players);
+    roster.clear();
+    (data.players || []).forEach(p => roster.set(p.user_id, p));
+    rosterVersion = data.version ?? null;
+    renderPlayers([...roster.values()]);
+});
+
+socket.on('PLAYER_LIST_DELTA', (data) => {
+    if (rosterVersion === null || data.base_version !== rosterVersion) {
+        console.warn(`⚠️ Roster version gap (have ${rosterVersion}, delta from ${data.base_version}). Requesting snapshot...`);
+        socket.send('GET_PLAYERS', { session_code: sessionCode, known_version: rosterVersion });
+        return;
+    }
+
+    data.removed.forEach(id => roster.delete(id));
+    data.added.forEach(p => roster.set(p.user_id, p));
+    data.changed.forEach(p => roster.set(p.user_id, p));
+    rosterVersion = data.version;
+    renderPlayers([...roster.values()]);
 });
 
 socket.on('GAME_START', (data) => {
@@ -67,6 +86,12 @@ socket.on('GAME_START', (data) => {
     window.location.href = `game.html?code=${sessionCode}`;
 });
 
+// Missed GAME_START (e.g. reconnected mid-start): the server sends the running round on join
+socket.on('ROUND_START', () => {
+    console.log('🔄 Game is already running! Redirecting...');
+    window.location.href = `game.html?code=${sessionCode}`;
+});
+
 // Controls
 document.getElementById('leave-btn').onclick = () => {
     window.location.href = 'lobby.html';
@@ -205,8 +230,7 @@ function renderPlayers(players) {
     }
 }
 
-// Initial Fetch - Wait for WebSocket to be ready
+// Initial roster snapshot is pushed by the server on join
 socket.onReady(() => {
-    console.log('✓ WebSocket ready, requesting player list...');
-    socket.send('GET_PLAYERS', { session_code: sessionCode });
+    console.log('✓ WebSocket ready, waiting for roster snapshot...');
 });
@@ -1,30 +1,21 @@
 """
-Database migration script to add lobby_name column to sessions table.
-Run this script to update your production database.
+Database migration script for the production database.
+
+Kept for existing deploy scripts: the lobby_name column is now migration 2 in
+backend/migrations.py, and this applies every pending migration, as does
+`python -m backend.migrations`.
 """
 import asyncio
-import os
-from sqlalchemy import text
 from backend.database import engine
+from backend.migrations import run_migrations
 
 async def migrate():
-    """Add lobby_name column to sessions table if it doesn't exist."""
-    async with engine.begin() as conn:
-        # Check if column exists
-        result = await conn.execute(text(
-            "SELECT column_name FROM information_schema.columns "
-            "WHERE table_name='sessions' AND column_name='lobby_name'"
-        ))
-        column_exists = result.scalar()
-        
-        if not column_exists:
-            print("Adding lobby_name column to sessions table...")
-            await conn.execute(text(
-                "ALTER TABLE sessions ADD COLUMN lobby_name VARCHAR NULL"
-            ))
-            print("✓ Successfully added lobby_name column!")
-        else:
-            print("✓ lobby_name column already exists, skipping migration.")
+    """Apply pending schema migrations."""
+    try:
+        version = await run_migrations()
+        print(f"✓ Schema at version {version}")
+    finally:
+        await engine.dispose()
 
 if __name__ == "__main__":
     print("Starting database migration...")
@@ -0,0 +1,115 @@
+"""
+BrokerStateBackend against the stand-in broker (backend/broker.py), run as a subprocess.
+
+    python -m pytest test_broker.py
+"""
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from backend.services.state_backend import BrokerStateBackend
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def broker_url():
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.broker", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        # Wait until it accepts connections
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("broker did not start")
+                time.sleep(0.05)
+        yield f"broker://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+def run(broker_url, scenario):
+    """Run scenario(backend) against a fresh client connection"""
+    async def main():
+        backend = BrokerStateBackend(broker_url)
+        await backend.start()
+        try:
+            await scenario(backend)
+        finally:
+            await backend.close()
+    asyncio.run(main())
+
+
+def test_set_get_delete(broker_url):
+    async def scenario(backend):
+        assert await backend.get("missing") is None
+        await backend.set("k", {"a": [1, 2]})
+        assert await backend.get("k") == {"a": [1, 2]}
+        await backend.delete("k")
+        assert await backend.get("k") is None
+    run(broker_url, scenario)
+
+
+def test_set_if_absent_with_ttl(broker_url):
+    async def scenario(backend):
+        assert await backend.set_if_absent("owner:ABC", "worker-1", ttl=0.3) is True
+        assert await backend.set_if_absent("owner:ABC", "worker-2", ttl=0.3) is False
+        assert await backend.get("owner:ABC") == "worker-1"
+        await asyncio.sleep(0.4)
+        # Expired: the key is free again
+        assert await backend.get("owner:ABC") is None
+        assert await backend.set_if_absent("owner:ABC", "worker-2", ttl=0.3) is True
+        assert await backend.get("owner:ABC") == "worker-2"
+    run(broker_url, scenario)
+
+
+def test_sets(broker_url):
+    async def scenario(backend):
+        await backend.set_add("codes", "B")
+        await backend.set_add("codes", "A")
+        await backend.set_add("codes", "A")
+        assert await backend.set_members("codes") == ["A", "B"]
+        await backend.set_remove("codes", "A")
+        assert await backend.set_members("codes") == ["B"]
+    run(broker_url, scenario)
+
+
+def test_publish_subscribe_across_clients(broker_url):
+    async def main():
+        publisher = BrokerStateBackend(broker_url)
+        subscriber = BrokerStateBackend(broker_url)
+        await publisher.start()
+        await subscriber.start()
+        try:
+            received = asyncio.Queue()
+
+            async def handler(message):
+                await received.put(message)
+
+            await subscriber.subscribe("session:ABC", handler)
+            await publisher.publish("session:ABC", {"type": "ROUND_START", "round": 1})
+            await publisher.publish("session:OTHER", {"type": "ignored"})
+            assert await asyncio.wait_for(received.get(), timeout=2) == {"type": "ROUND_START", "round": 1}
+
+            await subscriber.unsubscribe("session:ABC")
+            await publisher.publish("session:ABC", {"type": "late"})
+            await asyncio.sleep(0.2)
+            assert received.empty()
+        finally:
+            await publisher.close()
+            await subscriber.close()
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Inbound WebSocket rate limiting (TokenBucket / InboundLimiter).
+
+    python -m pytest test_rate_limit.py
+"""
+import pytest
+from backend.config import settings
+from backend.utils import rate_limit
+from backend.utils.rate_limit import ALLOW, CLOSE, DROP, MESSAGE_BUDGETS, InboundLimiter, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_refills(clock):
+    bucket = TokenBucket(rate=2.0, burst=3.0)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5  # One token back at 2/s
+    assert bucket.take() is True
+    assert bucket.take() is False
+    clock.now += 60  # Never refills past the burst
+    assert sum(bucket.take() for _ in range(10)) == 3
+
+
+def test_types_have_separate_budgets(clock):
+    limiter = InboundLimiter()
+    _, burst = MESSAGE_BUDGETS["GET_PLAYERS"]
+    for _ in range(int(burst)):
+        assert limiter.check("GET_PLAYERS") == ALLOW
+    assert limiter.check("GET_PLAYERS") == DROP
+    # Another type still has its own budget
+    assert limiter.check("GAME_ACTION") == ALLOW
+
+
+def test_unknown_types_share_one_budget(clock):
+    limiter = InboundLimiter()
+    _, burst = MESSAGE_BUDGETS["*"]
+    verdicts = [limiter.check(f"MADE_UP_{i}") for i in range(int(burst) + 1)]
+    assert verdicts[-1] == DROP
+    assert limiter.check(None) == DROP
+    assert limiter.check({"not": "a type"}) == DROP
+
+
+def test_flooding_past_the_strikes_closes(clock):
+    limiter = InboundLimiter()
+    _, burst = MESSAGE_BUDGETS["START_GAME"]
+    for _ in range(int(burst)):
+        assert limiter.check("START_GAME") == ALLOW
+
+    strikes = int(settings.WS_RATE_LIMIT_STRIKES)
+    for _ in range(strikes):
+        assert limiter.check("START_GAME") == DROP
+    assert limiter.check("START_GAME") == CLOSE
+    assert limiter.dropped == strikes + 1
+
+
+def test_strikes_recover_over_the_window(clock):
+    limiter = InboundLimiter()
+    _, burst = MESSAGE_BUDGETS["START_GAME"]
+    for _ in range(int(burst)):
+        limiter.check("START_GAME")
+    strikes = int(settings.WS_RATE_LIMIT_STRIKES)
+    for _ in range(strikes):
+        assert limiter.check("START_GAME") == DROP
+
+    # A full window later the strike budget is back, so a few more drops don't close
+    clock.now += settings.WS_RATE_LIMIT_WINDOW
+    for _ in range(int(burst)):
+        assert limiter.check("START_GAME") == ALLOW
+    assert limiter.check("START_GAME") == DROP
+
+
+def test_drops_and_closes_are_counted(clock, monkeypatch):
+    stats = rate_limit.RateLimitStats()
+    monkeypatch.setattr(rate_limit, "rate_limit_stats", stats)
+    limiter = InboundLimiter()
+    _, burst = MESSAGE_BUDGETS["PONG"]
+    for _ in range(int(burst) + int(settings.WS_RATE_LIMIT_STRIKES) + 1):
+        limiter.check("PONG")
+    summary = stats.as_dict()
+    assert summary["dropped"] == {"PONG": int(settings.WS_RATE_LIMIT_STRIKES) + 1}
+    assert summary["closed"] == 1
@@ -0,0 +1,80 @@
+"""
+Replay of missed game-flow frames to resuming clients (ReplayBuffer / ConnectionManager.replay_since).
+
+    python -m pytest test_replay.py
+"""
+import asyncio
+from backend.services.connection_manager import ConnectionManager, ReplayBuffer
+
+
+def seqs(frames):
+    return [frame.message["seq"] for frame in frames]
+
+
+def test_frames_are_numbered_from_one():
+    buffer = ReplayBuffer(8)
+    first = buffer.add({"type": "ROUND_START"}, None)
+    second = buffer.add({"type": "ROUND_RESULT"}, None)
+    assert first.message["seq"] == 1
+    assert second.message["seq"] == 2
+    assert buffer.seq == 2
+
+
+def test_since_returns_only_newer_frames():
+    buffer = ReplayBuffer(8)
+    for _ in range(5):
+        buffer.add({"type": "ROUND_START"}, None)
+    assert seqs(buffer.since(1, 2)) == [3, 4, 5]
+    assert buffer.since(1, 5) == []
+
+
+def test_since_skips_frames_for_other_players():
+    buffer = ReplayBuffer(8)
+    buffer.add({"type": "ALL_PLAYERS_READY"}, None)
+    buffer.add({"type": "ROUND_RESULT"}, [1])
+    buffer.add({"type": "ROUND_RESULT"}, [2])
+    buffer.add({"type": "INTERMISSION"}, None)
+    assert seqs(buffer.since(1, 0)) == [1, 2, 4]
+    assert seqs(buffer.since(2, 0)) == [1, 3, 4]
+
+
+def test_evicted_gap_needs_a_resync():
+    buffer = ReplayBuffer(3)
+    for _ in range(6):
+        buffer.add({"type": "ROUND_START"}, None)
+    # Frames 1-3 are gone: a client at seq 1 missed 2 and 3
+    assert buffer.since(1, 1) is None
+    # At seq 3 it only needs 4-6, which are still kept
+    assert seqs(buffer.since(1, 3)) == [4, 5, 6]
+
+
+def test_seq_from_a_previous_buffer_needs_a_resync():
+    buffer = ReplayBuffer(8)
+    buffer.add({"type": "ROUND_START"}, None)
+    assert buffer.since(1, 10) is None
+
+
+def test_manager_sequences_only_game_flow_messages():
+    manager = ConnectionManager()
+
+    async def main():
+        await manager.broadcast({"type": "ROUND_START", "round": 1}, "ABC")
+        await manager.broadcast({"type": "PLAYER_LIST_DELTA"}, "ABC")
+        await manager.send_to_user({"type": "ROUND_RESULT", "rank": 1}, "ABC", 7)
+        await manager.send_to_user({"type": "QUESTION_CHUNK"}, "ABC", 7)
+
+    asyncio.run(main())
+    assert manager.last_seq("ABC") == 2
+    assert [frame.message["type"] for frame in manager.replay_since("ABC", 7, 0)] == ["ROUND_START", "ROUND_RESULT"]
+    assert [frame.message["type"] for frame in manager.replay_since("ABC", 8, 0)] == ["ROUND_START"]
+
+
+def test_manager_without_history():
+    manager = ConnectionManager()
+    # Nothing sent yet: a fresh client is up to date, anything else must resync
+    assert manager.replay_since("NEW", 1, 0) == []
+    assert manager.replay_since("NEW", 1, 4) is None
+
+    asyncio.run(manager.broadcast({"type": "ROUND_START"}, "OLD"))
+    manager.forget_session("OLD")
+    assert manager.last_seq("OLD") == 0
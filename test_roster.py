@@ -0,0 +1,115 @@
+"""
+Versioned, coalesced lobby roster deltas (LobbyRoster).
+
+    python -m pytest test_roster.py
+"""
+import asyncio
+import pytest
+from backend.config import settings
+from backend.services.lobby_roster import LobbyRoster
+
+
+class FakeManager:
+    def __init__(self):
+        self.sent = []
+
+    async def broadcast(self, message, session_code):
+        self.sent.append(message)
+
+
+def player(user_id, **fields):
+    return {"user_id": user_id, "name": f"P{user_id}", "is_ready": False, **fields}
+
+
+@pytest.fixture
+def run(monkeypatch):
+    """Run scenario(roster, manager); the coalescing timer never fires, tests flush by hand"""
+    monkeypatch.setattr(settings, "ROSTER_COALESCE_WINDOW", 3600)
+
+    def run(scenario):
+        async def main():
+            manager = FakeManager()
+            roster = LobbyRoster("ABC", manager)
+            try:
+                await scenario(roster, manager)
+            finally:
+                roster.close()
+        asyncio.run(main())
+    return run
+
+
+def test_changes_in_one_window_become_one_delta(run):
+    async def scenario(roster, manager):
+        roster.add(player(1))
+        roster.add(player(2))
+        roster.update(1, is_ready=True)
+        await roster.flush()
+        assert len(manager.sent) == 1
+        delta = manager.sent[0]
+        assert delta["type"] == "PLAYER_LIST_DELTA"
+        assert (delta["base_version"], delta["version"]) == (0, 1)
+        # A pending add already carries the later update
+        assert delta["added"] == [player(1, is_ready=True), player(2)]
+        assert delta["changed"] == [] and delta["removed"] == []
+    run(scenario)
+
+
+def test_versions_chain(run):
+    async def scenario(roster, manager):
+        roster.add(player(1))
+        await roster.flush()
+        roster.update(1, is_ready=True)
+        await roster.flush()
+        roster.remove(1)
+        await roster.flush()
+        assert [(d["base_version"], d["version"]) for d in manager.sent] == [(0, 1), (1, 2), (2, 3)]
+        assert manager.sent[1]["changed"] == [player(1, is_ready=True)]
+        assert manager.sent[2]["removed"] == [1]
+        assert roster.snapshot() == {"type": "PLAYER_LIST_UPDATE", "version": 3, "players": []}
+    run(scenario)
+
+
+def test_join_and_leave_in_one_window_sends_nothing(run):
+    async def scenario(roster, manager):
+        roster.add(player(1))
+        roster.remove(1)
+        await roster.flush()
+        assert manager.sent == []
+        assert roster.version == 0
+    run(scenario)
+
+
+def test_leave_and_rejoin_in_one_window_is_a_change(run):
+    async def scenario(roster, manager):
+        roster.add(player(1))
+        await roster.flush()
+        roster.remove(1)
+        roster.add(player(1, name="Back"))
+        await roster.flush()
+        delta = manager.sent[-1]
+        assert delta["changed"] == [player(1, name="Back")]
+        assert delta["added"] == [] and delta["removed"] == []
+    run(scenario)
+
+
+def test_no_op_updates_are_not_broadcast(run):
+    async def scenario(roster, manager):
+        roster.add(player(1, is_ready=True))
+        await roster.flush()
+        roster.update(1, is_ready=True)  # e.g. a repeated PLAYER_READY
+        roster.update(99, is_ready=True)  # not in the lobby
+        roster.remove(99)
+        await roster.flush()
+        assert len(manager.sent) == 1
+    run(scenario)
+
+
+def test_restored_roster_skips_a_version(run):
+    async def scenario(roster, manager):
+        roster.add(player(1))
+        await roster.flush()
+        restored = LobbyRoster.from_snapshot("ABC", manager, roster.to_snapshot())
+        # Unflushed changes died with the old process, so clients at version 1 must resync
+        assert restored.version == 2
+        assert restored.snapshot()["players"] == [player(1)]
+    run(scenario)
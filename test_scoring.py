@@ -0,0 +1,104 @@
+"""
+Server-side answer scoring (BaseGame.apply_actions).
+
+    python -m pytest test_scoring.py
+"""
+from backend.games import MathQuiz, TechSprint
+
+PLAYER = 1
+
+
+def math_round(count=5):
+    game = MathQuiz()
+    game.setup_seeded([{"user_id": PLAYER}, {"user_id": 2}], count, seed=1234)
+    return game
+
+
+def wrong(game, index):
+    return str(int(game.answer_for(index)) + 1)
+
+
+def test_scores_answers_in_order():
+    game = math_round()
+    score, verdicts = game.apply_actions(PLAYER, [
+        [0, game.answer_for(0)],
+        [1, game.answer_for(1)],
+        [2, wrong(game, 2)],
+    ])
+    # +1, +1, then MathQuiz's -1 for a wrong answer
+    assert score == 1
+    assert verdicts == [[0, 1], [1, 1], [2, 0]]
+    assert game.score_of(PLAYER) == 1
+    assert game.score_of(2) == 0
+
+
+def test_score_never_drops_below_zero():
+    game = math_round()
+    score, verdicts = game.apply_actions(PLAYER, [[0, wrong(game, 0)], [1, wrong(game, 1)]])
+    assert score == 0
+    assert verdicts == [[0, 0], [1, 0]]
+
+
+def test_replayed_answers_are_dropped():
+    game = math_round()
+    game.apply_actions(PLAYER, [[0, game.answer_for(0)]])
+    # The same frame again (e.g. resent after a reconnect) scores nothing
+    score, verdicts = game.apply_actions(PLAYER, [[0, game.answer_for(0)]])
+    assert score == 1
+    assert verdicts == []
+
+
+def test_skipped_indexes_are_dropped():
+    game = math_round()
+    score, verdicts = game.apply_actions(PLAYER, [[2, game.answer_for(2)], [0, game.answer_for(0)]])
+    # Index 2 isn't next, so only index 0 counts
+    assert score == 1
+    assert verdicts == [[0, 1]]
+
+
+def test_indexes_wrap_around_the_round():
+    game = math_round(count=2)
+    actions = [[i % 2, game.answer_for(i % 2)] for i in range(5)]
+    score, verdicts = game.apply_actions(PLAYER, actions)
+    assert score == 5
+    assert [index for index, _ in verdicts] == [0, 1, 0, 1, 0]
+
+
+def test_malformed_actions_are_ignored():
+    game = math_round()
+    score, verdicts = game.apply_actions(PLAYER, [None, 7, [0], [0, 1, 2], [0, game.answer_for(0)]])
+    assert score == 1
+    assert verdicts == [[0, 1]]
+
+
+def test_batch_is_capped():
+    game = math_round(count=1)
+    actions = [[0, game.answer_for(0)]] * (game.MAX_ACTIONS_PER_FRAME + 10)
+    score, verdicts = game.apply_actions(PLAYER, actions)
+    assert score == game.MAX_ACTIONS_PER_FRAME
+    assert len(verdicts) == game.MAX_ACTIONS_PER_FRAME
+
+
+def test_non_players_are_not_scored():
+    game = math_round()
+    assert game.apply_actions(99, [[0, game.answer_for(0)]]) is None
+
+
+def test_race_score_stops_at_win_score():
+    game = TechSprint()
+    game.start([{"user_id": PLAYER}])
+    actions = [[i % game.count, game.answer_for(i % game.count)] for i in range(game.win_score + 3)]
+    score, _ = game.apply_actions(PLAYER, actions)
+    assert score == game.win_score
+    assert game.has_won(PLAYER)
+
+
+def test_snapshot_keeps_scores_and_cursors():
+    game = math_round()
+    game.apply_actions(PLAYER, [[0, game.answer_for(0)], [1, game.answer_for(1)]])
+    restored = MathQuiz.from_snapshot(game.to_snapshot())
+    assert restored.answer_for(2) == game.answer_for(2)
+    # The cursor survived: index 1 is a replay, index 2 is next
+    score, verdicts = restored.apply_actions(PLAYER, [[1, game.answer_for(1)], [2, game.answer_for(2)]])
+    assert score == 3
+    assert verdicts == [[2, 1]]